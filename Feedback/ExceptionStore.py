@@ -0,0 +1,106 @@
+import os
+import pickle
+import threading
+import time
+import traceback
+
+import networkx as nx
+
+from Utils.GraphOverlay import materialize
+
+_NETWORKX_DIR = os.path.dirname(os.path.abspath(nx.__file__))
+
+
+def _in_networkx(frame):
+    return os.path.abspath(frame.filename).startswith(_NETWORKX_DIR + os.sep)
+
+
+def _frame(frame):
+    filename = os.path.abspath(frame.filename)
+    if _in_networkx(frame):
+        filename = "networkx/" + os.path.relpath(filename, _NETWORKX_DIR).replace(os.sep, "/")
+    else:
+        filename = os.path.basename(filename)
+    return filename, frame.name, frame.lineno
+
+
+def exception_signature(error: BaseException, frames=3) -> tuple:
+    """Exception type plus its innermost `frames` networkx frames as (file, function, line).
+
+    The message is left out, so that errors naming different nodes or values
+    raised at the same place count once. Exceptions raised outside networkx
+    keep their innermost frames instead.
+    """
+    stack = traceback.extract_tb(error.__traceback__)
+    inside = [frame for frame in stack if _in_networkx(frame)]
+    return (type(error).__name__, *(_frame(frame) for frame in (inside or stack)[-frames:]))
+
+
+class ExceptionStore:
+    """Graphs that raised exceptions, deduplicated by exception_signature().
+
+    Only a count, the first message and the number of graphs kept are held
+    per signature. The first `graphs_per_signature` graphs of every signature
+    are appended to the log at `path` as they occur, one pickled
+    (signature, message, graph, seconds since start) record each, flushed at
+    once so that a killed run loses nothing (read back with
+    Utils.FileUtils.load_exception_log). Errors known only by their message,
+    e.g. timeouts, use the message as signature.
+    """
+
+    def __init__(self, start_time=None, graphs_per_signature=5, frames=3):
+        self.start_time = start_time or time.time()
+        self.graphs_per_signature = graphs_per_signature
+        self.frames = frames
+        self.path = None
+        self._file = None
+        # signature -> [occurrences, first message, graphs logged]
+        self.signatures: dict[tuple, list] = {}
+        self.num_logged = 0
+        self._lock = threading.Lock()
+
+    def open(self, path):
+        """Append the graphs to the log at path, created with the first graph."""
+        self.close()
+        self.path = path
+
+    def record(self, graph, message, error=None, signature=None) -> bool:
+        """Count an exception raised on graph and log the graph; returns whether its signature is new.
+
+        signature overrides the one derived from error or message.
+        """
+        if signature is None:
+            signature = exception_signature(error, self.frames) if error is not None else (message,)
+        with self._lock:
+            entry = self.signatures.get(signature)
+            new = entry is None
+            if new:
+                entry = self.signatures[signature] = [0, message, 0]
+            entry[0] += 1
+            if self.path is not None and entry[2] < self.graphs_per_signature:
+                if self._file is None:
+                    self._file = open(self.path, "ab")
+                record = (signature, message, materialize(graph), time.time() - self.start_time)
+                pickle.dump(record, self._file)
+                self._file.flush()
+                entry[2] += 1
+                self.num_logged += 1
+        return new
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def report(self):
+        print(f"Exceptions: {len(self.signatures)} distinct signature(s).")
+        for signature, (count, message, _) in sorted(
+            self.signatures.items(), key=lambda item: -item[1][0]
+        ):
+            where = ", ".join(f"{file}:{line} {function}" for file, function, line in signature[1:])
+            print(f"  {count}x {message[:200]}" + (f" (at {where})" if where else ""))
+        if self.num_logged:
+            print(f"{self.num_logged} exception graph(s) logged to {self.path}")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -2,14 +2,19 @@ import datetime
 import importlib
 import io
 import json
+import math
 import re
 import sys
 import time
+
 import coverage
 import networkx as nx
 import threading
 from multiprocessing import Lock
 
+from Feedback.ExceptionStore import ExceptionStore
+from Feedback.NoveltyStore import make_novelty_store
+
 
 def get_executed_lines(cov):
     """Retrieve executed lines from coverage data."""
@@ -83,22 +88,54 @@ def track_branch_coverage(algorithm, graph):
 
 
 class FeedbackTools:
-    def __init__(self, start_time=None, line_counts=None, lock=None):
-        self.observed_outputs = set()
-        self.networkx_exceptions = set()
-        self.other_exceptions = set()
-        self.exception_graphs = (
-            {}
-        )  # Dictionary to store graphs and their corresponding exceptions
+    def __init__(
+        self,
+        start_time=None,
+        line_counts=None,
+        lock=None,
+        novelty_store="exact",
+        novelty_memory=None,
+        exceptions_per_signature=5,
+    ):
+        # Kind and per-store memory budget (bytes) of the novelty stores, see Feedback.NoveltyStore
+        self.novelty_store = novelty_store
+        self.novelty_memory = novelty_memory
+        self.stores = {}
+        self.observed_outputs = self.make_store("observed_outputs")
+        # Exceptions by traceback signature, their first graphs streamed to a log
+        self.exception_store = ExceptionStore(start_time, exceptions_per_signature)
         self.line_counts = line_counts
         self.total_lines = set()
         self.start_time = start_time
-        self.observed_executed_lines = set()  # Tracks executed lines of code
-        self.observed_branches = set()  # Tracks branches that have been covered
+        # Tracks executed lines of code
+        self.observed_executed_lines = self.make_store("observed_executed_lines")
+        # Tracks branches that have been covered
+        self.observed_branches = self.make_store("observed_branches")
+        self.last_new_lines = set()  # Lines first reached by the most recent coverage check
+        self.last_new_branches = set()  # Branches first reached by the most recent branch check
+        self.max_near_miss_bucket = None  # log2 bucket of the largest near-miss gap so far
+        # (signal, value) pairs seen by multi feedback
+        self.observed_signals = self.make_store("observed_signals")
+        # Structure signature features seen; exactly, the oldest beyond 100000 are forgotten
+        self.observed_structures = self.make_store("observed_structures", max_items=100000)
         self.lock = (
             lock or Lock()
         )  # Use a shared lock or create a new one for single instance
 
+    def make_store(self, name, max_items=None):
+        """A novelty store of the configured kind, registered under name for report_novelty()."""
+        kwargs = {"max_items": max_items} if self.novelty_store == "exact" and max_items else {}
+        store = make_novelty_store(self.novelty_store, self.novelty_memory, **kwargs)
+        self.stores[name] = store
+        return store
+
+    def report_novelty(self):
+        print("Novelty stores:")
+        for name, store in self.stores.items():
+            # Stores the feedback mode never used stay empty
+            if store.metrics()["items"]:
+                print(f"  {name}: {store.describe()}.")
+
     def is_new_and_interesting(self, graph, algorithm, check_func):
         try:
             # Run the algorithm on the graph
@@ -108,33 +145,89 @@ class FeedbackTools:
             interesting_result = check_func(result)
 
             # If it's new and hasn't been observed yet
-            if interesting_result not in self.observed_outputs:
-                self.observed_outputs.add(interesting_result)
-                return True
+            return self.observed_outputs.add(interesting_result)
 
-            return False
+        except Exception as e:
+            # A new exception is treated as a new "interesting" result
+            return self.is_new_exception(graph, e)
 
-        except nx.NetworkXException as e:
+    def is_new_exception(self, graph, e):
+        """Record an exception raised on graph; returns whether its traceback signature is new."""
+        if isinstance(e, nx.NetworkXException):
             # Handle NetworkX-specific exceptions
             exception_message = "NetworkX Error: " + str(e)
-            if exception_message not in self.networkx_exceptions:
-                self.networkx_exceptions.add(exception_message)
-                self.exception_graphs[graph] = exception_message
-                return (
-                    True  # Treat this as a new "interesting" result by returning True
-                )
-
-        except Exception as e:
+        else:
             # Handle any other general exceptions
             exception_message = "Error: " + str(e)
-            if exception_message not in self.other_exceptions:
-                self.other_exceptions.add(exception_message)
-                self.exception_graphs[graph] = exception_message
-                return (
-                    True  # Treat this as a new "interesting" result by returning True
-                )
+        return self.exception_store.record(graph, exception_message, e)
+
+    def new_signals(self, graph, algorithm, derive_signals):
+        """Names of the signals, derived from a single run of algorithm, that take a new value.
+
+        derive_signals(graph, result) returns the value of every signal. An
+        exception counts as the signal "exception" when its signature is new,
+        as in is_new_and_interesting.
+        """
+        try:
+            signals = derive_signals(graph, algorithm(graph))
+        except Exception as e:
+            return ["exception"] if self.is_new_exception(graph, e) else []
+        new = self.observed_signals.new_items(signals.items())
+        self.observed_signals.update(new)
+        return [name for name in signals if (name, signals[name]) in new]
+
+    def feedback_signature(self, graph, algorithm, check_func):
+        """Return the value is_new_and_interesting would record for the graph, without recording it."""
+        try:
+            return check_func(algorithm(graph))
+        except nx.NetworkXException as e:
+            return ("NetworkX Error", type(e).__name__)
+        except Exception as e:
+            return ("Error", type(e).__name__)
+
+    def is_new_structure(self, signature):
+        """Whether a structure signature has a feature not seen before.
+
+        Features count one by one, as lines do for coverage, so that not every
+        combination of invariants is new.
+        """
+        new = self.observed_structures.new_items(signature)
+        self.observed_structures.update(new)
+        return bool(new)
 
-        return False
+    def is_new_near_miss(self, gap):
+        """Whether a gap between agreeing implementations (a fraction of the tolerance) sets a new maximum.
+
+        Gaps are compared by their log2 bucket, so each admitted graph is at
+        least twice as close to a discrepancy as the previous one.
+        """
+        if not gap > 0 or not math.isfinite(gap):
+            return False
+        bucket = math.floor(math.log2(gap))
+        if self.max_near_miss_bucket is not None and bucket <= self.max_near_miss_bucket:
+            return False
+        self.max_near_miss_bucket = bucket
+        print(f"New near miss: gap of {gap:.3g} times the tolerance, {time.time() - self.start_time}")
+        return True
+
+    def covered_by(self, graph, algorithm, branch=False):
+        """Return the lines (or branches) the algorithm executes on the graph, without recording them."""
+        with self.lock:
+            if branch:
+                cov = coverage.Coverage(branch=True)
+            else:
+                cov = coverage.Coverage(config_file=".coveragerc")
+            cov.erase()
+            cov.start()
+            try:
+                algorithm(graph)
+            except Exception:
+                pass
+            finally:
+                cov.stop()
+            if branch:
+                return get_executed_branches(cov)
+            return get_executed_lines(cov)
 
     def parse_missing_lines(self, report_content):
         missing_lines = set()
@@ -214,17 +307,8 @@ class FeedbackTools:
 
                 algorithm(graph)
 
-            except nx.NetworkXError as e:
-                exception_message = str(e)
-                if exception_message not in self.networkx_exceptions:
-                    self.networkx_exceptions.add(exception_message)
-                    self.exception_graphs[graph] = exception_message
-
             except Exception as e:
-                exception_message = str(e)
-                if exception_message not in self.other_exceptions:
-                    self.other_exceptions.add(exception_message)
-                    self.exception_graphs[graph] = exception_message
+                self.is_new_exception(graph, e)
 
             finally:
                 # Stop coverage measurement
@@ -237,9 +321,10 @@ class FeedbackTools:
                 current_executed_lines = get_executed_lines(cov)
 
                 # Determine if there are new executed lines
-                new_executed_lines = (
-                    current_executed_lines - self.observed_executed_lines
+                new_executed_lines = self.observed_executed_lines.new_items(
+                    current_executed_lines
                 )
+                self.last_new_lines = new_executed_lines
                 if new_executed_lines:
                     self.observed_executed_lines.update(new_executed_lines)
                     print(f"{len(new_executed_lines)}, {time.time() - self.start_time}")
@@ -292,7 +377,7 @@ class FeedbackTools:
             # print(current_covered_lines)
 
             # Check if there are new lines covered
-            new_covered_lines = current_covered_lines - self.observed_outputs
+            new_covered_lines = self.observed_outputs.new_items(current_covered_lines)
             if new_covered_lines:
                 self.observed_outputs.update(new_covered_lines)
                 print(f"{len(new_covered_lines)}, {time.time() - self.start_time}")
@@ -300,17 +385,8 @@ class FeedbackTools:
                 return True  # New lines are covered
 
             return False
-        except nx.NetworkXError as e:
-            exception_message = str(e)
-            if exception_message not in self.networkx_exceptions:
-                self.networkx_exceptions.add(exception_message)
-                self.exception_graphs[graph] = exception_message
-            return False
         except Exception as e:
-            exception_message = str(e)
-            if exception_message not in self.other_exceptions:
-                self.other_exceptions.add(exception_message)
-                self.exception_graphs[graph] = exception_message
+            self.is_new_exception(graph, e)
             return False
 
     def is_new_branch_triggered(self, graph, algorithm):
@@ -327,17 +403,8 @@ class FeedbackTools:
                 # Execute the algorithm
                 algorithm(graph)
 
-            except nx.NetworkXError as e:
-                exception_message = str(e)
-                if exception_message not in self.networkx_exceptions:
-                    self.networkx_exceptions.add(exception_message)
-                    self.exception_graphs[graph] = exception_message
-
             except Exception as e:
-                exception_message = str(e)
-                if exception_message not in self.other_exceptions:
-                    self.other_exceptions.add(exception_message)
-                    self.exception_graphs[graph] = exception_message
+                self.is_new_exception(graph, e)
 
             finally:
                 # Stop coverage measurement
@@ -350,7 +417,8 @@ class FeedbackTools:
                 current_executed_branches = get_executed_branches(cov)
 
                 # Find new branches that were triggered
-                new_branches = current_executed_branches - self.observed_branches
+                new_branches = self.observed_branches.new_items(current_executed_branches)
+                self.last_new_branches = new_branches
                 if new_branches:
                     # Update the observed branches
                     self.observed_branches.update(new_branches)
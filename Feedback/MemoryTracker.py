@@ -0,0 +1,33 @@
+from Feedback.SlownessTracker import SlownessTracker
+
+
+class MemoryTracker:
+    """Peak memory of the tests against the size of their input.
+
+    Peaks are divided by the number of nodes plus edges and kept per size
+    bucket, the buckets of SlownessTracker. A graph is interesting when its
+    test sets a new maximum for its bucket, by at least `improvement`.
+    """
+
+    def __init__(self, improvement=1.1):
+        self.improvement = improvement
+        # size bucket -> (samples, maximum bytes per node and edge)
+        self.buckets: dict[int, tuple[int, float]] = {}
+        self.largest_peak = 0
+
+    def record(self, num_nodes: int, num_edges: int, peak: int) -> bool:
+        """Add the peak memory of one test; returns whether it set a new per-size maximum."""
+        bucket = SlownessTracker.size_bucket(num_nodes, num_edges)
+        cost = peak / max(num_nodes + num_edges, 1)
+        samples, maximum = self.buckets.get(bucket, (0, 0.0))
+        self.buckets[bucket] = (samples + 1, max(maximum, cost))
+        self.largest_peak = max(self.largest_peak, peak)
+        return cost > maximum * self.improvement
+
+    def report(self):
+        print(f"Memory: largest test peak {self.largest_peak / 2**20:.1f} MB.")
+        for bucket, (samples, maximum) in sorted(self.buckets.items()):
+            print(
+                f"  {2 ** (bucket - 1)}+ nodes and edges: {samples} samples, "
+                f"maximum {maximum / 1024:.2f} KB per node and edge."
+            )
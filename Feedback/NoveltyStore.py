@@ -0,0 +1,254 @@
+import hashlib
+import sys
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+import numpy as np
+
+from Feedback.StructureSignature import mix64
+
+# Number of set bits in every byte value
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def _canonical(item) -> str:
+    """Type-tagged serialization of item, the same for equal items of the same types.
+
+    Set and dict elements are sorted, as their iteration order depends on
+    insertion history.
+    """
+    name = type(item).__name__
+    if isinstance(item, (tuple, list)):
+        return f"{name}({','.join(_canonical(element) for element in item)})"
+    if isinstance(item, (set, frozenset)):
+        return f"{name}({','.join(sorted(_canonical(element) for element in item))})"
+    if isinstance(item, dict):
+        pairs = sorted(f"{_canonical(key)}:{_canonical(value)}" for key, value in item.items())
+        return f"{name}({','.join(pairs)})"
+    return f"{name}:{item!r}"
+
+
+def stable_hash(item) -> int:
+    """64-bit blake2b hash of the canonical serialization of item.
+
+    Python's hash() is no substitute: hash(-1) == hash(-2) and
+    hash(2**61) == hash(1), so approximate stores would take such values
+    for each other whatever their size.
+    """
+    digest = hashlib.blake2b(_canonical(item).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def hash_positions(items: list, rows: int, width: int) -> np.ndarray:
+    """rows positions in [0, width) for every item, by double hashing its stable_hash()."""
+    hashes = np.fromiter((stable_hash(item) for item in items), dtype=np.uint64, count=len(items))
+    first = mix64(hashes)
+    step = mix64(hashes ^ np.uint64(0x9E3779B97F4A7C15)) | np.uint64(1)
+    with np.errstate(over="ignore"):
+        positions = first[:, None] + np.arange(rows, dtype=np.uint64)[None, :] * step[:, None]
+    return (positions % np.uint64(width)).astype(np.int64)
+
+
+class NoveltyStore(ABC):
+    """Set-like record of the feedback items seen, e.g. covered lines or results.
+
+    Approximate stores may take a new item for one seen before (a false
+    positive) but never the reverse, so feedback only loses some novelty.
+    """
+
+    kind = None
+
+    @abstractmethod
+    def new_items(self, items) -> set:
+        """The items not seen before, without recording them."""
+
+    @abstractmethod
+    def update(self, items):
+        """Record the items as seen."""
+
+    @abstractmethod
+    def metrics(self) -> dict:
+        """items recorded, occupancy, estimated false-positive rate and memory in bytes."""
+
+    def __contains__(self, item):
+        return not self.new_items([item])
+
+    def add(self, item) -> bool:
+        """Record item; returns whether it was new."""
+        if item in self:
+            return False
+        self.update([item])
+        return True
+
+    def describe(self) -> str:
+        metrics = self.metrics()
+        return (
+            f"{self.kind}, {metrics['items']} items, {metrics['occupancy']:.1%} occupied, "
+            f"{metrics['memory_bytes'] / 2**20:.1f} MB, "
+            f"estimated false-positive rate {metrics['false_positive_rate']:.2g}"
+        )
+
+
+class ExactNoveltyStore(NoveltyStore):
+    """Exact set of the items. Within a memory budget the oldest items are forgotten.
+
+    Memory is estimated from sys.getsizeof of the items plus a fixed
+    overhead per entry, objects shared between items are not counted.
+    """
+
+    kind = "exact"
+    ENTRY_OVERHEAD = 100
+
+    def __init__(self, memory_budget=None, max_items=None):
+        self.memory_budget = memory_budget
+        self.max_items = max_items
+        # Insertion ordered only when items may have to be forgotten
+        self.items = set() if memory_budget is None and max_items is None else OrderedDict()
+        self.memory_bytes = 0
+        self.num_forgotten = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __contains__(self, item):
+        return item in self.items
+
+    def new_items(self, items) -> set:
+        return {item for item in items if item not in self.items}
+
+    def update(self, items):
+        for item in items:
+            if item in self.items:
+                continue
+            self.memory_bytes += sys.getsizeof(item) + self.ENTRY_OVERHEAD
+            if isinstance(self.items, set):
+                self.items.add(item)
+            else:
+                self.items[item] = None
+        if isinstance(self.items, OrderedDict):
+            while self.items and (
+                (self.max_items is not None and len(self.items) > self.max_items)
+                or (self.memory_budget is not None and self.memory_bytes > self.memory_budget)
+            ):
+                forgotten, _ = self.items.popitem(last=False)
+                self.memory_bytes -= sys.getsizeof(forgotten) + self.ENTRY_OVERHEAD
+                self.num_forgotten += 1
+
+    def metrics(self) -> dict:
+        limit = self.memory_budget or 0
+        return {
+            "items": len(self.items),
+            "occupancy": self.memory_bytes / limit if limit else 0.0,
+            "false_positive_rate": 0.0,
+            "memory_bytes": self.memory_bytes,
+            "forgotten": self.num_forgotten,
+        }
+
+
+class BloomNoveltyStore(NoveltyStore):
+    """Bloom filter over memory_budget bytes with num_hashes hash functions."""
+
+    kind = "bloom"
+
+    def __init__(self, memory_budget=4 * 2**20, num_hashes=4):
+        self.num_bits = memory_budget * 8
+        self.num_hashes = num_hashes
+        # Zeroed pages are only backed by memory once bits are set in them
+        self.bits = np.zeros(memory_budget, dtype=np.uint8)
+        self.num_items = 0
+
+    def _seen(self, items):
+        positions = hash_positions(items, self.num_hashes, self.num_bits)
+        set_bits = (self.bits[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1
+        return set_bits.all(axis=1)
+
+    def new_items(self, items) -> set:
+        items = list(items)
+        if not items:
+            return set()
+        return {item for item, seen in zip(items, self._seen(items)) if not seen}
+
+    def update(self, items):
+        items = list(items)
+        if not items:
+            return
+        positions = hash_positions(items, self.num_hashes, self.num_bits).ravel()
+        np.bitwise_or.at(self.bits, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+        self.num_items += len(items)
+
+    def metrics(self) -> dict:
+        occupancy = int(_POPCOUNT[self.bits].sum(dtype=np.int64)) / self.num_bits
+        return {
+            "items": self.num_items,
+            "occupancy": occupancy,
+            # A new item is mistaken for a seen one when all its bits happen to be set
+            "false_positive_rate": occupancy**self.num_hashes,
+            "memory_bytes": self.bits.nbytes,
+        }
+
+
+class CountMinNoveltyStore(NoveltyStore):
+    """Count-min sketch over memory_budget bytes: depth rows of 32-bit counters.
+
+    An item is new while its smallest counter is zero. count() estimates
+    how often an item was recorded, never below the true count.
+    """
+
+    kind = "countmin"
+
+    def __init__(self, memory_budget=4 * 2**20, depth=4):
+        self.depth = depth
+        self.width = max(memory_budget // (4 * depth), 1)
+        self.counts = np.zeros((depth, self.width), dtype=np.uint32)
+        self.num_items = 0
+
+    def _counts(self, items):
+        positions = hash_positions(items, self.depth, self.width)
+        return self.counts[np.arange(self.depth)[None, :], positions].min(axis=1)
+
+    def count(self, item) -> int:
+        return int(self._counts([item])[0])
+
+    def new_items(self, items) -> set:
+        items = list(items)
+        if not items:
+            return set()
+        return {item for item, count in zip(items, self._counts(items)) if count == 0}
+
+    def update(self, items):
+        items = list(items)
+        if not items:
+            return
+        positions = hash_positions(items, self.depth, self.width)
+        rows = np.broadcast_to(np.arange(self.depth)[None, :], positions.shape)
+        np.add.at(self.counts, (rows, positions), 1)
+        self.num_items += len(items)
+
+    def metrics(self) -> dict:
+        row_occupancy = np.count_nonzero(self.counts, axis=1) / self.width
+        return {
+            "items": self.num_items,
+            "occupancy": float(row_occupancy.mean()),
+            # A new item is mistaken for a seen one when its counter is taken in every row
+            "false_positive_rate": float(np.prod(row_occupancy)),
+            "memory_bytes": self.counts.nbytes,
+        }
+
+
+NOVELTY_STORES = {
+    "exact": ExactNoveltyStore,
+    "bloom": BloomNoveltyStore,
+    "countmin": CountMinNoveltyStore,
+}
+
+
+def make_novelty_store(kind="exact", memory_budget=None, **kwargs) -> NoveltyStore:
+    """A store of the given kind; approximate ones default to a 4 MB budget."""
+    if kind not in NOVELTY_STORES:
+        raise ValueError(f"Unknown novelty store: {kind}")
+    if memory_budget is None and kind != "exact":
+        memory_budget = 4 * 2**20
+    return NOVELTY_STORES[kind](memory_budget, **kwargs)
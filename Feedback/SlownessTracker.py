@@ -0,0 +1,71 @@
+class SizeBucketStats:
+    def __init__(self):
+        self.samples = 0
+        # Moving average and maximum of the time per node and edge
+        self.baseline = None
+        self.maximum = 0.0
+
+
+class SlownessTracker:
+    """Running time of every implementation against the size of its input.
+
+    Times are divided by the number of nodes plus edges and kept per size
+    bucket (n + m rounded down to a power of two). A graph is interesting
+    when some implementation sets a new maximum for its bucket, by at least
+    `improvement`. It is a performance finding when, once the bucket has
+    `min_samples` samples, the implementation took at least `min_latency`
+    seconds and `finding_ratio` times the bucket's baseline. Findings do not
+    move the baseline.
+    """
+
+    def __init__(self, finding_ratio=10.0, min_samples=20, min_latency=0.01, improvement=1.1):
+        self.finding_ratio = finding_ratio
+        self.min_samples = min_samples
+        self.min_latency = min_latency
+        self.improvement = improvement
+        self.buckets: dict[tuple[str, int], SizeBucketStats] = {}
+        self.num_findings = 0
+
+    @staticmethod
+    def size_bucket(num_nodes, num_edges):
+        return max(num_nodes + num_edges, 1).bit_length()
+
+    def record(
+        self, num_nodes: int, num_edges: int, latencies: dict[str, float]
+    ) -> tuple[bool, list[tuple[str, float]]]:
+        """Add the latency of every implementation on one graph.
+
+        Returns whether the graph set a new per-size maximum and the
+        (implementation, ratio to the baseline) of every performance finding.
+        """
+        size = max(num_nodes + num_edges, 1)
+        bucket = self.size_bucket(num_nodes, num_edges)
+        new_maximum = False
+        findings = []
+        for algo_name, latency in latencies.items():
+            cost = latency / size
+            stats = self.buckets.setdefault((algo_name, bucket), SizeBucketStats())
+            if cost > stats.maximum * self.improvement:
+                new_maximum = True
+            stats.maximum = max(stats.maximum, cost)
+
+            if (
+                stats.samples >= self.min_samples
+                and latency >= self.min_latency
+                and cost >= self.finding_ratio * stats.baseline
+            ):
+                findings.append((algo_name, cost / stats.baseline))
+                continue
+            stats.samples += 1
+            stats.baseline = cost if stats.baseline is None else 0.95 * stats.baseline + 0.05 * cost
+        self.num_findings += len(findings)
+        return new_maximum, findings
+
+    def report(self):
+        print(f"Slowness: {self.num_findings} performance finding(s).")
+        for (algo_name, bucket), stats in sorted(self.buckets.items()):
+            print(
+                f"  {algo_name}, {2 ** (bucket - 1)}+ nodes and edges: {stats.samples} samples, "
+                f"baseline {stats.baseline * 1e6:.2f} us, maximum {stats.maximum * 1e6:.2f} us "
+                f"per node and edge."
+            )
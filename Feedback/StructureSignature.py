@@ -0,0 +1,108 @@
+import igraph as ig
+import networkx as nx
+import numpy as np
+
+# Rounds of Weisfeiler-Lehman refinement and bits of the WL hash kept in the signature
+WL_ITERATIONS = 2
+WL_BITS = 8
+
+
+def mix64(values):
+    """splitmix64 finalizer, a cheap bijective scramble of uint64 arrays."""
+    with np.errstate(over="ignore"):
+        values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return values ^ (values >> np.uint64(31))
+
+
+def _log_bucket(count):
+    return int(count).bit_length()
+
+
+def wl_hash(num_nodes, sources, targets, degrees, iterations=WL_ITERATIONS, bits=WL_BITS):
+    """Truncated Weisfeiler-Lehman hash over index arrays of the (directed) edges.
+
+    Each round a node's label becomes a scramble of its label and the sum of
+    its neighbours' scrambled labels, which does not depend on their order.
+    """
+    labels = mix64(degrees.astype(np.uint64))
+    for _ in range(iterations):
+        aggregated = np.zeros(num_nodes, dtype=np.uint64)
+        np.add.at(aggregated, sources, mix64(labels[targets]))
+        with np.errstate(over="ignore"):
+            labels = mix64(labels * np.uint64(31) + aggregated)
+    with np.errstate(over="ignore"):
+        return int(mix64(labels).sum(dtype=np.uint64)) & ((1 << bits) - 1)
+
+
+def _weight_mix(weights):
+    """Which of missing, NaN, negative, zero and positive weights the graph has."""
+    present = [weight for weight in weights if weight is not None]
+    values = np.array(present, dtype=float)
+    return (
+        len(present) < len(weights),
+        bool(np.isnan(values).any()),
+        bool((values < 0).any()),
+        bool((values == 0).any()),
+        bool((values > 0).any()),
+    )
+
+
+def structure_signature(graph: nx.Graph) -> tuple:
+    """Cheap invariants of a graph as a tuple of (invariant, value...) features.
+
+    Node and edge counts, and the number of nodes in each log2 degree bucket,
+    are taken in log2 buckets, density in tenths. Components are counted as
+    strongly connected ones for directed graphs, connected and biconnected
+    ones for undirected graphs; density and component counts are paired with
+    the node count bucket. Add the mix of weight signs, whether there are
+    parallel edges and self loops, and a truncated WL hash.
+    """
+    num_nodes = graph.number_of_nodes()
+    directed = graph.is_directed()
+    index = {node: i for i, node in enumerate(graph)}
+    edge_list = list(graph.edges(data="weight"))
+    weights = [weight for _, _, weight in edge_list]
+    endpoints = [(index[u], index[v]) for u, v, _ in edge_list]
+    edges = np.array(endpoints, dtype=np.int64).reshape(-1, 2)
+    num_edges = len(edges)
+
+    degrees = np.bincount(edges.ravel(), minlength=num_nodes)
+    degree_histogram = np.bincount(np.log2(degrees + 1).astype(np.int64))
+    pairs = num_nodes * (num_nodes - 1) // (1 if directed else 2)
+    density = min(round(10 * num_edges / pairs), 10) if pairs else 0
+
+    # igraph counts components in C, from the index arrays already at hand
+    graph_ig = ig.Graph(n=num_nodes, edges=endpoints, directed=directed)
+    if directed:
+        components = [
+            ("strong_components", _log_bucket(len(graph_ig.connected_components(mode="strong"))))
+        ]
+        sources, targets = edges[:, 0], edges[:, 1]
+        pair_codes = edges[:, 0] * num_nodes + edges[:, 1]
+    else:
+        components = [
+            ("components", _log_bucket(len(graph_ig.connected_components()))),
+            ("biconnected_components", _log_bucket(len(graph_ig.biconnected_components()))),
+        ]
+        sources = np.concatenate([edges[:, 0], edges[:, 1]])
+        targets = np.concatenate([edges[:, 1], edges[:, 0]])
+        pair_codes = edges.min(axis=1) * num_nodes + edges.max(axis=1)
+
+    nodes_bucket = _log_bucket(num_nodes)
+    return (
+        ("directed", directed),
+        ("nodes", nodes_bucket),
+        ("edges", _log_bucket(num_edges)),
+        *(
+            ("degree", bucket, _log_bucket(count))
+            for bucket, count in enumerate(degree_histogram)
+            if count
+        ),
+        ("density", nodes_bucket, density),
+        *((name, nodes_bucket, count) for name, count in components),
+        ("weights", _weight_mix(weights)),
+        ("parallel_edges", len(np.unique(pair_codes)) < num_edges),
+        ("self_loops", bool((edges[:, 0] == edges[:, 1]).any())),
+        ("wl", wl_hash(num_nodes, sources, targets, degrees)),
+    )
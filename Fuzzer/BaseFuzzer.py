@@ -1,21 +1,58 @@
 import os
+import random
 import signal
 import sys
 import time
 import threading
+import tracemalloc
+import weakref
 from abc import ABC, abstractmethod
 
 import networkx as nx
 
 from Tester.BaseTester import BaseTester
 from Feedback.FeedbackTools import FeedbackTools
+from Feedback.MemoryTracker import MemoryTracker
+from Feedback.StructureSignature import structure_signature
+from Feedback.SlownessTracker import SlownessTracker
+from Mutator.CorpusTrimmer import CorpusTrimmer
+from Mutator.DeterministicMutator import DeterministicMutator
 from Mutator.ExtendedMutator import ExtendedMutator
 from Scheduler.RandomMemScheduler import RandomMemScheduler
-from Utils.FileUtils import save_exception_graphs, update_coveragerc
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from Utils.FileUtils import exception_log_path, save_discrepancy, update_coveragerc
+from Utils.GraphHashing import graph_fingerprint
+from Utils.MemoryLimit import can_limit_address_space
+from Utils.ParallelTestPool import ParallelTestPool
+from Utils.RelationBandit import RelationBandit
+from Utils.SizeController import SizeController
+from Utils.TimeoutCalibrator import TimeoutCalibrator
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+    wait as wait_for_futures,
+)
 
 
 class BaseFuzzer(ABC):
+    # Feedback types served by a fuzzer-specific executor and interesting check
+    SPECIALIZED_FEEDBACK = {
+        "hop_count": ("executor_hop_count", "hop_count_interesting_check"),
+        "negative_edges": ("executor_negative_edges", "negative_edge_interesting_check"),
+        "component_distribution": (
+            "executor_component_distribution",
+            "component_distribution_interesting_check",
+        ),
+        "trivial_ratio": ("executor_trivial_ratio", "trivial_ratio_interesting_check"),
+        "saturated_edges": ("executor_saturated_edges", "saturated_edges_interesting_check"),
+        "max_degree": ("executor_max_degree", "max_degree_interesting_check"),
+    }
+    # Signals of the multi feedback type, all derived from one multi_executor result:
+    # name -> method(G, result); fuzzers add their specialized signals
+    MULTI_SIGNALS = {"regular": "regular_signal"}
+    # Feedback types measured while a graph is tested on its own (largest gap, latency,
+    # peak memory), which neither trimming nor screening a batch's union provides
+    MEASURED_FEEDBACK = ("near_miss", "slowness", "memory")
+
     def __init__(
         self,
         num_iterations=60,
@@ -25,6 +62,31 @@ class BaseFuzzer(ABC):
         algorithm=None,
         scheduler=None,
         timeout_duration=20,
+        trim_corpus=False,
+        trim_max_execs=200,
+        target_latency=None,
+        latency_percentile=90,
+        calibrate_timeout=False,
+        calibration_runs=3,
+        quarantine_strikes=2,
+        deterministic=False,
+        deterministic_max_nodes=20,
+        deterministic_batch_size=32,
+        batch_size=1,
+        tiered=False,
+        tier_sample_rate=0.1,
+        tier_sample_rates=None,
+        parallel_min_nodes=None,
+        parallel_workers=None,
+        parallel_deadline=None,
+        adaptive_relations=False,
+        relation_exploration=0.1,
+        slowness_ratio=10.0,
+        slowdown_ratio=None,
+        memory_limit=None,
+        novelty_store="exact",
+        novelty_memory=None,
+        exceptions_per_signature=5,
     ):
         self.corpus_dir = os.path.join(
             os.path.dirname(os.path.abspath(__file__)), "..", "Corpus_Data"
@@ -39,68 +101,346 @@ class BaseFuzzer(ABC):
         self.feedback_check_type = feedback_check_type
         update_coveragerc()
         self.start_time = time.time()
-        self.feedback_tool = FeedbackTools(start_time=self.start_time)
+        self.feedback_tool = FeedbackTools(
+            start_time=self.start_time,
+            novelty_store=novelty_store,
+            novelty_memory=int(novelty_memory * 2**20) if novelty_memory else None,
+            exceptions_per_signature=exceptions_per_signature,
+        )
+        self.feedback_tool.exception_store.open(exception_log_path(self.get_corpus_name()))
         self.total_bug_counts = {}
         self.num_graphs = 0
         self.count = 0
         self.scheduler = scheduler or RandomMemScheduler(start_time=self.start_time)
         self.timeout_duration = timeout_duration
+        # Address space in bytes an implementation may add to a parallel worker; with a
+        # limit, implementations run in the workers on graphs of every size by default
+        self.memory_limit = memory_limit * 2**20 if memory_limit else None
+        if self.memory_limit and not can_limit_address_space():
+            print("Warning: The memory limit is not supported on this platform.")
+        if self.memory_limit and feedback_check_type == "memory":
+            # tracemalloc only sees the fuzzer process, not the workers the limit moves tests to
+            raise ValueError("Memory feedback cannot be combined with a memory limit.")
+        if self.memory_limit and parallel_min_nodes is None:
+            parallel_min_nodes = 0
         self.stop_fuzzing = (
             threading.Event()
         )  # Use a threading event to handle stopping the fuzzing process
         self.test_method = test_method
         self.algorithm = algorithm
+        self.trimmer = CorpusTrimmer(max_execs=trim_max_execs) if trim_corpus else None
+        self.trim_max_execs = trim_max_execs
+        self.size_controller = (
+            SizeController(target_latency=target_latency, percentile=latency_percentile)
+            if target_latency
+            else None
+        )
+        # A single long-lived worker runs the tests, so no thread is spawned per test
+        self.test_executor = ThreadPoolExecutor(max_workers=1)
+        self.combination_admitted_by = None
+        self.calibrator = (
+            TimeoutCalibrator(max_timeout=timeout_duration) if calibrate_timeout else None
+        )
+        self.calibration_runs = calibration_runs
+        self.quarantine_strikes = quarantine_strikes
+        # A test slower than this fraction of the timeout counts as approaching it
+        self.slow_test_fraction = 0.5
+        self.slow_strikes = {}
+        self.num_quarantined = 0
+        self.nondeterministic_implementations = {}
+        self.deterministic_mutator = (
+            DeterministicMutator(max_nodes=deterministic_max_nodes) if deterministic else None
+        )
+        self.deterministic_batch_size = deterministic_batch_size
+        # Corpus entries still waiting for their deterministic stage
+        self.deterministic_queue = []
+        # Fingerprints of the mutants tested in the deterministic stage, bounded
+        # like the feedback state by --novelty_store
+        self.seen_fingerprints = self.feedback_tool.make_store("seen_fingerprints")
+        self.deterministic_execs = 0
+        self.deterministic_skipped = 0
+        self.deterministic_admitted = 0
+        self.batch_size = batch_size
+        if batch_size > 1 and feedback_check_type in self.MEASURED_FEEDBACK:
+            print(
+                f"Warning: {feedback_check_type} feedback is measured per graph, "
+                f"batches are not screened as a whole."
+            )
+        self.tiered = tiered
+        self.tier_sample_rate = tier_sample_rate
+        self.tier_sample_rates = tier_sample_rates or {}
+        # Graphs with at least parallel_min_nodes nodes run their implementations
+        # in a process pool; each implementation gets half the test timeout by default
+        self.parallel_pool = (
+            ParallelTestPool(parallel_workers, memory_limit=self.memory_limit)
+            if parallel_min_nodes is not None
+            else None
+        )
+        self.parallel_min_nodes = parallel_min_nodes
+        self.parallel_deadline = parallel_deadline or timeout_duration / 2
+        self.adaptive_relations = adaptive_relations
+        self.relation_exploration = relation_exploration
+        # Gap between agreeing implementations measured while testing each graph,
+        # and the graph with the largest gap, which near_miss feedback climbs from
+        self.disagreement_gaps = weakref.WeakKeyDictionary()
+        # Comparisons of each mutant's test that tiering left incomplete
+        self.partial_comparisons = weakref.WeakKeyDictionary()
+        self.near_miss_parent = None
+        self.near_miss_focus = 0.5
+        # Running time against graph size under slowness feedback, and the graphs
+        # that set a new per-size maximum, waiting for their feedback check
+        self.slowness_tracker = (
+            SlownessTracker(finding_ratio=slowness_ratio)
+            if feedback_check_type == "slowness"
+            else None
+        )
+        self.slow_graphs = weakref.WeakSet()
+        # Performance-differential findings are minimized with their own trimmer
+        self.slowdown_ratio = slowdown_ratio
+        # Performance-differential findings minimized and saved per message, beyond
+        # which they are only counted, and seconds one minimization may take
+        self.slowdown_findings_per_message = 5
+        self.slowdown_trim_seconds = 10.0
+        self.slowdown_counts = {}
+        self.slowdown_trimmer = (
+            CorpusTrimmer(max_execs=trim_max_execs) if slowdown_ratio is not None else None
+        )
+        # Peak traced memory of each test against graph size under memory feedback,
+        # and the graphs that set a new per-size maximum
+        self.memory_tracker = MemoryTracker() if feedback_check_type == "memory" else None
+        self.memory_graphs = weakref.WeakSet()
+        if self.memory_tracker is not None:
+            tracemalloc.start()
+        # Graphs admitted by each signal under multi feedback
+        self.multi_admissions = {}
+        self.tester = None
 
     def _timeout_handler(self, signum, frame):
         raise TimeoutError("Test execution exceeded the time limit")
 
     def process_test_results_with_timeout(
-        self, mutated_graph, tester, first_occurrence_times, total_bug_counts, timestamp
+        self,
+        mutated_graph,
+        tester,
+        first_occurrence_times,
+        total_bug_counts,
+        timestamp,
+        all_tiers=False,
     ):
         """Wrapper method to add a timeout around process_test_results using ThreadPoolExecutor."""
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(
-                self.process_test_results,
-                mutated_graph,
-                tester,
-                first_occurrence_times,
-                total_bug_counts,
-                timestamp,
+        future = self.test_executor.submit(
+            self.process_test_results,
+            mutated_graph,
+            tester,
+            first_occurrence_times,
+            total_bug_counts,
+            timestamp,
+            all_tiers,
+        )
+
+        timeout = self.test_timeout(mutated_graph)
+        try:
+            # Wait for the process to complete or raise a timeout
+            future.result(timeout=timeout)
+            success = True  # Success, no timeout
+        except MemoryError as e:
+            self.record_memory_error(
+                mutated_graph, tester, e, first_occurrence_times, total_bug_counts, timestamp
+            )
+            success = False
+        except FutureTimeoutError:  # Catch TimeoutError from futures
+            self.record_timeout(mutated_graph, timeout)
+            print(
+                f"Timeout occurred while processing graph at {timestamp} seconds."
+            )
+            # The test thread cannot be interrupted, let it finish before the next test
+            wait_for_futures([future])
+            success = False  # Timeout occurred
+        except Exception as e:
+            # Handle other exceptions from the process
+            self.record_test_exception(mutated_graph, f"Error: {str(e)}", e)
+            print(f"Error occurred while processing graph at {timestamp} seconds.")
+            success = False  # Some other error occurred
+        self.record_slowdowns(tester, first_occurrence_times, total_bug_counts, timestamp)
+        return success
+
+    def record_memory_error(
+        self, graph, tester, error, first_occurrence_times, total_bug_counts, timestamp
+    ):
+        """Save and count a graph whose test ran out of memory (e.g. over --memory_limit)."""
+        print(f"Out of memory while processing graph at {timestamp} seconds: {error}")
+        message = "Memory: A test ran out of memory on a graph!"
+        save_discrepancy(
+            (message, graph, timestamp),
+            f"{tester.discrepancy_filename}_memory_{tester.uuid}.pkl",
+        )
+        self.count_bug(message, first_occurrence_times, total_bug_counts, timestamp)
+
+    def test_timeout(self, graph):
+        """Seconds a test of graph may take: --timeout, or the calibrated timeout for its size."""
+        if self.calibrator is None or not self.calibrator.calibrated:
+            return self.timeout_duration
+        return self.calibrator.timeout(self.calibrator.graph_size(graph))
+
+    def record_timeout(self, graph, timeout):
+        # All timeouts are one exception signature, whatever the timeout of the graph
+        self.feedback_tool.exception_store.record(
+            graph, f"Timeout Error: Exceeded {timeout:.3f} seconds.", signature=("Timeout Error",)
+        )
+
+    def record_test_exception(self, graph, exception_message, error=None):
+        """Log graph with the exception (or timeout) its test raised, see Feedback.ExceptionStore."""
+        self.feedback_tool.exception_store.record(graph, exception_message, error)
+
+    def process_test_batch_with_timeout(
+        self, graphs, tester, first_occurrence_times, total_bug_counts, timestamp
+    ):
+        """Test several graphs in one submission to the test worker.
+
+        Decomposable testers first screen the whole batch with one call per
+        implementation, only graphs they disagree on are tested one by one.
+        Screening and each graph tested on its own get the timeout. A graph
+        that exceeds it is reported and the graphs after it are tested in a
+        new batch; when screening exceeds it, every graph is tested on its
+        own. Returns the graphs that were tested without an error or timeout,
+        in order.
+        """
+        tested = []
+        # Screening gets the timeout of a graph as large as the union of the batch
+        timeouts = [self.test_timeout(graph) for graph in graphs]
+        screen_timeout = self.timeout_duration
+        if self.calibrator is not None and self.calibrator.calibrated:
+            screen_timeout = self.calibrator.timeout(
+                sum(self.calibrator.graph_size(graph) for graph in graphs)
             )
+        # Index of the graph under test (None while screening) and when it started
+        current = (None, time.perf_counter())
+        abandoned = threading.Event()
+
+        def run_batch():
+            nonlocal current
+            if self.feedback_check_type in self.MEASURED_FEEDBACK:
+                # Every graph needs its own measurements, which only process_test_results takes
+                screened = [False] * len(graphs)
+            else:
+                screened = tester.screen_batch(graphs)
+            for index, (graph, agreed) in enumerate(zip(graphs, screened)):
+                if self.stop_fuzzing.is_set() or abandoned.is_set():
+                    break
+                if agreed:
+                    tested.append(graph)
+                    continue
+                current = (index, time.perf_counter())
+                try:
+                    self.process_test_results(
+                        graph, tester, first_occurrence_times, total_bug_counts, timestamp
+                    )
+                    tested.append(graph)
+                except MemoryError as e:
+                    self.record_memory_error(
+                        graph, tester, e, first_occurrence_times, total_bug_counts, timestamp
+                    )
+                except Exception as e:
+                    self.record_test_exception(graph, f"Error: {str(e)}", e)
+                    print(f"Error occurred while processing graph at {timestamp} seconds.")
 
+        future = self.test_executor.submit(run_batch)
+        while True:
+            index, started = current
+            timeout = screen_timeout if index is None else timeouts[index]
             try:
-                # Wait for the process to complete or raise a timeout
-                future.result(timeout=self.timeout_duration)
-                return True  # Success, no timeout
-            except FutureTimeoutError:  # Catch TimeoutError from futures
-                exception_message = (
-                    f"Timeout Error: Exceeded {self.timeout_duration} seconds."
-                )
-                if exception_message not in self.feedback_tool.other_exceptions:
-                    self.feedback_tool.other_exceptions.add(exception_message)
-                    self.feedback_tool.exception_graphs[mutated_graph] = (
-                        exception_message
+                future.result(timeout=max(0.0, started + timeout - time.perf_counter()))
+                break
+            except FutureTimeoutError:
+                if current[1] != started:
+                    # The next graph started meanwhile
+                    continue
+            # The test thread cannot be interrupted, let it finish before the next test
+            abandoned.set()
+            wait_for_futures([future])
+            if index is None:
+                print(f"Timeout occurred while screening a batch at {timestamp} seconds.")
+                return [
+                    graph
+                    for graph in graphs
+                    if not self.stop_fuzzing.is_set()
+                    and self.process_test_results_with_timeout(
+                        graph, tester, first_occurrence_times, total_bug_counts, timestamp
                     )
-                print(
-                    f"Timeout occurred while processing graph at {timestamp} seconds."
+                ]
+            self.record_timeout(graphs[index], timeout)
+            print(f"Timeout occurred while processing graph at {timestamp} seconds.")
+            tested = [graph for graph in tested if graph is not graphs[index]]
+            self.record_slowdowns(tester, first_occurrence_times, total_bug_counts, timestamp)
+            if index + 1 < len(graphs) and not self.stop_fuzzing.is_set():
+                tested += self.process_test_batch_with_timeout(
+                    graphs[index + 1 :], tester, first_occurrence_times, total_bug_counts, timestamp
                 )
-                return False  # Timeout occurred
-            except Exception as e:
-                # Handle other exceptions from the process
-                exception_message = f"Error: {str(e)}"
-                if exception_message not in self.feedback_tool.other_exceptions:
-                    self.feedback_tool.other_exceptions.add(exception_message)
-                    self.feedback_tool.exception_graphs[mutated_graph] = (
-                        exception_message
+            return tested
+        self.record_slowdowns(tester, first_occurrence_times, total_bug_counts, timestamp)
+        return tested
+
+    def fuzz_in_batches(
+        self, graph, graph_id, mutator, tester, first_occurrence_times, total_bug_counts
+    ):
+        """Havoc round that generates and tests batch_size mutants of the graph at a time."""
+        remaining = self.num_iterations
+        while remaining > 0 and not self.stop_fuzzing.is_set():
+            batch = [
+                mutator.stacked_mutate(graph.copy())
+                for _ in range(min(self.batch_size, remaining))
+            ]
+            remaining -= len(batch)
+            self.count += len(batch)
+
+            execution_start = time.time()
+            timestamp = execution_start - self.start_time
+            tested = self.process_test_batch_with_timeout(
+                batch, tester, first_occurrence_times, total_bug_counts, timestamp
+            )
+            latency = (time.time() - execution_start) / len(batch)
+            self.record_test_latency(
+                graph_id, latency, sum(map(self.test_timeout, batch)) / len(batch)
+            )
+
+            for mutated_graph in tested:
+                if self.perform_feedback_checks(mutated_graph):
+                    self.admit_tested_graph(
+                        mutated_graph, tester, first_occurrence_times, total_bug_counts
                     )
-                print(f"Error occurred while processing graph at {timestamp} seconds.")
-                return False  # Some other error occurred
+                    graph = mutated_graph
+
+            for mutated_graph in batch:
+                self.record_execution(mutator, mutated_graph, latency)
+            self.commit_trimmed_graphs()
 
     def regular_feedback_check(self, mutated_graph):
         return self.feedback_tool.is_new_and_interesting(
             mutated_graph, self.executor, self.interesting_check
         )
 
+    def multi_executor(self, G):
+        """The result every multi feedback signal is derived from; the executor's by default."""
+        return self.executor(G)
+
+    def regular_signal(self, G, result):
+        return self.signature_check(result)
+
+    def derive_signals(self, G, result):
+        return {name: getattr(self, method)(G, result) for name, method in self.MULTI_SIGNALS.items()}
+
+    def multi_feedback_check(self, mutated_graph):
+        """Feedback on every registered signal at the cost of a single execution."""
+        new_signals = self.feedback_tool.new_signals(
+            mutated_graph, self.multi_executor, self.derive_signals
+        )
+        for name in new_signals:
+            self.multi_admissions[name] = self.multi_admissions.get(name, 0) + 1
+        return bool(new_signals)
+
+    def structure_feedback_check(self, mutated_graph):
+        return self.feedback_tool.is_new_structure(structure_signature(mutated_graph))
+
     def coverage_feedback_check(self, mutated_graph):
         return self.feedback_tool.is_new_and_interesting_coverage_updated(
             mutated_graph, self.executor
@@ -110,10 +450,12 @@ class BaseFuzzer(ABC):
         if self.feedback_tool.is_new_and_interesting(
             mutated_graph, self.executor, self.interesting_check
         ):
+            self.combination_admitted_by = "regular"
             return True
         elif self.feedback_tool.is_new_and_interesting_coverage_updated(
             mutated_graph, self.executor
         ):
+            self.combination_admitted_by = "coverage"
             return True
         return False
 
@@ -177,6 +519,32 @@ class BaseFuzzer(ABC):
             mutated_graph, executor, interesting_check
         )
 
+    def near_miss_feedback_check(self, mutated_graph):
+        """Feedback on how close the implementations came to a discrepancy on the graph.
+
+        Reuses the gap measured while the graph was tested, so no extra
+        execution is needed.
+        """
+        gap = self.disagreement_gaps.pop(mutated_graph, 0.0)
+        if self.feedback_tool.is_new_near_miss(gap):
+            self.near_miss_parent = mutated_graph
+            return True
+        return False
+
+    def slowness_feedback_check(self, mutated_graph):
+        """Feedback on graphs on which some implementation set a new per-size running time maximum."""
+        if mutated_graph in self.slow_graphs:
+            self.slow_graphs.discard(mutated_graph)
+            return True
+        return False
+
+    def memory_feedback_check(self, mutated_graph):
+        """Feedback on graphs whose test set a new per-size peak memory maximum."""
+        if mutated_graph in self.memory_graphs:
+            self.memory_graphs.discard(mutated_graph)
+            return True
+        return False
+
     def perform_feedback_checks(self, mutated_graph):
         if self.feedback_check_type == "regular":
             return self.regular_feedback_check(mutated_graph)
@@ -200,6 +568,16 @@ class BaseFuzzer(ABC):
             return self.saturated_edges_feedback_check(mutated_graph)
         elif self.feedback_check_type == "max_degree":
             return self.max_degree_feedback_check(mutated_graph)
+        elif self.feedback_check_type == "near_miss":
+            return self.near_miss_feedback_check(mutated_graph)
+        elif self.feedback_check_type == "slowness":
+            return self.slowness_feedback_check(mutated_graph)
+        elif self.feedback_check_type == "memory":
+            return self.memory_feedback_check(mutated_graph)
+        elif self.feedback_check_type == "structure":
+            return self.structure_feedback_check(mutated_graph)
+        elif self.feedback_check_type == "multi":
+            return self.multi_feedback_check(mutated_graph)
         else:
             raise ValueError(f"Unknown feedback check type: {self.feedback_check_type}")
 
@@ -235,6 +613,138 @@ class BaseFuzzer(ABC):
     def set_interesting_check(self, func):
         self._user_interesting_check = func
 
+    def signature_check(self, result):
+        """Pure variant of interesting_check used to compare a graph with its trimmed versions."""
+        if hasattr(self, "_user_signature_check"):
+            return self._user_signature_check(result)
+        return self.interesting_check(result)
+
+    def set_signature_check(self, func):
+        # Needed when the interesting check keeps state, e.g. returns None for seen buckets
+        self._user_signature_check = func
+
+    def get_feedback_functions(self):
+        """Return the (executor, check) pair behind the current executor-based feedback type."""
+        if self.feedback_check_type in self.SPECIALIZED_FEEDBACK:
+            executor_name, check_name = self.SPECIALIZED_FEEDBACK[self.feedback_check_type]
+            return (
+                getattr(self, executor_name, self.executor),
+                getattr(self, check_name, self.signature_check),
+            )
+        if self.feedback_check_type == "structure":
+            return structure_signature, lambda signature: signature
+        if self.feedback_check_type == "multi":
+            return (
+                lambda G: self.derive_signals(G, self.multi_executor(G)),
+                lambda signals: tuple(signals.items()),
+            )
+        return self.executor, self.signature_check
+
+    def make_signature_predicate(self, graph):
+        """Build a check telling whether a smaller graph keeps the feedback signature of graph."""
+        feedback_tool = self.feedback_tool
+        check_type = self.feedback_check_type
+        if check_type == "combination":
+            check_type = self.combination_admitted_by
+
+        if check_type in ("coverage", "branch"):
+            branch = check_type == "branch"
+            required = set(
+                feedback_tool.last_new_branches if branch else feedback_tool.last_new_lines
+            )
+            return lambda candidate: required <= feedback_tool.covered_by(
+                candidate, self.executor, branch=branch
+            )
+
+        executor, check = self.get_feedback_functions()
+        expected = feedback_tool.feedback_signature(graph, executor, check)
+        return (
+            lambda candidate: feedback_tool.feedback_signature(candidate, executor, check)
+            == expected
+        )
+
+    def commit_to_corpus(self, graph):
+        self.num_graphs += 1
+        self.scheduler.add_to_corpus(graph)
+        self.queue_deterministic_stage(graph)
+
+    def queue_deterministic_stage(self, graph):
+        if (
+            self.deterministic_mutator is not None
+            and len(graph) <= self.deterministic_mutator.max_nodes
+        ):
+            self.deterministic_queue.append(graph)
+
+    def run_deterministic_stage(self, graph, tester, first_occurrence_times, total_bug_counts):
+        """Test every single-step mutant of a new corpus entry, skipping mutants seen before."""
+        batch = []
+        for mutant in self.deterministic_mutator.mutants(graph):
+            if self.stop_fuzzing.is_set():
+                return
+            if not self.seen_fingerprints.add(graph_fingerprint(mutant)):
+                self.deterministic_skipped += 1
+                continue
+            batch.append(mutant)
+            if len(batch) == self.deterministic_batch_size:
+                self.evaluate_deterministic_batch(
+                    batch, tester, first_occurrence_times, total_bug_counts
+                )
+                batch = []
+        if batch:
+            self.evaluate_deterministic_batch(
+                batch, tester, first_occurrence_times, total_bug_counts
+            )
+
+    def evaluate_deterministic_batch(
+        self, batch, tester, first_occurrence_times, total_bug_counts
+    ):
+        self.count += len(batch)
+        self.deterministic_execs += len(batch)
+        timestamp = time.time() - self.start_time
+        tested = self.process_test_batch_with_timeout(
+            batch, tester, first_occurrence_times, total_bug_counts, timestamp
+        )
+        for mutant in tested:
+            if self.perform_feedback_checks(mutant):
+                self.deterministic_admitted += 1
+                self.admit_tested_graph(
+                    mutant, tester, first_occurrence_times, total_bug_counts
+                )
+
+    def admit_tested_graph(self, graph, tester, first_occurrence_times, total_bug_counts):
+        """Admit a mutant that passed the feedback check.
+
+        Under tiered testing the mutant was only checked by a subset of the
+        implementations, so the skipped ones first run on the same queries.
+        """
+        if graph in self.partial_comparisons:
+            self.process_test_results_with_timeout(
+                graph,
+                tester,
+                first_occurrence_times,
+                total_bug_counts,
+                time.time() - self.start_time,
+                all_tiers=True,
+            )
+        self.admit_to_corpus(graph)
+
+    def admit_to_corpus(self, graph):
+        """Commit a graph that passed the feedback check, trimming it first if enabled."""
+        if (
+            self.trimmer is None
+            or graph.number_of_nodes() <= 2
+            or self.feedback_check_type in self.MEASURED_FEEDBACK
+        ):
+            self.commit_to_corpus(graph)
+        elif not self.trimmer.submit(graph, self.make_signature_predicate(graph)):
+            self.commit_to_corpus(graph)
+
+    def commit_trimmed_graphs(self, wait=False):
+        if self.trimmer is None:
+            return
+        for trimmed_graph in self.trimmer.collect(wait=wait):
+            self.commit_to_corpus(trimmed_graph)
+
     @abstractmethod
     def get_corpus_name(self):
         pass
@@ -262,18 +772,168 @@ class BaseFuzzer(ABC):
         first_occurrence_times,
         total_bug_counts,
         timestamp,
+        all_tiers=False,
     ):
-        discrepancies = tester.test(mutated_graph, timestamp)
+        tester.max_gap = 0.0
+        tester.test_latencies = {}
+        tester.partial_comparisons = []
+        if self.memory_tracker is not None:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        test_start = time.perf_counter()
+        try:
+            if all_tiers:
+                discrepancies = tester.test_all_tiers(
+                    mutated_graph, timestamp, self.partial_comparisons.pop(mutated_graph, [])
+                )
+            else:
+                discrepancies = tester.test(mutated_graph, timestamp)
+        finally:
+            # Tests that raise or time out count as well, or the cost would be biased
+            # low on the slowest mutants; the worker finishes a timed-out test, so its
+            # latency is at least its timeout
+            if self.calibrator is not None:
+                self.calibrator.observe(
+                    self.calibrator.graph_size(mutated_graph), time.perf_counter() - test_start
+                )
+        self.disagreement_gaps[mutated_graph] = tester.max_gap
+        if tester.partial_comparisons and not all_tiers:
+            # The graph itself is left out (as None), so that the weak key can die
+            self.partial_comparisons[mutated_graph] = [
+                (None if graph is mutated_graph else graph, *comparison)
+                for graph, *comparison in tester.partial_comparisons
+            ]
+        if self.memory_tracker is not None and self.memory_tracker.record(
+            mutated_graph.number_of_nodes(),
+            mutated_graph.number_of_edges(),
+            tracemalloc.get_traced_memory()[1] - traced_before,
+        ):
+            self.memory_graphs.add(mutated_graph)
+        if self.slowness_tracker is not None:
+            latencies = tester.test_latencies
+            if tester.test_method == "metamorphic":
+                # Metamorphic tests time no single implementation, the whole test counts
+                latencies = {tester.algorithm: time.perf_counter() - test_start}
+            discrepancies = dict(discrepancies)
+            discrepancies.update(
+                self.record_slowness(mutated_graph, tester, latencies, timestamp)
+            )
         for discrepancy_msg, _ in discrepancies.items():
             if discrepancy_msg:
-                if discrepancy_msg not in first_occurrence_times:
-                    first_occurrence_times[discrepancy_msg] = timestamp
-                    print(
-                        f"Recorded first occurrence of '{discrepancy_msg}' at {first_occurrence_times[discrepancy_msg]} seconds since start."
-                    )
-                total_bug_counts[discrepancy_msg] = (
-                    total_bug_counts.get(discrepancy_msg, 0) + 1
+                self.count_bug(discrepancy_msg, first_occurrence_times, total_bug_counts, timestamp)
+
+    @staticmethod
+    def count_bug(discrepancy_msg, first_occurrence_times, total_bug_counts, timestamp):
+        if discrepancy_msg not in first_occurrence_times:
+            first_occurrence_times[discrepancy_msg] = timestamp
+            print(
+                f"Recorded first occurrence of '{discrepancy_msg}' at {first_occurrence_times[discrepancy_msg]} seconds since start."
+            )
+        total_bug_counts[discrepancy_msg] = total_bug_counts.get(discrepancy_msg, 0) + 1
+
+    def record_slowdowns(self, tester, first_occurrence_times, total_bug_counts, timestamp):
+        """Minimize, save and count the performance-differential findings of the last test.
+
+        Runs after the test returned, so the minimization is not cut short by the test timeout.
+        A finding is confirmed with repeated, warmed-up timings first, and dropped as noise
+        otherwise. Only the first slowdown_findings_per_message findings of a message are
+        minimized, within slowdown_trim_seconds, and saved.
+        """
+        slowdowns, tester.slowdowns = tester.slowdowns, {}
+        for message, (graph, args, algorithms, slowest) in slowdowns.items():
+            if slowest is not None:
+                keeps_slowdown = lambda candidate: tester.keeps_slowdown(
+                    candidate, args, algorithms, slowest
                 )
+                if not keeps_slowdown(graph):
+                    continue
+            self.slowdown_counts[message] = self.slowdown_counts.get(message, 0) + 1
+            if self.slowdown_counts[message] > self.slowdown_findings_per_message:
+                self.count_bug(message, first_occurrence_times, total_bug_counts, timestamp)
+                continue
+            if slowest is not None:
+                graph = self.slowdown_trimmer.trim(
+                    graph,
+                    keeps_slowdown,
+                    time_budget=self.slowdown_trim_seconds,
+                    should_stop=self.stop_fuzzing.is_set,
+                )
+            save_discrepancy(
+                (message, (graph, args), timestamp),
+                f"{tester.discrepancy_filename}_perf_{tester.uuid}.pkl",
+            )
+            self.count_bug(message, first_occurrence_times, total_bug_counts, timestamp)
+
+    def record_slowness(self, graph, tester, latencies, timestamp):
+        """Feed the latencies on graph to the slowness tracker; returns the performance findings."""
+        new_maximum, findings = self.slowness_tracker.record(
+            graph.number_of_nodes(), graph.number_of_edges(), latencies
+        )
+        if new_maximum:
+            self.slow_graphs.add(graph)
+        discrepancies = {}
+        for algo_name, ratio in findings:
+            message = (
+                f"Performance: {algo_name} took over {self.slowness_tracker.finding_ratio:g} "
+                f"times its usual time for the graph size!"
+            )
+            print(f"{algo_name} took {ratio:.1f} times its usual time for the graph size.")
+            save_discrepancy(
+                (message, graph, timestamp),
+                f"{tester.discrepancy_filename}_slow_{tester.uuid}.pkl",
+            )
+            discrepancies[message] = graph
+        return discrepancies
+
+    def configure_tester(self, tester):
+        self.tester = tester
+        tester.tiered = self.tiered
+        tester.default_sample_rate = self.tier_sample_rate
+        tester.sample_rates.update(self.tier_sample_rates)
+        if self.parallel_pool is not None:
+            tester.parallel_pool = self.parallel_pool
+            tester.parallel_min_nodes = self.parallel_min_nodes
+            tester.parallel_deadline = self.parallel_deadline
+        if self.adaptive_relations:
+            tester.relation_bandit = RelationBandit(exploration=self.relation_exploration)
+        tester.slowdown_ratio = self.slowdown_ratio
+
+    def calibrate_seed(self, tester, graph):
+        """Time every implementation on a seed; returns the estimated test latency."""
+        latencies, nondeterministic = tester.calibrate(graph, self.calibration_runs)
+        for algo_name in nondeterministic:
+            print(f"Nondeterministic result from {algo_name} during calibration.")
+            self.nondeterministic_implementations[algo_name] = (
+                self.nondeterministic_implementations.get(algo_name, 0) + 1
+            )
+        return self.calibrator.add(
+            latencies, tester.queries_per_test, self.calibrator.graph_size(graph)
+        )
+
+    def quarantine_entry(self, graph_id):
+        if hasattr(self.scheduler, "quarantine") and self.scheduler.quarantine(graph_id):
+            self.num_quarantined += 1
+            print(f"Moved corpus entry {graph_id} to the quarantine queue.")
+
+    def record_test_latency(self, graph_id, latency, timeout):
+        """Quarantine entries whose mutants repeatedly come close to their timeout."""
+        if graph_id is None or latency < self.slow_test_fraction * timeout:
+            return
+        self.slow_strikes[graph_id] = self.slow_strikes.get(graph_id, 0) + 1
+        if self.slow_strikes[graph_id] == self.quarantine_strikes:
+            self.quarantine_entry(graph_id)
+
+    def record_execution(self, mutator, graph, latency):
+        """Feed one execution to the size controller and apply its new limits."""
+        if self.size_controller is None:
+            return
+        if not self.size_controller.record(graph.number_of_nodes(), latency):
+            return
+        scale = self.size_controller.trim_scale()
+        mutator.max_nodes = self.size_controller.cap
+        mutator.trim_fraction = (min(0.2 * scale, 0.5), min(0.4 * scale, 0.8))
+        if self.trimmer is not None:
+            self.trimmer.max_execs = int(self.trim_max_execs * scale)
 
     def signal_handler(self, sig, frame):
         print("Ctrl+C pressed, finalizing...")
@@ -283,14 +943,46 @@ class BaseFuzzer(ABC):
 
     def finalize_process(self):
         print("Finalizing process...")
+        self.commit_trimmed_graphs(wait=True)
         print(f"count {self.count}")
         print(f"There were {self.num_graphs} graphs saved in the corpus.")
         print(f"Time spent: {round((time.time() - self.start_time) / 60, 3)} minutes.")
-        print(f"Exception: {self.feedback_tool.exception_graphs}")
-        if self.feedback_tool.exception_graphs:
-            save_exception_graphs(
-                self.feedback_tool.exception_graphs, self.get_corpus_name()
+        if self.trimmer is not None:
+            self.trimmer.report()
+        if self.size_controller is not None:
+            print(f"Final size cap: {self.size_controller.cap} nodes.")
+        if self.calibrator is not None:
+            self.calibrator.report_timeout()
+        if self.num_quarantined:
+            print(f"{self.num_quarantined} slow corpus entries were quarantined.")
+        for algo_name, seeds in self.nondeterministic_implementations.items():
+            print(f"Nondeterministic implementation {algo_name} on {seeds} seed(s).")
+        if self.tester is not None and self.tester.tiered:
+            self.tester.report_tiers()
+        if self.parallel_pool is not None:
+            self.parallel_pool.close()
+        if self.tester is not None:
+            for algo_name, count in self.tester.implementation_timeouts.items():
+                print(f"{algo_name} missed the parallel deadline {count} time(s).")
+            if self.tester.relation_bandit is not None:
+                self.tester.relation_bandit.report()
+        if self.slowness_tracker is not None:
+            self.slowness_tracker.report()
+        if self.memory_tracker is not None:
+            self.memory_tracker.report()
+        self.feedback_tool.report_novelty()
+        if self.feedback_check_type == "multi":
+            print(f"Multi feedback signals: {', '.join(self.MULTI_SIGNALS)}.")
+            for name, count in sorted(self.multi_admissions.items(), key=lambda item: -item[1]):
+                print(f"  {name}: new in {count} admitted graph(s).")
+        if self.deterministic_mutator is not None:
+            print(
+                f"Deterministic stage: {self.deterministic_execs} executions, "
+                f"{self.deterministic_skipped} duplicate mutants skipped, "
+                f"{self.deterministic_admitted} added to the corpus."
             )
+        self.feedback_tool.exception_store.report()
+        self.feedback_tool.exception_store.close()
         print("Total Bugs Found:")
         for category, total in self.total_bug_counts.items():
             print(f"{category}: {total}")
@@ -310,6 +1002,7 @@ class BaseFuzzer(ABC):
         scheduler.add_to_corpus(generated_graphs)
         mutator = ExtendedMutator(scheduler)
         tester = self.get_tester()
+        self.configure_tester(tester)
 
         total_bug_counts = self.total_bug_counts
         first_occurrence_times = {}
@@ -319,15 +1012,56 @@ class BaseFuzzer(ABC):
 
         # Perform feedback check once at the beginning on the initial graphs
         print("Performing initial feedback checks...")
-        for graph in generated_graphs:
+        first_seed_id = scheduler.graph_counter - len(generated_graphs) + 1
+        seed_latencies = {}
+        for seed_index, graph in enumerate(generated_graphs):
             self.num_graphs += 1
+            self.queue_deterministic_stage(graph)
             if self.perform_feedback_checks(graph):
                 print(f"Initial feedback check passed for graph {self.num_graphs}.")
+            if self.calibrator is not None:
+                seed_latencies[first_seed_id + seed_index] = (
+                    graph,
+                    self.calibrate_seed(tester, graph),
+                )
+
+        if self.calibrator is not None:
+            self.calibrator.calibrated = True
+            self.calibrator.report()
+            for seed_id, (graph, latency) in seed_latencies.items():
+                if latency >= self.slow_test_fraction * self.test_timeout(graph):
+                    self.quarantine_entry(seed_id)
 
         while (
             not self.stop_fuzzing.is_set()
         ):  # Use the event to check whether to continue
+            if self.deterministic_queue:
+                # New corpus entries get their deterministic stage before any havoc round
+                self.run_deterministic_stage(
+                    self.deterministic_queue.pop(0),
+                    tester,
+                    first_occurrence_times,
+                    total_bug_counts,
+                )
+                self.commit_trimmed_graphs()
+                continue
+
             graph = scheduler.get_graph()
+            graph_id = getattr(scheduler, "current_id", None)
+            if self.near_miss_parent is not None and random.random() < self.near_miss_focus:
+                # Hill-climb from the graph that came closest to a discrepancy
+                graph, graph_id = self.near_miss_parent, None
+
+            if self.batch_size > 1 and tester.decomposable:
+                self.fuzz_in_batches(
+                    graph,
+                    graph_id,
+                    mutator,
+                    tester,
+                    first_occurrence_times,
+                    total_bug_counts,
+                )
+                continue
 
             for i in range(self.num_iterations):
                 if self.stop_fuzzing.is_set():  # Check if we need to stop mid-iteration
@@ -336,7 +1070,8 @@ class BaseFuzzer(ABC):
                 mutated_graph = mutator.stacked_mutate(graph.copy())
                 self.count += 1
 
-                timestamp = time.time() - self.start_time
+                execution_start = time.time()
+                timestamp = execution_start - self.start_time
                 # Call the timeout-wrapped version of process_test_results
                 result_success = self.process_test_results_with_timeout(
                     mutated_graph,
@@ -346,12 +1081,22 @@ class BaseFuzzer(ABC):
                     timestamp,
                 )
 
+                self.record_test_latency(
+                    graph_id, time.time() - execution_start, self.test_timeout(mutated_graph)
+                )
+
                 # Only perform the feedback check if the process was successful (no timeout or error)
                 if result_success:
                     if self.perform_feedback_checks(mutated_graph):
-                        self.num_graphs += 1
-                        scheduler.add_to_corpus(mutated_graph)
+                        self.admit_tested_graph(
+                            mutated_graph, tester, first_occurrence_times, total_bug_counts
+                        )
                         graph = mutated_graph
 
+                self.record_execution(
+                    mutator, mutated_graph, time.time() - execution_start
+                )
+                self.commit_trimmed_graphs()
+
         print("Fuzzing stopped. Good bye!")
         self.finalize_process()
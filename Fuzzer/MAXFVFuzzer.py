@@ -11,9 +11,12 @@ from Utils.FileUtils import (
     load_graphs,
     save_discrepancy,
 )
+from Utils.GraphFacts import GraphFacts
 
 
 class MAXFVFuzzer(BaseFuzzer):
+    MULTI_SIGNALS = {**BaseFuzzer.MULTI_SIGNALS, "saturated_edges": "saturated_edges_signal"}
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.uuid = uuid.uuid4().hex[:8]
@@ -24,8 +27,8 @@ class MAXFVFuzzer(BaseFuzzer):
     def executor(self, G):
         if len(G.nodes()) < 2:
             return 0  # Return 0 for graphs with less than 2 nodes
-        # Sort nodes by degree in descending order
-        sorted_nodes = sorted(G.nodes(), key=lambda x: G.degree(x), reverse=True)
+        # Nodes sorted by degree in descending order, shared by all executors
+        sorted_nodes = GraphFacts.of(G).degree_order
         # Select the node with the highest degree as the source
         s = sorted_nodes[0]
         # Select the node with the second highest degree as the target
@@ -41,28 +44,43 @@ class MAXFVFuzzer(BaseFuzzer):
         if len(G.nodes()) < 2:
             return 0
 
-        sorted_nodes = sorted(G.nodes(), key=lambda x: G.degree(x), reverse=True)
+        sorted_nodes = GraphFacts.of(G).degree_order
         s = sorted_nodes[0]
         t = sorted_nodes[1]
 
         try:
             # Get the actual flow dictionary, not just the value
-            flow_value, flow_dict = nx.maximum_flow(G, s, t, capacity="weight")
-
-            # Count saturated edges (where flow equals capacity)
-            saturated_count = 0
-            for u in flow_dict:
-                for v, flow in flow_dict[u].items():
-                    if G.has_edge(u, v):
-                        capacity = G[u][v].get('weight', 0)
-                        # Edge is saturated if flow equals capacity (within tolerance)
-                        if abs(flow - capacity) < 1e-9 and flow > 0:
-                            saturated_count += 1
-
-            return saturated_count
+            return self.saturated_edges_signal(G, nx.maximum_flow(G, s, t, capacity="weight"))
         except:
             return 0
 
+    def multi_executor(self, G):
+        """The flow value and flow dictionary between the two highest-degree nodes."""
+        if len(G.nodes()) < 2:
+            return None
+        sorted_nodes = GraphFacts.of(G).degree_order
+        return nx.maximum_flow(G, sorted_nodes[0], sorted_nodes[1], capacity="weight")
+
+    def regular_signal(self, G, flow):
+        return self.signature_check(0 if flow is None else flow[0])
+
+    def saturated_edges_signal(self, G, flow):
+        if flow is None:
+            return 0
+        flow_value, flow_dict = flow
+
+        # Count saturated edges (where flow equals capacity)
+        saturated_count = 0
+        for u in flow_dict:
+            for v, flow in flow_dict[u].items():
+                if G.has_edge(u, v):
+                    capacity = G[u][v].get('weight', 0)
+                    # Edge is saturated if flow equals capacity (within tolerance)
+                    if abs(flow - capacity) < 1e-9 and flow > 0:
+                        saturated_count += 1
+
+        return saturated_count
+
     def saturated_edges_interesting_check(self, result):
         """Check function for saturated edges feedback.
 
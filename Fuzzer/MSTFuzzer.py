@@ -9,11 +9,15 @@ from Utils.FileUtils import create_single_node_graph, save_graphs, load_graphs
 
 
 class MSTFuzzer(BaseFuzzer):
+    MULTI_SIGNALS = {**BaseFuzzer.MULTI_SIGNALS, "max_degree": "max_degree_signal"}
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Set the custom interesting check for MST weight
         self.set_interesting_check(self.mst_weight_interesting_check)
-        self.observed_buckets = set()  # Track unique weight buckets
+        self.set_signature_check(self.mst_weight_bucket)
+        # Track unique weight buckets
+        self.observed_buckets = self.feedback_tool.make_store("observed_buckets")
 
     def get_corpus_name(self):
         return "mst_corpus"
@@ -29,7 +33,9 @@ class MSTFuzzer(BaseFuzzer):
         - Balanced MSTs have more uniform degrees
         This exercises different structural properties of the algorithm.
         """
-        mst = nx.minimum_spanning_tree(G)
+        return self.max_degree_signal(G, nx.minimum_spanning_tree(G))
+
+    def max_degree_signal(self, G, mst):
         if mst.number_of_nodes() == 0:
             return 0
         return max(degree for node, degree in mst.degree())
@@ -64,8 +70,8 @@ class MSTFuzzer(BaseFuzzer):
         save_graphs(generated_graphs, "mst_corpus")
         return load_graphs("mst_corpus")
 
-    def mst_weight_interesting_check(self, result):
-        """Custom feedback to check if MST weight is in a new bucket based on powers of 2, differentiated by num_nodes."""
+    def mst_weight_bucket(self, result):
+        """Return the (num_nodes, bucket) pair for the MST weight, based on powers of 2."""
         # Calculate total weight and the number of nodes in the MST
         total_weight = sum(
             data.get("weight", 1) for u, v, data in result.edges(data=True)
@@ -81,8 +87,12 @@ class MSTFuzzer(BaseFuzzer):
             exponent = math.floor(math.log2(abs_weight))
             bucket = f"{num_nodes}_{'-' if total_weight < 0 else ''}2^{exponent}"
 
+        return (num_nodes, bucket)
+
+    def mst_weight_interesting_check(self, result):
+        """Custom feedback to check if MST weight is in a new bucket based on powers of 2, differentiated by num_nodes."""
         # Use a tuple of (num_nodes, bucket) to check uniqueness
-        unique_bucket = (num_nodes, bucket)
+        unique_bucket = self.mst_weight_bucket(result)
 
         # Check if this bucket has been observed before
         if unique_bucket not in self.observed_buckets:
@@ -6,6 +6,7 @@ from Fuzzer.BaseFuzzer import BaseFuzzer
 from Generator.CustomGenerator import CustomGenerator
 from Tester.MaxMatchingTester import MaxMatchingTester
 from Utils.FileUtils import save_graphs, load_graphs
+from Utils.GraphFacts import GraphFacts
 
 
 class MaxMatchingFuzzer(BaseFuzzer):
@@ -13,7 +14,8 @@ class MaxMatchingFuzzer(BaseFuzzer):
         return "max_matching_corpus"
 
     def executor(self, G):
-        if len(list(G.nodes)) <= 1 or not nx.is_connected(G) or not nx.is_bipartite(G):
+        facts = GraphFacts.of(G)
+        if len(G) <= 1 or not facts.is_connected or not facts.is_bipartite:
             return 0
         return nx.algorithms.bipartite.matching.hopcroft_karp_matching(G)
 
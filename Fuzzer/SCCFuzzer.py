@@ -11,6 +11,12 @@ from Utils.FileUtils import (
 
 
 class SCCFuzzer(BaseFuzzer):
+    MULTI_SIGNALS = {
+        **BaseFuzzer.MULTI_SIGNALS,
+        "component_distribution": "component_distribution_signal",
+        "trivial_ratio": "trivial_ratio_signal",
+    }
+
     def get_corpus_name(self):
         return "scc_corpus"
 
@@ -24,7 +30,9 @@ class SCCFuzzer(BaseFuzzer):
         For example, [10, 1, 1] vs [4, 4, 4] both have 3 components but different
         distributions that exercise different code paths.
         """
-        scc_list = list(nx.strongly_connected_components(G))
+        return self.component_distribution_signal(G, list(nx.strongly_connected_components(G)))
+
+    def component_distribution_signal(self, G, scc_list):
         if not scc_list:
             return 0
         # Sort component sizes in descending order for consistent hashing
@@ -39,7 +47,9 @@ class SCCFuzzer(BaseFuzzer):
         low ratio indicates dense connectivity (fewer but larger components).
         This helps explore different connectivity patterns.
         """
-        scc_list = list(nx.strongly_connected_components(G))
+        return self.trivial_ratio_signal(G, list(nx.strongly_connected_components(G)))
+
+    def trivial_ratio_signal(self, G, scc_list):
         if not scc_list:
             return 0
         singleton_count = sum(1 for comp in scc_list if len(comp) == 1)
@@ -3,18 +3,25 @@ import networkx as nx
 from Fuzzer.BaseFuzzer import BaseFuzzer
 from Generator.SmokeGenerator import SmokeGenerator
 from Tester.STPLTester import STPLTester
+from Utils.GraphFacts import GraphFacts
 from Utils.FileUtils import create_single_node_digraph, save_graphs, load_graphs
 
 
 class STPLFuzzer(BaseFuzzer):
+    MULTI_SIGNALS = {
+        **BaseFuzzer.MULTI_SIGNALS,
+        "hop_count": "hop_count_signal",
+        "negative_edges": "negative_edges_signal",
+    }
+
     def get_corpus_name(self):
         return "stpl_corpus"
 
     def executor(self, G):
         if len(G.nodes()) < 2:
             return float("inf")  # Return infinity for graphs with less than 2 nodes
-        # Sort nodes by degree in descending order
-        sorted_nodes = sorted(G.nodes(), key=lambda x: G.degree(x), reverse=True)
+        # Nodes sorted by degree in descending order, shared by all executors
+        sorted_nodes = GraphFacts.of(G).degree_order
         # Select the node with the highest degree as the source
         source = sorted_nodes[0]
         # Select the node with the second highest degree as the target
@@ -30,43 +37,74 @@ class STPLFuzzer(BaseFuzzer):
         """Executor that returns hop count instead of path weight."""
         if len(G.nodes()) < 2:
             return float("inf")
-        sorted_nodes = sorted(G.nodes(), key=lambda x: G.degree(x), reverse=True)
-        source = sorted_nodes[0]
-        target = sorted_nodes[1]
-        try:
-            path = nx.shortest_path(
-                G, source=source, target=target, weight="weight", method="bellman-ford"
-            )
-            return len(path) - 1  # Number of edges (hops)
-        except nx.NetworkXNoPath:
-            return float("inf")
-        except (nx.NetworkXError, nx.NetworkXUnbounded):
-            return float("-inf")
+        return self.hop_count_signal(G, self.bellman_ford_path(G))
 
     def executor_negative_edges(self, G):
         """Executor that returns count of negative weight edges in shortest path."""
         if len(G.nodes()) < 2:
             return 0
-        sorted_nodes = sorted(G.nodes(), key=lambda x: G.degree(x), reverse=True)
-        source = sorted_nodes[0]
-        target = sorted_nodes[1]
+        return self.negative_edges_signal(G, self.bellman_ford_path(G))
+
+    def bellman_ford_path(self, G):
+        """Shortest path between the two highest-degree nodes, shared by the executors.
+
+        None if there is no path, "unbounded" if a negative cycle is in the way.
+        """
+        sorted_nodes = GraphFacts.of(G).degree_order
         try:
-            path = nx.shortest_path(
-                G, source=source, target=target, weight="weight", method="bellman-ford"
+            return nx.shortest_path(
+                G,
+                source=sorted_nodes[0],
+                target=sorted_nodes[1],
+                weight="weight",
+                method="bellman-ford",
             )
-            # Count negative edges in the path
-            negative_count = 0
-            for i in range(len(path) - 1):
-                u, v = path[i], path[i + 1]
-                if G.has_edge(u, v):
-                    weight = G[u][v].get("weight", 1)
-                    if weight < 0:
-                        negative_count += 1
-            return negative_count
         except nx.NetworkXNoPath:
-            return 0  # No path means no edges
+            return None
         except (nx.NetworkXError, nx.NetworkXUnbounded):
+            return "unbounded"
+
+    def multi_executor(self, G):
+        # Graphs with less than 2 nodes count as having no path
+        return self.bellman_ford_path(G) if len(G.nodes()) >= 2 else None
+
+    @staticmethod
+    def path_weight(G, path):
+        """Weight of a path as shortest_path_length counts it, missing weights count 1."""
+        total = 0
+        for u, v in zip(path, path[1:]):
+            if G.is_multigraph():
+                total += min(data.get("weight", 1) for data in G[u][v].values())
+            else:
+                total += G[u][v].get("weight", 1)
+        return total
+
+    def regular_signal(self, G, path):
+        if path == "unbounded":
+            return path
+        return self.signature_check(float("inf") if path is None else self.path_weight(G, path))
+
+    def hop_count_signal(self, G, path):
+        if path is None:
+            return float("inf")
+        if path == "unbounded":
+            return float("-inf")
+        return len(path) - 1  # Number of edges (hops)
+
+    def negative_edges_signal(self, G, path):
+        if path is None:
+            return 0  # No path means no edges
+        if path == "unbounded":
             return -1  # Special marker for negative cycle
+        # Count negative edges in the path
+        negative_count = 0
+        for i in range(len(path) - 1):
+            u, v = path[i], path[i + 1]
+            if G.has_edge(u, v):
+                weight = G[u][v].get("weight", 1)
+                if weight < 0:
+                    negative_count += 1
+        return negative_count
 
     def hop_count_interesting_check(self, result):
         """Returns the number of edges (hops) in the shortest path.
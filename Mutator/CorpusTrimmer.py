@@ -0,0 +1,137 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class CorpusTrimmer:
+    """Shrinks corpus entries while they keep their feedback signature.
+
+    Nodes are removed first, then edges. Each pass tries to drop whole batches
+    and halves the batch size whenever a removal changes the signature, the
+    same bisection afl-tmin applies to byte ranges.
+    """
+
+    def __init__(self, max_execs=200, min_nodes=1, max_pending=32):
+        self.max_execs = max_execs
+        self.min_nodes = min_nodes
+        self.max_pending = max_pending
+        self.worker = None  # Created on first use so idle fuzzers spawn no thread
+        self.pending = []
+        self.trimmed_count = 0
+        self.nodes_removed = 0
+        self.edges_removed = 0
+        self.total_execs = 0
+
+    @staticmethod
+    def _nodes(graph):
+        return list(graph.nodes())
+
+    @staticmethod
+    def _edges(graph):
+        if graph.is_multigraph():
+            return list(graph.edges(keys=True))
+        return list(graph.edges())
+
+    @staticmethod
+    def _remove_nodes(graph, nodes):
+        graph.remove_nodes_from(nodes)
+
+    @staticmethod
+    def _remove_edges(graph, edges):
+        graph.remove_edges_from(edges)
+
+    @staticmethod
+    def _out_of_time(deadline, should_stop):
+        return (deadline is not None and time.perf_counter() >= deadline) or (
+            should_stop is not None and should_stop()
+        )
+
+    def _trim_items(self, graph, keeps_signature, budget, items_of, remove, deadline, should_stop):
+        items = items_of(graph)
+        step = max(1, len(items) // 2)
+        while budget > 0 and items and not self._out_of_time(deadline, should_stop):
+            index = 0
+            while (
+                index < len(items)
+                and budget > 0
+                and not self._out_of_time(deadline, should_stop)
+            ):
+                batch = items[index : index + step]
+                candidate = graph.copy()
+                remove(candidate, batch)
+                if candidate.number_of_nodes() < self.min_nodes:
+                    index += step
+                    continue
+                budget -= 1
+                if keeps_signature(candidate):
+                    graph = candidate
+                    items = items[:index] + items[index + step :]
+                else:
+                    index += step
+            if step == 1:
+                break
+            step = max(1, step // 2)
+        return graph, budget
+
+    def trim(self, graph, keeps_signature, time_budget=None, should_stop=None):
+        """Return the smallest graph found for which keeps_signature still holds.
+
+        Trimming also ends after time_budget seconds, or once should_stop() is true.
+        """
+        num_nodes, num_edges = graph.number_of_nodes(), graph.number_of_edges()
+        budget = self.max_execs
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        graph, budget = self._trim_items(
+            graph, keeps_signature, budget, self._nodes, self._remove_nodes, deadline, should_stop
+        )
+        graph, budget = self._trim_items(
+            graph, keeps_signature, budget, self._edges, self._remove_edges, deadline, should_stop
+        )
+
+        self.total_execs += self.max_execs - budget
+        if graph.number_of_nodes() < num_nodes or graph.number_of_edges() < num_edges:
+            self.trimmed_count += 1
+            self.nodes_removed += num_nodes - graph.number_of_nodes()
+            self.edges_removed += num_edges - graph.number_of_edges()
+        return graph
+
+    def submit(self, graph, keeps_signature):
+        """Trim the graph in the background worker; pick it up later with collect().
+
+        Returns False without queueing when the worker is too far behind.
+        """
+        if len(self.pending) >= self.max_pending:
+            return False
+        if self.worker is None:
+            self.worker = ThreadPoolExecutor(max_workers=1)
+        future = self.worker.submit(self.trim, graph, keeps_signature)
+        self.pending.append((graph, future))
+        return True
+
+    def collect(self, wait=False):
+        """Return the graphs whose trimming finished, falling back to the original on error.
+
+        With wait=True, queued jobs are cancelled and their graphs returned untrimmed,
+        so shutting down only waits for the job currently running.
+        """
+        finished = []
+        still_pending = []
+        for graph, future in self.pending:
+            if wait and future.cancel():
+                finished.append(graph)
+                continue
+            if not wait and not future.done():
+                still_pending.append((graph, future))
+                continue
+            try:
+                finished.append(future.result())
+            except Exception as e:
+                print(f"Error while trimming graph: {e}")
+                finished.append(graph)
+        self.pending = still_pending
+        return finished
+
+    def report(self):
+        print(
+            f"Trimmed {self.trimmed_count} corpus entries: removed {self.nodes_removed} nodes "
+            f"and {self.edges_removed} edges in {self.total_execs} executions."
+        )
@@ -0,0 +1,75 @@
+import math
+from itertools import combinations, permutations
+
+DETERMINISTIC_MAX_NODES = 20
+BOUNDARY_WEIGHTS = (0, -1, math.nan)
+
+
+class DeterministicMutator:
+    """Enumerates every single-step mutant of a small graph.
+
+    Complements the random havoc of ExtendedMutator with a systematic pass:
+    every single-edge toggle, every edge weight set to a boundary value and
+    every node removal. Graphs above max_nodes yield no mutants.
+    """
+
+    def __init__(self, max_nodes=DETERMINISTIC_MAX_NODES, boundary_weights=BOUNDARY_WEIGHTS):
+        self.max_nodes = max_nodes
+        self.boundary_weights = boundary_weights
+
+    @staticmethod
+    def _is_weighted(graph):
+        return graph.number_of_edges() > 0 and all(
+            "weight" in data for _, _, data in graph.edges(data=True)
+        )
+
+    @staticmethod
+    def _same_weight(weight, boundary):
+        if isinstance(weight, float) and math.isnan(weight):
+            return isinstance(boundary, float) and math.isnan(boundary)
+        return weight == boundary
+
+    def mutants(self, graph):
+        """Yield the mutants of graph one at a time; graph itself is left untouched."""
+        if len(graph) > self.max_nodes:
+            return
+        yield from self.edge_toggles(graph)
+        yield from self.boundary_weight_mutants(graph)
+        yield from self.node_removals(graph)
+
+    def edge_toggles(self, graph):
+        nodes = list(graph.nodes())
+        pairs = permutations(nodes, 2) if graph.is_directed() else combinations(nodes, 2)
+        new_edge_attrs = {"weight": 1} if self._is_weighted(graph) else {}
+        for u, v in pairs:
+            mutant = graph.copy()
+            if graph.has_edge(u, v):
+                if graph.is_multigraph():
+                    mutant.remove_edges_from([(u, v, key) for key in graph[u][v]])
+                else:
+                    mutant.remove_edge(u, v)
+            else:
+                mutant.add_edge(u, v, **new_edge_attrs)
+            yield mutant
+
+    def boundary_weight_mutants(self, graph):
+        if graph.is_multigraph():
+            edges = list(graph.edges(keys=True, data=True))
+        else:
+            edges = [(u, v, None, data) for u, v, data in graph.edges(data=True)]
+        for u, v, key, data in edges:
+            for boundary in self.boundary_weights:
+                if "weight" in data and self._same_weight(data["weight"], boundary):
+                    continue
+                mutant = graph.copy()
+                if key is None:
+                    mutant[u][v]["weight"] = boundary
+                else:
+                    mutant[u][v][key]["weight"] = boundary
+                yield mutant
+
+    def node_removals(self, graph):
+        for node in list(graph.nodes()):
+            mutant = graph.copy()
+            mutant.remove_node(node)
+            yield mutant
@@ -5,6 +5,7 @@ import networkx as nx
 from matplotlib import pyplot as plt
 
 from Mutator.SimpleMutator import SimpleMutator
+from Utils.GraphFacts import GraphFacts
 from Scheduler.RandomDiskScheduler import RandomDiskScheduler
 from Scheduler.RandomDiskSchedulerUpdated import RandomDiskSchedulerUpdated
 from Scheduler.RandomMemScheduler import RandomMemScheduler
@@ -20,6 +21,9 @@ class ExtendedMutator(SimpleMutator):
     def __init__(self, corpus):
         super().__init__()
         self.corpus = corpus
+        # Both can be tuned at runtime, e.g. by a SizeController
+        self.max_nodes = MAX_NODES_THRESHOLD
+        self.trim_fraction = (0.2, 0.4)
         # Check if the corpus is an instance of RandomDiskScheduler or RandomMemScheduler
         self.is_disk_scheduler = isinstance(
             corpus,
@@ -44,6 +48,12 @@ class ExtendedMutator(SimpleMutator):
             mutation = random.choice(mutation_operations)
             graph = mutation(graph)
 
+        # The size cap may have been lowered below graphs already in the corpus
+        while len(graph) > self.max_nodes:
+            graph = self.trim_graph_advanced(graph)
+
+        # Weight changes keep the node and edge counts, so cached facts must be dropped explicitly
+        GraphFacts.touch(graph)
         return graph
 
     def mutate(self, graph):
@@ -57,7 +67,9 @@ class ExtendedMutator(SimpleMutator):
             self.combine_graphs,
         ]
         mutation = random.choice(mutation_operations)
-        return mutation(graph)
+        graph = mutation(graph)
+        GraphFacts.touch(graph)
+        return graph
 
     def nx_has_weighted_edges(self, nx_graph):
         for _, _, data in nx_graph.edges(data=True):
@@ -116,7 +128,10 @@ class ExtendedMutator(SimpleMutator):
         )
 
         # Determine the number of nodes to remove
-        num_nodes_to_remove = random.randint(len(graph) // 5, 2 * len(graph) // 5)
+        # At least one, since sorted_nodes[-0:] would remove every node
+        low, high = self.trim_fraction
+        fewest = max(1, int(len(graph) * low))
+        num_nodes_to_remove = random.randint(fewest, max(fewest, int(len(graph) * high)))
 
         # Remove nodes with the lowest degree
         for node in sorted_nodes[-num_nodes_to_remove:]:
@@ -170,7 +185,7 @@ class ExtendedMutator(SimpleMutator):
         if not other_graph.nodes():
             other_graph.add_node(0)
 
-        while len(graph.nodes()) + len(other_graph.nodes()) > MAX_NODES_THRESHOLD:
+        while len(graph.nodes()) + len(other_graph.nodes()) > self.max_nodes:
             graph = self.trim_graph_advanced(graph)
             other_graph = self.trim_graph_advanced(other_graph)
 
@@ -1,6 +1,8 @@
 import random
 import networkx as nx
 
+from Utils.GraphFacts import GraphFacts
+
 class SimpleMutator:
     def __init__(self):
         pass
@@ -13,7 +15,10 @@ class SimpleMutator:
             self.delete_edge
         ]
         mutation = random.choice(mutation_operations)
-        return mutation(graph)
+        graph = mutation(graph)
+        # add_edge on an existing edge only changes its weight
+        GraphFacts.touch(graph)
+        return graph
 
     def nx_has_weighted_edges(self, nx_graph):
         for _, _, data in nx_graph.edges(data=True):
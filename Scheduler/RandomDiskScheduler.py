@@ -6,11 +6,15 @@ import pickle
 
 
 class RandomDiskScheduler:
-    def __init__(self, folder_name):
+    def __init__(self, folder_name, quarantine_probability=0.05):
         self.folder_name = folder_name
         os.makedirs(self.folder_name, exist_ok=True)
         self.start_time = time.time()
         self.graph_counter = 0
+        self.active_ids = []
+        self.quarantined_ids = []  # Slow entries, picked only now and then
+        self.quarantine_probability = quarantine_probability
+        self.current_id = None  # Id of the entry returned by the last get_graph call
 
     def add_to_corpus(self, graphs):
         if not isinstance(graphs, list):
@@ -22,16 +26,31 @@ class RandomDiskScheduler:
             file_path = os.path.join(self.folder_name, filename)
             with open(file_path, 'wb') as f:
                 pickle.dump(graph, f)
+            self.active_ids.append(self.graph_counter)
 
     def get_graph(self):
         if self.graph_counter == 0:
             raise ValueError("No graphs available in memory.")
 
-        random_index = random.randint(1, self.graph_counter)
+        ids = self.active_ids
+        if self.quarantined_ids and (
+            not self.active_ids or random.random() < self.quarantine_probability
+        ):
+            ids = self.quarantined_ids
+        random_index = random.choice(ids)
+        self.current_id = random_index
         file_path = os.path.join(self.folder_name, f"graph_{random_index}.pkl")
         with open(file_path, 'rb') as f:
             return pickle.load(f)
 
+    def quarantine(self, graph_id):
+        """Move an entry to the low-priority quarantine queue."""
+        if graph_id not in self.active_ids:
+            return False
+        self.active_ids.remove(graph_id)
+        self.quarantined_ids.append(graph_id)
+        return True
+
     def close_current_file(self):
         # This method is not required in this context
         pass
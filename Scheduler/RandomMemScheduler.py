@@ -3,10 +3,13 @@ import random
 
 
 class RandomMemScheduler:
-    def __init__(self, start_time):
+    def __init__(self, start_time, quarantine_probability=0.05):
         self.corpus_memory = []
+        self.quarantine_memory = []  # Slow entries, picked only now and then
+        self.quarantine_probability = quarantine_probability
         self.start_time = start_time
         self.graph_counter = 0
+        self.current_id = None  # Id of the entry returned by the last get_graph call
 
     def add_to_corpus(self, graphs):
         if not isinstance(graphs, list):
@@ -18,17 +21,31 @@ class RandomMemScheduler:
             self.corpus_memory.append((timestamp, graph, self.graph_counter))
 
     def get_graph(self):
-        if not self.corpus_memory:
+        if not self.corpus_memory and not self.quarantine_memory:
             raise ValueError("No graphs available in memory.")
 
+        entries = self.corpus_memory
+        if self.quarantine_memory and (
+            not self.corpus_memory or random.random() < self.quarantine_probability
+        ):
+            entries = self.quarantine_memory
+
         # Randomly select a graph from memory
-        _, graph, _ = random.choice(self.corpus_memory)
+        _, graph, self.current_id = random.choice(entries)
         return graph
 
+    def quarantine(self, graph_id):
+        """Move an entry to the low-priority quarantine queue."""
+        for index, (_, _, counter) in enumerate(self.corpus_memory):
+            if counter == graph_id:
+                self.quarantine_memory.append(self.corpus_memory.pop(index))
+                return True
+        return False
+
     def close_current_file(self):
         return
 
     def iterate_graphs(self):
         # Iterate over all graphs in memory and yield them along with their timestamps
-        for timestamp, graph, counter in self.corpus_memory:
+        for timestamp, graph, counter in self.corpus_memory + self.quarantine_memory:
             yield timestamp, graph, counter
@@ -5,6 +5,7 @@ import networkx as nx
 
 from Tester.BaseTester import BaseTester, TestMetamorphism
 from Utils.GraphConverter import GraphConverter
+from Utils.GraphOverlay import overlay
 
 
 class BCCTesterAlgorithms:
@@ -28,7 +29,7 @@ class BCCTestMetamorphism(TestMetamorphism):
     ) -> tuple[nx.Graph, Any, Callable[[set[frozenset[int]]], bool]]:
         if len(result) == 0:
             return graph, input, lambda _: True
-        new_graph = graph.copy()
+        new_graph = overlay(graph)
         new_node = max(list(graph.nodes)) + 1
         new_graph.add_node(new_node)
 
@@ -47,6 +48,7 @@ class BCCTestMetamorphism(TestMetamorphism):
 
 
 class BCCTester(BaseTester):
+    decomposable = True
 
     def __init__(
         self, corpus_path, discrepancy_filename="bcc_discrepancy", *args, **kwargs
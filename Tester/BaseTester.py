@@ -1,23 +1,77 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_right
 from typing import TypeVar, Optional, Any, Callable
+import itertools
+import math
+import random
+import statistics
+import time
 import uuid
 
 import networkx as nx
 
 from Utils.FileUtils import save_discrepancies, save_discrepancy
+from Utils.GraphOverlay import materialize
+from Utils.ResultHashing import group_results, result_gap, results_equal
 
 T = TypeVar("T")
 
 
 class TestMetamorphism(ABC):
+    def __init__(self):
+        # Chooses among relations (see Utils.RelationBandit), None picks uniformly
+        self.bandit = None
+        # (relation name, no-op) of every relation applied in the current try
+        self.applied: list[tuple[str, bool]] = []
+
     @abstractmethod
     def mutate(
         self, graph: nx.Graph, input: Any, result: T
     ) -> tuple[nx.Graph, Any, Callable[[T], bool]]:
         pass
 
+    def choose(self, relations: list[Callable]) -> Callable:
+        if self.bandit is None:
+            return random.choice(relations)
+        return self.bandit.choose(relations)
+
+    def apply(self, relation: Callable, graph: nx.Graph, *args) -> tuple:
+        """relation(graph, *args), noted for the current try together with whether it was a no-op.
+
+        A relation that returns the input graph itself counts as a no-op;
+        one that raises counts as a no-op and the exception is passed on.
+        """
+        try:
+            output = relation(graph, *args)
+        except Exception:
+            self.applied.append((relation.__name__, True))
+            raise
+        self.applied.append((relation.__name__, output[0] is graph))
+        return output
+
 
 class BaseTester(ABC):
+    # Number of algorithm invocations one call to test() makes per implementation
+    queries_per_test = 1
+    # Normalization applied once per graph before any implementation runs:
+    # weight given to edges without one (None leaves them as they are),
+    default_weight = None
+    # weight replacing NaN weights (None keeps NaN),
+    nan_weight = None
+    # and whether nodes are relabelled 0..n-1 in iteration order.
+    relabel_nodes = False
+    # Whether the result on a disjoint union splits into the results on its parts,
+    # which lets screen_batch test many graphs with one call per implementation
+    decomposable = False
+    # Float results closer than this are considered equal, None compares exactly
+    result_tolerance = None
+    # Implementations that only run on graphs with at most this many nodes,
+    # e.g. dense matrix references; larger graphs are compared without them
+    node_limits: dict[str, int] = {}
+    # Whether the implementations only agree on simple undirected graphs (e.g.
+    # networkx raises NetworkXNotImplemented on the others); other graphs are not tested
+    undirected_only = False
+
     def __init__(
         self,
         corpus_path: str,
@@ -33,6 +87,44 @@ class BaseTester(ABC):
         self.test_method = test_method
         self.algorithm = algorithm
         self.algorithms: dict[str, Callable] = {}
+        # Tiered differential testing, configured by the fuzzer: the tier_one_size
+        # fastest implementations always run, the others with their sample rate
+        self.tiered = False
+        self.tier_one_size = 2
+        self.default_sample_rate = 0.1
+        self.sample_rates: dict[str, float] = {}
+        # Comparisons of the current test that tiering left incomplete, as
+        # (graph, args, pool, results, implementations run, latencies,
+        # exception_result); the fuzzer resets them before every test
+        self.partial_comparisons: list[tuple] = []
+        # Moving average of each implementation's latency and its number of runs
+        self.implementation_latency: dict[str, float] = {}
+        self.implementation_runs: dict[str, int] = {}
+        # Total latency of each implementation since the fuzzer last reset it
+        self.test_latencies: dict[str, float] = {}
+        self.num_comparisons = 0
+        # Parallel differential testing, configured by the fuzzer: on graphs with at
+        # least parallel_min_nodes nodes the implementations run in parallel_pool,
+        # each within parallel_deadline seconds
+        self.parallel_pool = None
+        self.parallel_min_nodes = 0
+        self.parallel_deadline = 10.0
+        self.implementation_timeouts: dict[str, int] = {}
+        # Adaptive choice of metamorphic relations, configured by the fuzzer
+        self.relation_bandit = None
+        # Largest gap between agreeing implementations since the fuzzer last reset
+        # it, as a fraction of result_tolerance (exact comparisons always give 0)
+        self.max_gap = 0.0
+        # Performance-differential findings, configured by the fuzzer: an implementation
+        # taking slowdown_ratio times the median latency of the others (and at least
+        # slowdown_min_latency seconds) in one comparison is kept in slowdowns, by
+        # message, as (graph, args, implementations compared, slowest or None if it
+        # missed the parallel deadline) until the fuzzer takes it
+        self.slowdown_ratio = None
+        self.slowdown_min_latency = 0.01
+        self.slowdowns: dict[str, tuple] = {}
+        # Latency of each implementation in the current comparison
+        self.comparison_latencies: dict[str, float] = {}
         print(f"Bug file id: {self.uuid}")
 
     @staticmethod
@@ -40,18 +132,83 @@ class BaseTester(ABC):
     def get_test_metamorphism() -> TestMetamorphism:
         pass
 
+    def normalize(self, graph: nx.Graph) -> tuple[nx.Graph, Optional[dict]]:
+        """Prepare the input shared by all implementations in a single pass over the graph.
+
+        Returns a normalized copy and the mapping from original to new node labels,
+        None when nodes keep their labels. The original graph is left untouched.
+        """
+        if self.default_weight is None and self.nan_weight is None and not self.relabel_nodes:
+            return graph, None
+
+        mapping = (
+            {node: index for index, node in enumerate(graph)} if self.relabel_nodes else None
+        )
+        prepared = graph.__class__()
+        prepared.graph.update(graph.graph)
+        if mapping is None:
+            prepared.add_nodes_from(graph.nodes(data=True))
+        else:
+            prepared.add_nodes_from(
+                (mapping[node], data) for node, data in graph.nodes(data=True)
+            )
+
+        edges = (
+            graph.edges(keys=True, data=True)
+            if graph.is_multigraph()
+            else graph.edges(data=True)
+        )
+        prepared_edges = []
+        for *endpoints, data in edges:
+            data = dict(data)
+            weight = data.get("weight")
+            if weight is None:
+                if self.default_weight is not None:
+                    data["weight"] = self.default_weight
+            elif self.nan_weight is not None and isinstance(weight, float) and math.isnan(weight):
+                data["weight"] = self.nan_weight
+            if mapping is not None:
+                endpoints[0], endpoints[1] = mapping[endpoints[0]], mapping[endpoints[1]]
+            prepared_edges.append((*endpoints, data))
+        prepared.add_edges_from(prepared_edges)
+        return prepared, mapping
+
+    @staticmethod
+    def normalize_args(args: tuple, mapping: Optional[dict]) -> tuple:
+        """Translate node arguments (e.g. source and target) to the normalized labels."""
+        if mapping is None:
+            return args
+        return tuple(mapping[arg] for arg in args)
+
+    def accepts(self, graph: nx.Graph) -> bool:
+        """Whether graph can be tested at all, see undirected_only."""
+        return not self.undirected_only or not (graph.is_directed() or graph.is_multigraph())
+
     def test(
         self, graph: nx.Graph, timestamp: float, *args, **kwargs
     ) -> dict[str, nx.Graph]:
+        if not self.accepts(graph):
+            return {}
+        prepared, mapping = self.normalize(graph)
+        return self.test_normalized(
+            graph, prepared, timestamp, *self.normalize_args(args, mapping)
+        )
+
+    def test_normalized(
+        self, graph: nx.Graph, prepared: nx.Graph, timestamp: float, *args
+    ) -> dict[str, nx.Graph]:
+        """Run one test on the output of normalize(); differential discrepancies report the original graph."""
         if self.test_method == "differential":
-            discrepancy_msg, discrepancy_graph = self.test_algorithms(graph)
+            discrepancy_msg, discrepancy_graph = self.test_algorithms(prepared, *args)
+            if discrepancy_graph is prepared:
+                discrepancy_graph = graph
         elif self.test_method == "metamorphic":
             alg = self.algorithms.get(self.algorithm, None)
             if alg is None:
                 message = f"Incorrect algorithm name provided: {self.algorithm}"
                 return {message: graph}
             discrepancy_msg, discrepancy_graph = self.test_metamorphic(
-                graph, alg, *args
+                prepared, alg, *args
             )
 
         if discrepancy_msg:
@@ -62,6 +219,224 @@ class BaseTester(ABC):
             return {discrepancy_msg: discrepancy_graph}
         return {}
 
+    @staticmethod
+    def split_batch_result(result: Any, offsets: list[int]) -> list[Any]:
+        """Split a result on the disjoint union back into one result per graph.
+
+        offsets[i] is the first node label of graph i in the union. The default
+        handles results that are collections of node sets, e.g. components.
+        """
+        parts = [set() for _ in offsets]
+        for component in result:
+            parts[bisect_right(offsets, next(iter(component))) - 1].add(component)
+        return parts
+
+    def screen_batch(self, graphs: list[nx.Graph]) -> list[bool]:
+        """Run every implementation once on the disjoint union of the graphs.
+
+        Returns, per graph, whether all implementations agreed on its part of
+        the union. Graphs that disagree, or all of them when the union cannot be
+        tested, must go through test() individually.
+        """
+        unscreened = [False] * len(graphs)
+        if (
+            len(graphs) < 2
+            or not self.decomposable
+            or self.test_method != "differential"
+            or len({(g.is_directed(), g.is_multigraph()) for g in graphs}) != 1
+        ):
+            return unscreened
+
+        prepared = [self.normalize(graph)[0] for graph in graphs]
+        offsets = []
+        total = 0
+        for graph in prepared:
+            offsets.append(total)
+            total += len(graph)
+        union = nx.disjoint_union_all(prepared)
+
+        split_results = {}
+        try:
+            for algo_name, algo_func in self.applicable_algorithms(union, self.algorithms).items():
+                split_results[algo_name] = self.split_batch_result(
+                    algo_func(union), offsets
+                )
+        except Exception:
+            return unscreened
+
+        results = list(split_results.values())
+        return [
+            all(
+                results_equal(other[i], results[0][i], self.result_tolerance)
+                for other in results[1:]
+            )
+            for i in range(len(graphs))
+        ]
+
+    def applicable_algorithms(
+        self, graph: nx.Graph, pool: dict[str, Callable]
+    ) -> dict[str, Callable]:
+        """The implementations of pool that accept graph, see node_limits."""
+        if not self.node_limits:
+            return pool
+        return {
+            algo_name: algo_func
+            for algo_name, algo_func in pool.items()
+            if len(graph) <= self.node_limits.get(algo_name, len(graph))
+        }
+
+    def calibration_args(self, graph: nx.Graph) -> Optional[tuple]:
+        """Arguments passed to every implementation during calibration, None to skip the graph."""
+        return ()
+
+    def calibration_algorithms(self, prepared: nx.Graph, args: tuple) -> tuple[dict, tuple]:
+        """Implementations and arguments calibration runs on prepared, one query of test()."""
+        return self.applicable_algorithms(prepared, self.algorithms), args
+
+    def calibrate(
+        self, graph: nx.Graph, n_runs: int = 3
+    ) -> tuple[dict[str, list[float]], list[str]]:
+        """Run every implementation n_runs times on the same input.
+
+        Returns the latencies of each implementation and the names of the
+        implementations whose result changed between runs.
+        """
+        args = self.calibration_args(graph) if self.accepts(graph) else None
+        if args is None:
+            return {}, []
+        prepared, mapping = self.normalize(graph)
+        algorithms, args = self.calibration_algorithms(
+            prepared, self.normalize_args(args, mapping)
+        )
+        latencies = {}
+        nondeterministic = []
+        for algo_name, algo_func in algorithms.items():
+            results = []
+            for _ in range(n_runs):
+                start = time.perf_counter()
+                try:
+                    results.append(algo_func(prepared, *args))
+                except Exception as e:
+                    results.append(type(e).__name__)
+                latencies.setdefault(algo_name, []).append(time.perf_counter() - start)
+            if any(not results_equal(results[0], r) for r in results[1:]):
+                nondeterministic.append(algo_name)
+        return latencies, nondeterministic
+
+    def select_algorithms(self, pool=None) -> dict[str, Callable]:
+        """Implementations of pool (default self.algorithms) to run for the next comparison."""
+        pool = self.algorithms if pool is None else pool
+        if not self.tiered:
+            return pool
+        # Unmeasured implementations go first so that every latency gets measured
+        by_latency = sorted(
+            pool,
+            key=lambda name: self.implementation_latency.get(name, -1.0),
+        )
+        tier_one = set(by_latency[: self.tier_one_size])
+        tier_one.update(name for name in by_latency if name not in self.implementation_latency)
+        return {
+            algo_name: algo_func
+            for algo_name, algo_func in pool.items()
+            if algo_name in tier_one
+            or random.random() < self.sample_rates.get(algo_name, self.default_sample_rate)
+        }
+
+    def test_all_tiers(
+        self, graph: nx.Graph, timestamp: float, comparisons: list[tuple]
+    ) -> dict[str, nx.Graph]:
+        """Complete the partial_comparisons of a test of graph, e.g. of a mutant that was new to the feedback.
+
+        Only the implementations that tiering skipped run, on the same
+        arguments; a graph of None stands for graph itself.
+        """
+        discrepancies = {}
+        for prepared, args, pool, results, ran, latencies, exception_result in comparisons:
+            prepared = graph if prepared is None else prepared
+            self.comparison_latencies = dict(latencies)
+            skipped = {name: func for name, func in pool.items() if name not in ran}
+            results = self.complete_results(prepared, args, pool, results, skipped, exception_result)
+            discrepancy_msg, discrepancy_graph = self.compare_results(prepared, args, pool, results)
+            if discrepancy_msg:
+                if discrepancy_graph is prepared:
+                    discrepancy_graph = graph
+                save_discrepancy(
+                    (discrepancy_msg, discrepancy_graph, timestamp),
+                    f"{self.discrepancy_filename}_{self.uuid}.pkl",
+                )
+                discrepancies[discrepancy_msg] = discrepancy_graph
+        return discrepancies
+
+    def record_latency(self, algo_name: str, latency: float):
+        previous = self.implementation_latency.get(algo_name, latency)
+        self.implementation_latency[algo_name] = 0.9 * previous + 0.1 * latency
+        self.implementation_runs[algo_name] = self.implementation_runs.get(algo_name, 0) + 1
+        self.test_latencies[algo_name] = self.test_latencies.get(algo_name, 0.0) + latency
+        self.comparison_latencies[algo_name] = latency
+
+    def run_algorithms(
+        self, graph: nx.Graph, args: tuple, algorithms: dict[str, Callable], exception_result=None
+    ) -> dict[str, Any]:
+        """Results of the implementations on one input; exceptions give exception_result.
+
+        Implementations that missed the parallel deadline have no result.
+        """
+        if (
+            self.parallel_pool is not None
+            and len(algorithms) > 1
+            and len(graph) >= self.parallel_min_nodes
+        ):
+            outcomes = self.parallel_pool.run(graph, args, algorithms, self.parallel_deadline)
+            if outcomes is not None:
+                return self.collect_outcomes(outcomes, exception_result)
+
+        results = {}
+        for algo_name, algo_func in algorithms.items():
+            start = time.perf_counter()
+            try:
+                results[algo_name] = algo_func(graph, *args)
+            except MemoryError:
+                # Out of memory is a finding about the input, not a result to compare
+                raise
+            except Exception:
+                results[algo_name] = exception_result
+            self.record_latency(algo_name, time.perf_counter() - start)
+        return results
+
+    def collect_outcomes(
+        self, outcomes: dict[str, tuple], exception_result=None
+    ) -> dict[str, Any]:
+        results = {}
+        for algo_name, (status, value, latency) in outcomes.items():
+            self.record_latency(algo_name, latency)
+            if status == "ok":
+                results[algo_name] = value
+            elif status == "error" and value.startswith("MemoryError"):
+                raise MemoryError(f"{algo_name} in a worker process: {value}")
+            elif status == "error":
+                results[algo_name] = exception_result
+            else:
+                self.record_timeout(algo_name)
+        return results
+
+    def record_timeout(self, algo_name: str):
+        self.implementation_timeouts[algo_name] = (
+            self.implementation_timeouts.get(algo_name, 0) + 1
+        )
+        print(f"{algo_name} missed the parallel deadline of {self.parallel_deadline} seconds.")
+
+    def report_tiers(self):
+        print(f"Tiered testing over {self.num_comparisons} comparisons:")
+        for algo_name in sorted(
+            self.implementation_runs, key=lambda name: self.implementation_latency[name]
+        ):
+            runs = self.implementation_runs[algo_name]
+            print(
+                f"  {algo_name}: ran in {runs / max(self.num_comparisons, 1):.1%} of comparisons, "
+                f"sample rate {self.sample_rates.get(algo_name, self.default_sample_rate):.2f}, "
+                f"average latency {self.implementation_latency[algo_name] * 1000:.2f} ms."
+            )
+
     def test_metamorphic(
         self,
         graph: nx.Graph,
@@ -69,39 +444,139 @@ class BaseTester(ABC):
         *args,
         n_tries=10,
     ) -> tuple[Optional[str], Optional[nx.Graph]]:
+        """Check n_tries metamorphic relations between alg's results on graph and its mutations.
+
+        On graphs with at least parallel_min_nodes nodes all tries are drawn
+        first and run concurrently in parallel_pool; the first failing one is
+        reported either way.
+        """
         orig_result = alg(graph, *args)
         mutator: TestMetamorphism = self.get_test_metamorphism()
-        for _ in range(n_tries):
-            new_graph, new_args, checker = mutator.mutate(graph, args, orig_result)
-            new_result = alg(new_graph, *new_args)
-            if not checker(new_result):
+        mutator.bandit = self.relation_bandit
+
+        def draw():
+            for _ in range(n_tries):
+                mutator.applied = []
+                start = time.perf_counter()
+                new_graph, new_args, checker = mutator.mutate(graph, args, orig_result)
+                yield new_graph, new_args, checker, mutator.applied, time.perf_counter() - start
+
+        tries = draw()
+        outcomes = itertools.repeat(None)
+        mutate_error = None
+        if self.parallel_pool is not None and len(graph) >= self.parallel_min_nodes:
+            drawn = []
+            try:
+                for new_try in tries:
+                    drawn.append(new_try)
+            except Exception as e:
+                # Raised once the tries drawn before it passed, as in a sequential run
+                mutate_error = e
+            tries = drawn
+            outcomes = self.parallel_pool.run_tries(
+                graph,
+                alg,
+                [(new_graph, new_args) for new_graph, new_args, *_ in tries],
+                self.parallel_deadline,
+            ) or outcomes
+
+        for (new_graph, new_args, checker, applied, cost), outcome in zip(tries, outcomes):
+            if outcome is not None and outcome[0] == "timeout":
+                self.record_timeout(self.algorithm)
+                self.record_relations(applied, cost + outcome[2], False)
+                continue
+            if outcome is not None and outcome[0] == "error" and outcome[1].startswith("MemoryError"):
+                # Rerunning it here would repeat the blowup without the worker's limit
+                raise MemoryError(f"{self.algorithm} in a worker process: {outcome[1]}")
+            if outcome is None or outcome[0] == "error":
+                # Run here, so that exceptions surface as in a sequential run
+                start = time.perf_counter()
+                new_result = alg(new_graph, *new_args)
+                cost += time.perf_counter() - start
+            else:
+                new_result = outcome[1]
+                cost += outcome[2]
+            violated = not checker(new_result)
+            self.record_relations(applied, cost, violated)
+            if violated:
                 discrepancy_msg = (
                     f"Results for a graph and its mutation are inconsistent!"
                 )
-                return (discrepancy_msg, (graph, args, new_graph, new_args))
+                return (discrepancy_msg, (graph, args, materialize(new_graph), new_args))
+        if mutate_error is not None:
+            raise mutate_error
         return None, None
 
+    def record_relations(self, applied: list[tuple[str, bool]], cost: float, violated: bool):
+        if self.relation_bandit is not None and applied:
+            self.relation_bandit.record(applied, cost, violated)
+
     def test_algorithms(
-        self, graph: nx.Graph, *args, exception_result=None
+        self, graph: nx.Graph, *args, exception_result=None, algorithms=None, pool=None
     ) -> tuple[Optional[str], Optional[nx.Graph]]:
-        results = {}
-        for algo_name, algo_func in self.algorithms.items():
-            try:
-                results[algo_name] = algo_func(graph, *args)
-            except Exception:
-                results[algo_name] = exception_result
+        """Compare the implementations in pool (default self.algorithms) on one input.
 
+        algorithms overrides the subset chosen by the tiered policy.
+        """
+        pool = self.applicable_algorithms(graph, self.algorithms if pool is None else pool)
+        if algorithms is None:
+            algorithms = self.select_algorithms(pool)
+        self.num_comparisons += 1
+        self.comparison_latencies = {}
+        results = self.run_algorithms(graph, args, algorithms, exception_result)
+        if len(algorithms) < len(pool):
+            skipped = {name: func for name, func in pool.items() if name not in algorithms}
+            if len(group_results(results, self.result_tolerance)) > 1:
+                # The first tier disagrees, run the skipped implementations as well
+                results = self.complete_results(
+                    graph, args, pool, results, skipped, exception_result
+                )
+            elif self.tiered:
+                # Kept so that test_all_tiers can complete this very comparison
+                self.partial_comparisons.append(
+                    (
+                        graph,
+                        args,
+                        pool,
+                        results,
+                        set(algorithms),
+                        dict(self.comparison_latencies),
+                        exception_result,
+                    )
+                )
+        return self.compare_results(graph, args, pool, results)
+
+    def complete_results(
+        self,
+        graph: nx.Graph,
+        args: tuple,
+        pool: dict[str, Callable],
+        results: dict[str, Any],
+        skipped: dict[str, Callable],
+        exception_result=None,
+    ) -> dict[str, Any]:
+        """results together with those of the skipped implementations, in the order of pool."""
+        results = {**results, **self.run_algorithms(graph, args, skipped, exception_result)}
+        # Keep the declaration order so the same bug always yields the same message
+        return {name: results[name] for name in pool if name in results}
+
+    def compare_results(
+        self, graph: nx.Graph, args: tuple, pool: dict[str, Callable], results: dict[str, Any]
+    ) -> tuple[Optional[str], Optional[nx.Graph]]:
+        """The discrepancy message and graph of one comparison, (None, None) if all results agree."""
+        groups = group_results(results, self.result_tolerance)
+        if len(groups) == 1 and self.result_tolerance:
+            self.max_gap = max(self.max_gap, self.disagreement_gap(results))
+        if self.slowdown_ratio is not None:
+            self.check_slowdown(graph, args, pool, results)
+
+        # Implementations are grouped by result hash, only the groups are compared pairwise
+        groups = ["+".join(names) for names in groups]
         discrepancy_messages = []
-        algo_names = list(self.algorithms.keys())
-        for i in range(len(algo_names)):
-            for j in range(i + 1, len(algo_names)):
-                algo_name1 = algo_names[i]
-                algo_name2 = algo_names[j]
-                result1 = results[algo_name1]
-                result2 = results[algo_name2]
-                if result1 != result2:
-                    discrepancy_msg = f"Results of {algo_name1} and {algo_name2} are different for a graph!"
-                    discrepancy_messages.append(discrepancy_msg)
+        for i in range(len(groups)):
+            for j in range(i + 1, len(groups)):
+                discrepancy_msg = f"Results of {groups[i]} and {groups[j]} are different for a graph!"
+                discrepancy_messages.append(discrepancy_msg)
 
         if discrepancy_messages:
             return (
@@ -111,6 +586,92 @@ class BaseTester(ABC):
         else:
             return None, None  # Return None if no discrepancy
 
+    def slowdown(self, latencies: dict[str, float]) -> Optional[tuple[str, float]]:
+        """The implementation slowdown_ratio times slower than the median of the others, and its ratio."""
+        if len(latencies) < 2:
+            return None
+        slowest = max(latencies, key=latencies.get)
+        ratio = latencies[slowest] / max(
+            statistics.median(latency for name, latency in latencies.items() if name != slowest),
+            1e-9,
+        )
+        if latencies[slowest] < self.slowdown_min_latency or ratio < self.slowdown_ratio:
+            return None
+        return slowest, ratio
+
+    def check_slowdown(
+        self, graph: nx.Graph, args: tuple, pool: dict[str, Callable], results: dict[str, Any]
+    ):
+        finding = self.slowdown(self.comparison_latencies)
+        if finding is None:
+            return
+        slowest, ratio = finding
+        print(f"{slowest} took {ratio:.1f} times the median latency of the other implementations.")
+        message = (
+            f"Performance: {slowest} is over {self.slowdown_ratio:g} times slower than "
+            f"the other implementations on a graph!"
+        )
+        if message not in self.slowdowns:
+            algorithms = {name: pool[name] for name in self.comparison_latencies}
+            # An implementation that missed the deadline is not run again to minimize the graph
+            self.slowdowns[message] = (
+                graph,
+                args,
+                algorithms,
+                slowest if slowest in results else None,
+            )
+
+    @staticmethod
+    def arg_nodes(args: tuple):
+        """The nodes among the arguments, e.g. a source and a tuple of targets."""
+        for arg in args:
+            if isinstance(arg, tuple):
+                yield from arg
+            else:
+                yield arg
+
+    @staticmethod
+    def time_run(algo_func: Callable, graph: nx.Graph, args: tuple) -> float:
+        start = time.perf_counter()
+        try:
+            algo_func(graph, *args)
+        except Exception:
+            pass
+        return time.perf_counter() - start
+
+    def keeps_slowdown(
+        self,
+        graph: nx.Graph,
+        args: tuple,
+        algorithms: dict[str, Callable],
+        slowest: str,
+        repeats: int = 3,
+    ) -> bool:
+        """Whether slowest is still slowdown_ratio times slower than the others on graph.
+
+        Every implementation runs once untimed first, so that caches they share
+        (e.g. a memoized residual network) are built before any is timed, then
+        the fastest of repeats interleaved runs counts.
+        """
+        if not all(node in graph for node in self.arg_nodes(args)):
+            return False
+        for algo_func in algorithms.values():
+            self.time_run(algo_func, graph, args)
+        latencies = dict.fromkeys(algorithms, float("inf"))
+        for _ in range(repeats):
+            for algo_name, algo_func in algorithms.items():
+                latencies[algo_name] = min(
+                    latencies[algo_name], self.time_run(algo_func, graph, args)
+                )
+        finding = self.slowdown(latencies)
+        return finding is not None and finding[0] == slowest
+
+    def disagreement_gap(self, results: dict[str, Any]) -> float:
+        """Largest gap between the first result and the others, as a fraction of result_tolerance."""
+        results = list(results.values())
+        gap = max((result_gap(results[0], other) for other in results[1:]), default=0.0)
+        return gap / self.result_tolerance
+
     def run(self):
         discrepancy_data = []
         discrepancy_counts = {}
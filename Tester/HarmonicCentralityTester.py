@@ -1,4 +1,3 @@
-import math
 from typing import Callable, Any
 import random
 
@@ -6,6 +5,8 @@ import networkx as nx
 
 from Tester.BaseTester import BaseTester, TestMetamorphism
 from Utils.GraphConverter import GraphConverter
+from Utils.GraphFacts import GraphFacts
+from Utils.NumpyReference import MAX_NODES, harmonic_centrality
 
 
 class HarmonicCentralityTesterAlgorithms:
@@ -16,7 +17,7 @@ class HarmonicCentralityTesterAlgorithms:
     @staticmethod
     def igraph(graph: nx.DiGraph):
         converter = GraphConverter(graph)
-        graph_ig = converter.to_igraph()
+        graph_ig, index = converter.to_igraph_indexed()
 
         mode = "in" if graph.is_directed() else "all"
         # Compute harmonic centrality with igraph, taking into account if the graph is directed
@@ -29,10 +30,12 @@ class HarmonicCentralityTesterAlgorithms:
             # If no weights, compute centrality without weights
             ig_centrality = graph_ig.harmonic_centrality(mode=mode, normalized=False)
 
-        # In igraph, the result is a list, map it to vertex ids
-        return {
-            graph_ig.vs["name"][v.index]: c for v, c in zip(graph_ig.vs, ig_centrality)
-        }
+        # In igraph, the result is a list, map it back to the networkx nodes
+        return {node: ig_centrality[i] for node, i in index.items()}
+
+    @staticmethod
+    def numpy(graph: nx.DiGraph):
+        return harmonic_centrality(graph)
 
 
 class HarmonicCentralityMetamorphism(TestMetamorphism):
@@ -55,6 +58,8 @@ class HarmonicCentralityMetamorphism(TestMetamorphism):
 
 
 class HarmonicCentralityTester(BaseTester):
+    node_limits = {"numpy": MAX_NODES}
+    result_tolerance = 1e-6
 
     def __init__(
         self, corpus_path, discrepancy_filename="hc_discrepancy", *args, **kwargs
@@ -63,38 +68,18 @@ class HarmonicCentralityTester(BaseTester):
         self.algorithms: dict[str, Callable[[nx.DiGraph], Any]] = {
             "networkx": HarmonicCentralityTesterAlgorithms.networkx,
             "igraph": HarmonicCentralityTesterAlgorithms.igraph,
+            "numpy": HarmonicCentralityTesterAlgorithms.numpy,
         }
 
     def get_test_metamorphism(self):
         return HarmonicCentralityMetamorphism()
 
     def test_algorithms(self, G):
-        """Test harmonic centrality between networkx and igraph."""
-
-        def contains_negative_or_nan_weight(graph):
-            for _, _, data in graph.edges(data=True):
-                weight = data.get("weight", 0)
-                if weight <= 0 or math.isnan(weight):
-                    return True
-            return False
+        """Compare the harmonic centrality implementations on graphs with positive weights."""
 
-        if contains_negative_or_nan_weight(G):
+        # Missing weights count as zero, as networkx reads them
+        facts = GraphFacts.of(G)
+        if facts.has_missing_weight or facts.has_nonpositive_weight or facts.has_nan_weight:
             return None, None
 
-        nx_centrality_dict = self.algorithms["networkx"](G)
-        ig_centrality_dict = self.algorithms["igraph"](G)
-
-        for node, nx_score in nx_centrality_dict.items():
-            ig_score = ig_centrality_dict.get(str(node))
-            if ig_score is None or not self.approximately_equal(nx_score, ig_score):
-                discrepancy_msg = (
-                    f"Results of networkx and igraph are different for a graph!"
-                )
-                return discrepancy_msg, G
-
-        return None, None
-
-    @staticmethod
-    def approximately_equal(a, b, tol=1e-6):
-        """Check if two centrality values are approximately equal considering a tolerance."""
-        return abs(a - b) <= tol
+        return super().test_algorithms(G)
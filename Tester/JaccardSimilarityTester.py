@@ -1,48 +1,43 @@
 import networkx as nx
+from itertools import combinations
 from typing import Any, Callable
 import random
 
+import numpy as np
+
 from Tester.BaseTester import BaseTester, TestMetamorphism
 from Utils.FileUtils import save_discrepancy
 from Utils.GraphConverter import GraphConverter
+from Utils.GraphOverlay import overlay
+from Utils.NumpyReference import MAX_NODES, jaccard_matrix, pair_matrix, reindexed
 
 
 class JaccardSimilarityTesterAlgorithms:
+    # Results are symmetric matrices indexed by position in graph.nodes(), with
+    # a zero diagonal. The tester relabels nodes to 0..n-1, so result[u, v] is
+    # the coefficient of the pair (u, v).
+
     @staticmethod
     def networkx(graph: nx.DiGraph):
-        return list(nx.jaccard_coefficient(graph))
+        return pair_matrix(graph, nx.jaccard_coefficient(graph, ebunch=combinations(graph, 2)))
 
     @staticmethod
     def igraph(graph: nx.DiGraph):
         converter = GraphConverter(graph)
-        graph_ig = converter.to_igraph()
-
-        if len(graph_ig.vs) == 0:
-            vertex_id_map = {}
-        else:
-            vertex_id_map = {
-                str(node): idx for idx, node in enumerate(graph_ig.vs["name"])
-            }
-
-        nodes = list(graph.nodes)
-        ig_jaccard_results = []
-        for i in range(len(nodes)):
-            for j in range(i + 1, len(nodes)):
-                u, v = nodes[i], nodes[j]
-                u_id, v_id = vertex_id_map[str(u)], vertex_id_map[str(v)]
-                ig_jaccard_score = graph_ig.similarity_jaccard(
-                    pairs=[(u_id, v_id)], loops=False
-                )[0]
-                ig_jaccard_results.append((u, v, ig_jaccard_score))
-
-        return ig_jaccard_results
+        graph_ig, vertex_id_map = converter.to_igraph_indexed()
+        similarity_matrix = reindexed(
+            graph_ig.similarity_jaccard(loops=False), vertex_id_map, graph
+        )
+        np.fill_diagonal(similarity_matrix, 0)
+        return similarity_matrix
 
     @staticmethod
-    def find_coef(res: list[tuple[int, int, float]], u: int, v: int) -> float:
-        for x, y, val in res:
-            if (x == u and y == v) or (x == v and y == u):
-                return val
-        return 0
+    def numpy(graph: nx.DiGraph):
+        return jaccard_matrix(graph)
+
+    @staticmethod
+    def find_coef(res, u: int, v: int) -> float:
+        return res[u, v]
 
 
 class JaccardSimilarityMetamorphism(TestMetamorphism):
@@ -51,14 +46,14 @@ class JaccardSimilarityMetamorphism(TestMetamorphism):
     ) -> tuple[nx.Graph, Any, Callable[[int], bool]]:
         if len(graph.nodes) < 2:
             return graph, input, lambda _: True
-        if random.choice([True, False]):
-            return self.mutate_increase_similarity(graph, input, result)
-        else:
-            return self.mutate_decrease_similarity(graph, input, result)
+        method = self.choose(
+            [self.mutate_increase_similarity, self.mutate_decrease_similarity]
+        )
+        return self.apply(method, graph, input, result)
 
     def mutate_increase_similarity(
-        self, graph: nx.Graph, input: Any, result: list[tuple[int, int, float]]
-    ) -> tuple[nx.Graph, Any, Callable[[list[tuple[int, int, float]]], bool]]:
+        self, graph: nx.Graph, input: Any, result: np.ndarray
+    ) -> tuple[nx.Graph, Any, Callable[[np.ndarray], bool]]:
         """
         add edge to create a common neighbour
         """
@@ -71,7 +66,7 @@ class JaccardSimilarityMetamorphism(TestMetamorphism):
             diff = v_neighbours.difference(u_neighbours.union(set([v])))
             if len(diff) == 0:
                 continue
-            new_graph = graph.copy()
+            new_graph = overlay(graph)
             new_graph.add_edge(u, diff.pop())
             checker = lambda res: (
                 JaccardSimilarityTesterAlgorithms.find_coef(res, u, v)
@@ -81,8 +76,8 @@ class JaccardSimilarityMetamorphism(TestMetamorphism):
         return graph, input, lambda _: True
 
     def mutate_decrease_similarity(
-        self, graph: nx.Graph, input: Any, result: list[tuple[int, int, float]]
-    ) -> tuple[nx.Graph, Any, Callable[[list[tuple[int, int, float]]], bool]]:
+        self, graph: nx.Graph, input: Any, result: np.ndarray
+    ) -> tuple[nx.Graph, Any, Callable[[np.ndarray], bool]]:
         """
         add edge to create an exclusive neighbour
         """
@@ -98,7 +93,7 @@ class JaccardSimilarityMetamorphism(TestMetamorphism):
             )
             if len(remaining_nodes) == 0:
                 continue
-            new_graph = graph.copy()
+            new_graph = overlay(graph)
             new_graph.add_edge(u, remaining_nodes.pop())
             checker = lambda res: (
                 JaccardSimilarityTesterAlgorithms.find_coef(res, u, v)
@@ -109,6 +104,10 @@ class JaccardSimilarityMetamorphism(TestMetamorphism):
 
 
 class JaccardSimilarityTester(BaseTester):
+    relabel_nodes = True
+    undirected_only = True
+    node_limits = {"numpy": MAX_NODES}
+    result_tolerance = 1e-6
 
     def __init__(
         self, corpus_path, discrepancy_filename="js_discrepancy", *args, **kwargs
@@ -117,27 +116,8 @@ class JaccardSimilarityTester(BaseTester):
         self.algorithms = {
             "networkx": JaccardSimilarityTesterAlgorithms.networkx,
             "igraph": JaccardSimilarityTesterAlgorithms.igraph,
+            "numpy": JaccardSimilarityTesterAlgorithms.numpy,
         }
 
     def get_test_metamorphism(self):
         return JaccardSimilarityMetamorphism()
-
-    def test_algorithms(self, G):
-        """Test Jaccard similarity between networkx and igraph."""
-        nx_jaccard = self.algorithms["networkx"](G)
-        ig_jaccard = self.algorithms["igraph"](G)
-
-        for u, v, nx_score in nx_jaccard:
-            ig_score = JaccardSimilarityTesterAlgorithms.find_coef(ig_jaccard, u, v)
-            if not self.approximately_equal(nx_score, ig_score):
-                discrepancy_msg = (
-                    f"Results of networkx and igraph are different for a graph!"
-                )
-                return discrepancy_msg, G
-
-        return None, None
-
-    @staticmethod
-    def approximately_equal(a, b, tol=1e-6):
-        """Check if two similarity values are approximately equal considering a tolerance."""
-        return abs(a - b) <= tol
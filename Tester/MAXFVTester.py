@@ -3,6 +3,7 @@ from typing import Callable, Any
 
 import networkx as nx
 from networkx.algorithms.flow import (
+    build_residual_network,
     edmonds_karp,
     shortest_augmenting_path,
     dinitz,
@@ -13,48 +14,83 @@ from networkx.algorithms.flow import (
 from Tester.BaseTester import BaseTester, TestMetamorphism
 from Utils.FileUtils import save_discrepancies, save_discrepancy
 from Utils.GraphConverter import GraphConverter
+from Utils.GraphFacts import GraphFacts
+from Utils.GraphOverlay import overlay
 
 
 class MAXFVTesterAlgorithms:
+    @staticmethod
+    def _residual(graph: nx.Graph):
+        # The flow functions reset the flows of a given residual network, so
+        # one network is built per graph and reused across functions and pairs
+        return GraphFacts.of(graph).cached(
+            "residual_network", lambda g: build_residual_network(g, "weight")
+        )
+
     @staticmethod
     def edmonds_karp(graph: nx.Graph, source, target):
         return nx.maximum_flow_value(
-            graph, source, target, flow_func=edmonds_karp, capacity="weight"
+            graph,
+            source,
+            target,
+            flow_func=edmonds_karp,
+            capacity="weight",
+            residual=MAXFVTesterAlgorithms._residual(graph),
         )
 
     @staticmethod
     def shortest_augmenting_path(graph: nx.Graph, source, target):
         return nx.maximum_flow_value(
-            graph, source, target, flow_func=shortest_augmenting_path, capacity="weight"
+            graph,
+            source,
+            target,
+            flow_func=shortest_augmenting_path,
+            capacity="weight",
+            residual=MAXFVTesterAlgorithms._residual(graph),
         )
 
     @staticmethod
     def dinitz(graph: nx.Graph, source, target):
         return nx.maximum_flow_value(
-            graph, source, target, flow_func=dinitz, capacity="weight"
+            graph,
+            source,
+            target,
+            flow_func=dinitz,
+            capacity="weight",
+            residual=MAXFVTesterAlgorithms._residual(graph),
         )
 
     @staticmethod
     def boykov_kolmogorov(graph: nx.Graph, source, target):
         return nx.maximum_flow_value(
-            graph, source, target, flow_func=boykov_kolmogorov, capacity="weight"
+            graph,
+            source,
+            target,
+            flow_func=boykov_kolmogorov,
+            capacity="weight",
+            residual=MAXFVTesterAlgorithms._residual(graph),
         )
 
     @staticmethod
     def preflow_push(graph: nx.Graph, source, target):
         return nx.maximum_flow_value(
-            graph, source, target, flow_func=preflow_push, capacity="weight"
+            graph,
+            source,
+            target,
+            flow_func=preflow_push,
+            capacity="weight",
+            residual=MAXFVTesterAlgorithms._residual(graph),
         )
 
     @staticmethod
     def igraph(graph: nx.Graph, source, target):
         converter = GraphConverter(graph)
-        G_ig = converter.to_igraph()
+        G_ig, index = converter.to_igraph_indexed()
         if "weight" not in G_ig.es.attribute_names():
             G_ig.es["weight"] = 1
         # Find iGraph indices for source and target
-        source_ig = G_ig.vs.find(name=str(source)).index
-        target_ig = G_ig.vs.find(name=str(target)).index
+        source_ig = index[source]
+        target_ig = index[target]
 
         return G_ig.maxflow(source_ig, target_ig, capacity="weight").value
 
@@ -82,9 +118,9 @@ class MAXFVTestMetramorphism(TestMetamorphism):
         ]
         new_graph, new_source, new_sink, new_result = graph, source, sink, result
         for _ in range(n_compositions):
-            method = random.choice(all_methods)
-            new_graph, new_source, new_sink, new_result = method(
-                new_graph, new_source, new_sink, new_result
+            method = self.choose(all_methods)
+            new_graph, new_source, new_sink, new_result = self.apply(
+                method, new_graph, new_source, new_sink, new_result
             )
         return new_graph, new_source, new_sink, new_result
 
@@ -95,13 +131,13 @@ class MAXFVTestMetramorphism(TestMetamorphism):
             return graph, source, sink, result
 
         weight = random.randint(1, max_weight)
-        new_graph = graph.copy()
+        new_graph = overlay(graph)
         new_graph.add_edge(source, sink, weight=weight)
         return new_graph, source, sink, result + weight
 
     def add_endpoint_node(self, graph: nx.Graph, source: int, sink: int, result: int):
         new_node = max(list(graph.nodes)) + 1
-        new_graph = graph.copy()
+        new_graph = overlay(graph)
         new_graph.add_node(new_node)
         weight = random.randint(1, result + 1)
         if random.choice([True, False]):
@@ -118,6 +154,8 @@ class MAXFVTestMetramorphism(TestMetamorphism):
 
 
 class MAXFVTester(BaseTester):
+    queries_per_test = 5
+    relabel_nodes = True
 
     def __init__(
         self, corpus_path, discrepancy_filename="maxfv_discrepancy", *args, **kwargs
@@ -135,6 +173,11 @@ class MAXFVTester(BaseTester):
     def get_test_metamorphism(self):
         return MAXFVTestMetramorphism()
 
+    def calibration_args(self, G):
+        if len(G) < 2:
+            return None
+        return tuple(random.sample(list(G.nodes), 2))
+
     def test(self, G, timestamp):
         return self.run_maxfv_tests_multiple_times(G, timestamp)
 
@@ -146,6 +189,7 @@ class MAXFVTester(BaseTester):
         if len(nodes) < 2:
             return discrepancies
 
+        prepared, mapping = self.normalize(G)
         for _ in range(num_runs):
             # Randomly select source and target nodes
             source = random.choice(nodes)
@@ -153,7 +197,9 @@ class MAXFVTester(BaseTester):
             while target == source:  # Ensure source and target are different
                 target = random.choice(nodes)
 
-            discrepancies = super().test(G, timestamp, source, target)
+            discrepancies = self.test_normalized(
+                G, prepared, timestamp, *self.normalize_args((source, target), mapping)
+            )
             if len(discrepancies) > 0:
                 return discrepancies
 
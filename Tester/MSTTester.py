@@ -1,4 +1,3 @@
-import numpy as np
 from typing import Callable, Any
 import random
 
@@ -6,6 +5,9 @@ import networkx as nx
 
 from Tester.BaseTester import BaseTester, TestMetamorphism
 from Utils.GraphConverter import GraphConverter
+from Utils.GraphFacts import GraphFacts
+from Utils.GraphOverlay import overlay
+from Utils.NumpyReference import spanning_forest_weight
 
 
 class MSTTesterAlgorithms:
@@ -43,6 +45,10 @@ class MSTTesterAlgorithms:
             edge["weight"] for edge in graph_ig.spanning_tree(weights="weight").es
         )
 
+    @staticmethod
+    def numpy(graph: nx.DiGraph):
+        return spanning_forest_weight(graph)
+
 
 class MSTTestMetamorphism(TestMetamorphism):
     def mutate(
@@ -59,14 +65,14 @@ class MSTTestMetamorphism(TestMetamorphism):
         all_methods = [
             self.add_node_single_edge,
         ]
-        if nx.is_connected(graph):
+        if GraphFacts.of(graph).is_connected:
             all_methods.extend(
                 [self.add_edge_large_weight, self.add_node_multiple_edges]
             )
         new_graph, new_result = graph, result
         for _ in range(n_compositions):
-            method = random.choice(all_methods)
-            new_graph, new_result = method(new_graph, new_result)
+            method = self.choose(all_methods)
+            new_graph, new_result = self.apply(method, new_graph, new_result)
         return new_graph, new_result
 
     def add_edge_large_weight(self, graph: nx.Graph, result: int):
@@ -76,7 +82,7 @@ class MSTTestMetamorphism(TestMetamorphism):
             u, v = random.sample(nodes, 2)
             if graph.has_edge(u, v):
                 continue
-            new_graph = graph.copy()
+            new_graph = overlay(graph)
             new_graph.add_edge(u, v, weight=weight)
             return new_graph, result
         return graph, result
@@ -85,7 +91,7 @@ class MSTTestMetamorphism(TestMetamorphism):
         new_node = max(list(graph.nodes)) + 1
         weight = random.randint(1, 20)
         some_node = random.choice(list(graph.nodes))
-        new_graph = graph.copy()
+        new_graph = overlay(graph)
         new_graph.add_node(new_node)
         new_graph.add_edge(new_node, some_node, weight=weight)
         return new_graph, result + weight
@@ -97,7 +103,7 @@ class MSTTestMetamorphism(TestMetamorphism):
         weights = [random.randint(result, result + 100) for _ in range(n_edges)]
         nodes = random.sample(list(graph.nodes), n_edges)
 
-        new_graph = graph.copy()
+        new_graph = overlay(graph)
         new_graph.add_node(new_node)
         for weight, old_node in zip(weights, nodes):
             new_graph.add_edge(new_node, old_node, weight=weight)
@@ -106,6 +112,9 @@ class MSTTestMetamorphism(TestMetamorphism):
 
 
 class MSTTester(BaseTester):
+    default_weight = 1
+    # NaN weights count as zero, as minimum_spanning_edges rejects them
+    nan_weight = 0
 
     def __init__(
         self, corpus_path, discrepancy_filename="mst_discrepancy", *args, **kwargs
@@ -116,20 +125,8 @@ class MSTTester(BaseTester):
             "prim": MSTTesterAlgorithms.prim,
             "boruvka": MSTTesterAlgorithms.boruvka,
             "igraph": MSTTesterAlgorithms.igraph,
+            "numpy": MSTTesterAlgorithms.numpy,
         }
 
     def get_test_metamorphism(self):
         return MSTTestMetamorphism()
-
-    def preprocess_weights(self, graph: nx.DiGraph):
-        if not nx.is_weighted(graph):
-            for u, v in graph.edges():
-                graph[u][v]["weight"] = 1
-        else:
-            for u, v, data in graph.edges(data=True):
-                if np.isnan(data.get("weight", 0)):
-                    graph[u][v]["weight"] = 0
-
-    def test(self, G, timestamp):
-        self.preprocess_weights(G)
-        return super().test(G, timestamp=timestamp)
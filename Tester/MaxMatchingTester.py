@@ -5,16 +5,15 @@ import networkx as nx
 
 from Tester.BaseTester import BaseTester, TestMetamorphism
 from Utils.GraphConverter import GraphConverter
+from Utils.GraphFacts import GraphFacts
+from Utils.GraphOverlay import overlay
 
 
 class MaxMatchingTesterAlgorithms:
     @staticmethod
     def is_graph_supported(graph: nx.Graph) -> bool:
-        return (
-            (len(list(graph.nodes)) >= 2)
-            and nx.is_connected(graph)
-            and nx.is_bipartite(graph)
-        )
+        facts = GraphFacts.of(graph)
+        return len(graph) >= 2 and facts.is_connected and facts.is_bipartite
 
     @staticmethod
     def hopcroft_karp(graph: nx.Graph):
@@ -34,7 +33,7 @@ class MaxMatchingTesterAlgorithms:
             return 0
 
         # Get the two sets of the bipartite graph
-        sets = nx.bipartite.sets(graph)
+        sets = GraphFacts.of(graph).bipartite_sets
         types = [node in sets[0] for node in graph.nodes()]
 
         # Convert NetworkX graph to iGraph
@@ -57,9 +56,9 @@ class MaxMatchingMetamorphism(TestMetamorphism):
         if not MaxMatchingTesterAlgorithms.is_graph_supported(graph):
             return graph, input, lambda _: True
         mutation_type = random.choice([0, 1])
-        new_graph = graph.copy()
+        new_graph = overlay(graph)
         if mutation_type == 0:
-            left, right = map(list, nx.bipartite.sets(new_graph))
+            left, right = map(list, GraphFacts.of(new_graph).bipartite_sets)
             u, v = random.choice(left), random.choice(right)
             new_graph.add_edge(u, v)
             return new_graph, input, lambda x: (x >= result)
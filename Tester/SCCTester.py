@@ -5,6 +5,8 @@ import networkx as nx
 
 from Utils.FileUtils import save_discrepancy
 from Utils.GraphConverter import GraphConverter
+from Utils.GraphOverlay import overlay
+from Utils.NumpyReference import MAX_NODES, strongly_connected_components
 from Tester.BaseTester import BaseTester, TestMetamorphism
 
 
@@ -38,6 +40,10 @@ class SCCTesterAlgorithms:
             for component in graph_ig.components(mode="STRONG")
         )
 
+    @staticmethod
+    def numpy(graph: nx.DiGraph):
+        return strongly_connected_components(graph)
+
 
 class SCCTestMetamorphism(TestMetamorphism):
     def mutate(
@@ -63,21 +69,23 @@ class SCCTestMetamorphism(TestMetamorphism):
         ]
         new_graph, new_result = graph, result
         for _ in range(n_compositions):
-            method = random.choice(all_methods)
-            new_graph, new_result = method(new_graph, new_result)
+            method = self.choose(all_methods)
+            new_graph, new_result = self.apply(method, new_graph, new_result)
         return new_graph, new_result
 
     def add_edge_inside_component(self, graph: nx.DiGraph, result: set[frozenset[int]]):
         component = list(random.choice(list(result)))
         start, end = (random.choice(component), random.choice(component))
-        graph_mutated = graph.copy()
+        if graph.has_edge(start, end):
+            return graph, result
+        graph_mutated = overlay(graph)
         graph_mutated.add_edge(start, end)
         return graph_mutated, result
 
     def remove_edge_between_components(
         self, graph: nx.DiGraph, result: set[frozenset[int]]
     ):
-        graph_mutated = graph.copy()
+        graph_mutated = overlay(graph)
         for _ in range(100):
             out_component = random.choice(list(result))
             start_node = random.choice(list(out_component))
@@ -88,12 +96,12 @@ class SCCTestMetamorphism(TestMetamorphism):
                 continue
             graph_mutated.remove_edge(edge[0], edge[1])
             return graph_mutated, result
-        return graph_mutated, result
+        return graph, result
 
     def add_path_inside_component(
         self, graph: nx.DiGraph, result: set[frozenset[int]], max_vertices=5
     ):
-        graph_mutated = graph.copy()
+        graph_mutated = overlay(graph)
         component = random.choice(list(result))
         start, end = (random.choice(list(component)), random.choice(list(component)))
 
@@ -112,7 +120,7 @@ class SCCTestMetamorphism(TestMetamorphism):
         return graph_mutated, new_result
 
     def add_isolated_node(self, graph: nx.DiGraph, result: set[frozenset[int]]):
-        graph_mutated = graph.copy()
+        graph_mutated = overlay(graph)
 
         # create a single new node id after current max
         new_node = max(graph.nodes) + 1
@@ -126,7 +134,7 @@ class SCCTestMetamorphism(TestMetamorphism):
     def add_cycle_component(
         self, graph: nx.DiGraph, result: set[frozenset[int]], max_vertices=5
     ):
-        graph_mutated = graph.copy()
+        graph_mutated = overlay(graph)
 
         n_new_nodes = random.randint(1, max_vertices)
         new_nodes = [max(graph.nodes) + 1 + i for i in range(n_new_nodes)]
@@ -151,6 +159,8 @@ class SCCTestMetamorphism(TestMetamorphism):
 
 
 class SCCTester(BaseTester):
+    decomposable = True
+    node_limits = {"numpy": MAX_NODES}
 
     def __init__(
         self, corpus_path, discrepancy_filename="scc_discrepancy", *args, **kwargs
@@ -161,6 +171,7 @@ class SCCTester(BaseTester):
             "recursive": SCCTesterAlgorithms.recursive,
             "kosaraju": SCCTesterAlgorithms.kosaraju,
             "igraph": SCCTesterAlgorithms.igraph,
+            "numpy": SCCTesterAlgorithms.numpy,
         }
 
     @staticmethod
@@ -1,22 +1,20 @@
+import math
 import random
 from typing import Any
 
 import networkx as nx
 
-from Tester.BaseTester import BaseTester
+from Tester.BaseTester import BaseTester, TestMetamorphism
 from Utils.FileUtils import save_discrepancies, save_discrepancy
 from Utils.GraphConverter import GraphConverter
+from Utils.GraphFacts import GraphFacts
+from Utils.GraphOverlay import overlay
+from Utils.NumpyReference import MAX_NODES, source_distances
 
 
 class STPLTesterAlgorithms:
-    @staticmethod
-    def _set_default_weights(graph: nx.Graph):
-        for _, _, data in graph.edges(data=True):
-            data.setdefault("weight", 1)
-
     @staticmethod
     def bellman_ford_path_length(graph: nx.Graph, source, target):
-        STPLTesterAlgorithms._set_default_weights(graph)
         try:
             return nx.bellman_ford_path_length(
                 graph, source=source, target=target, weight="weight"
@@ -29,7 +27,6 @@ class STPLTesterAlgorithms:
 
     @staticmethod
     def dijkstra_path_length(graph, source, target):
-        STPLTesterAlgorithms._set_default_weights(graph)
         try:
             return nx.dijkstra_path_length(
                 graph, source=source, target=target, weight="weight"
@@ -39,7 +36,6 @@ class STPLTesterAlgorithms:
 
     @staticmethod
     def goldberg_radzik(graph, source, target):
-        STPLTesterAlgorithms._set_default_weights(graph)
         try:
             _, dist = nx.goldberg_radzik(graph, source, weight="weight")
             return dist.get(target, float("inf"))
@@ -49,11 +45,43 @@ class STPLTesterAlgorithms:
             # Negative cycle exists
             return float("-inf")
 
+    @staticmethod
+    def _igraph_weights(graph_ig):
+        # Sanitize edge weights to avoid passing NaN or non-numeric
+        # values into igraph C code (which aborts on NaN).
+        try:
+            raw_weights = graph_ig.es['weight'] if 'weight' in graph_ig.es.attribute_names() else None
+        except Exception:
+            raw_weights = None
+
+        if raw_weights is None:
+            return None
+
+        clean = []
+        for w in raw_weights:
+            # If weight is a list (from consolidated multiedges), pick the minimum
+            if isinstance(w, (list, tuple)) and len(w) > 0:
+                try:
+                    nums = [float(x) for x in w]
+                    val = min(nums)
+                except Exception:
+                    val = 1.0
+            else:
+                try:
+                    val = float(w)
+                except Exception:
+                    val = 1.0
+            # Replace NaN with a large finite weight (treat as effectively absent)
+            if math.isnan(val):
+                val = float('1e300')
+            clean.append(val)
+        return clean
+
     @staticmethod
     def igraph(graph, source, target):
         # Check for negative cycle
         try:
-            if nx.negative_edge_cycle(graph, weight="weight"):
+            if GraphFacts.of(graph).has_negative_cycle:
                 return float("-inf")
         except (nx.NetworkXError, nx.NetworkXUnbounded):
             return float("-inf")
@@ -61,41 +89,12 @@ class STPLTesterAlgorithms:
         if graph.number_of_edges() == 0:
             return float("inf")
 
-        STPLTesterAlgorithms._set_default_weights(graph)
         try:
             converter = GraphConverter(graph)
-            graph_ig = converter.to_igraph()
-            source_ig = graph_ig.vs.find(name=str(source)).index
-            target_ig = graph_ig.vs.find(name=str(target)).index
-            # Sanitize edge weights to avoid passing NaN or non-numeric
-            # values into igraph C code (which aborts on NaN).
-            try:
-                raw_weights = graph_ig.es['weight'] if 'weight' in graph_ig.es.attribute_names() else None
-            except Exception:
-                raw_weights = None
-
-            weights = None
-            if raw_weights is not None:
-                clean = []
-                import math
-                for w in raw_weights:
-                    # If weight is a list (from consolidated multiedges), pick the minimum
-                    if isinstance(w, (list, tuple)) and len(w) > 0:
-                        try:
-                            nums = [float(x) for x in w]
-                            val = min(nums)
-                        except Exception:
-                            val = 1.0
-                    else:
-                        try:
-                            val = float(w)
-                        except Exception:
-                            val = 1.0
-                    # Replace NaN with a large finite weight (treat as effectively absent)
-                    if math.isnan(val):
-                        val = float('1e300')
-                    clean.append(val)
-                weights = clean
+            graph_ig, index = converter.to_igraph_indexed()
+            source_ig = index[source]
+            target_ig = index[target]
+            weights = STPLTesterAlgorithms._igraph_weights(graph_ig)
 
             shortest_paths = graph_ig.shortest_paths(
                 source=source_ig, target=target_ig, weights=weights if weights is not None else "weight"
@@ -108,7 +107,74 @@ class STPLTesterAlgorithms:
             return float("inf")
 
 
-class STPLTestMetamorphism:
+    # Single-source variants: one computation per source answers every target,
+    # returned as a distance vector in the order of `targets`.
+
+    @staticmethod
+    def _distance_vector(distances, targets):
+        return tuple(distances.get(target, float("inf")) for target in targets)
+
+    @staticmethod
+    def bellman_ford_distances(graph, source, targets):
+        try:
+            distances = nx.single_source_bellman_ford_path_length(
+                graph, source, weight="weight"
+            )
+        except (nx.NetworkXNoPath, nx.NetworkXError):
+            return (float("inf"),) * len(targets)
+        except nx.NetworkXUnbounded:
+            return (float("-inf"),) * len(targets)
+        return STPLTesterAlgorithms._distance_vector(distances, targets)
+
+    @staticmethod
+    def dijkstra_distances(graph, source, targets):
+        distances = nx.single_source_dijkstra_path_length(graph, source, weight="weight")
+        return STPLTesterAlgorithms._distance_vector(distances, targets)
+
+    @staticmethod
+    def goldberg_radzik_distances(graph, source, targets):
+        try:
+            _, distances = nx.goldberg_radzik(graph, source, weight="weight")
+        except nx.NetworkXError:
+            return (float("inf"),) * len(targets)
+        except nx.NetworkXUnbounded:
+            # Negative cycle exists
+            return (float("-inf"),) * len(targets)
+        return STPLTesterAlgorithms._distance_vector(distances, targets)
+
+    @staticmethod
+    def igraph_distances(graph, source, targets):
+        try:
+            if GraphFacts.of(graph).has_negative_cycle:
+                return (float("-inf"),) * len(targets)
+        except (nx.NetworkXError, nx.NetworkXUnbounded):
+            return (float("-inf"),) * len(targets)
+
+        if graph.number_of_edges() == 0:
+            return tuple(0 if target == source else float("inf") for target in targets)
+
+        try:
+            converter = GraphConverter(graph)
+            graph_ig, index = converter.to_igraph_indexed()
+            weights = STPLTesterAlgorithms._igraph_weights(graph_ig)
+            distances = graph_ig.distances(
+                source=index[source],
+                target=[index[target] for target in targets],
+                weights=weights if weights is not None else "weight",
+            )
+            return tuple(distances[0])
+        except Exception:
+            return (float("inf"),) * len(targets)
+
+    @staticmethod
+    def numpy_distances(graph, source, targets):
+        return source_distances(graph, source, targets)
+
+    @staticmethod
+    def numpy(graph, source, target):
+        return source_distances(graph, source, (target,))[0]
+
+class STPLTestMetamorphism(TestMetamorphism):
     """Metamorphism implementations for shortest-path-length testing.
 
     Each mutation returns (mutated_graph, new_args, checker) where
@@ -119,10 +185,7 @@ class STPLTestMetamorphism:
     def _source_distances(self, graph: nx.Graph, source):
         try:
             # prefer Dijkstra when no negative weights
-            has_negative = any(
-                data.get("weight", 0) < 0 for _, _, data in graph.edges(data=True)
-            )
-            if has_negative:
+            if GraphFacts.of(graph).has_negative_weight:
                 # may raise if negative cycle present
                 return nx.single_source_bellman_ford_path_length(graph, source, weight="weight")
             else:
@@ -160,9 +223,9 @@ class STPLTestMetamorphism:
                 self._add_short_new_path,
             ]
 
-        method = random.choice(methods)
+        method = self.choose(methods)
         try:
-            return method(graph, source, target, dist, result)
+            return self.apply(method, graph, source, target, dist, result)
         except Exception as e:
             # On any error, return no-op mutation
             print(f"Error in mutation: {e}")
@@ -174,7 +237,7 @@ class STPLTestMetamorphism:
         if dist is None:
             return graph, (source, target), (lambda _: True)
 
-        graph_mut = graph.copy()
+        graph_mut = overlay(graph)
         nodes = [n for n in graph.nodes if n in dist and dist[n] != float("inf")]
         if len(nodes) < 2:
             return graph, (source, target), (lambda new_res: new_res == orig_result)
@@ -206,7 +269,7 @@ class STPLTestMetamorphism:
     def _split_edge(self, graph, source, target, dist, orig_result):
         # pick existing edge (u,v,w) with weight >=1 and replace with u->a (1) and a->v (w-1)
         # This metamorphism works regardless of negative cycles
-        graph_mut = graph.copy()
+        graph_mut = overlay(graph)
         edges = list(graph.edges(data=True))
         random.shuffle(edges)
         for u, v, data in edges:
@@ -253,7 +316,7 @@ class STPLTestMetamorphism:
         if dist is None:
             return graph, (source, target), (lambda _: True)
 
-        graph_mut = graph.copy()
+        graph_mut = overlay(graph)
 
         # If no path exists (orig_result is inf), this might create one
         # If path exists, we add a longer alternative path - distance should not change
@@ -287,7 +350,7 @@ class STPLTestMetamorphism:
         if dist is None:
             return graph, (source, target), (lambda _: True)
 
-        graph_mut = graph.copy()
+        graph_mut = overlay(graph)
 
         # Skip if no valid shorter path can be created
         if orig_result == float("inf") or orig_result == float("-inf") or orig_result <= 2:
@@ -313,6 +376,13 @@ class STPLTestMetamorphism:
 
 
 class STPLTester(BaseTester):
+    # One query is a single-source distance vector in differential mode, a
+    # (source, target) pair in metamorphic mode; calibration measures the same
+    queries_per_test = 10
+    default_weight = 1
+    relabel_nodes = True
+    node_limits = {"numpy": MAX_NODES}
+
     def __init__(
         self, coprus_path, discrepancy_filename="stpl_discrepancy", *args, **kwargs
     ):
@@ -322,35 +392,78 @@ class STPLTester(BaseTester):
             "goldberg_radzik": STPLTesterAlgorithms.goldberg_radzik,
             "dijkstra_path_length": STPLTesterAlgorithms.dijkstra_path_length,
             "igraph": STPLTesterAlgorithms.igraph,
+            "numpy": STPLTesterAlgorithms.numpy,
+        }
+        # Single-source counterparts of self.algorithms, used in differential mode
+        self.distance_algorithms = {
+            "bellman_ford_path_length": STPLTesterAlgorithms.bellman_ford_distances,
+            "goldberg_radzik": STPLTesterAlgorithms.goldberg_radzik_distances,
+            "igraph": STPLTesterAlgorithms.igraph_distances,
+            "dijkstra_path_length": STPLTesterAlgorithms.dijkstra_distances,
+            "numpy": STPLTesterAlgorithms.numpy_distances,
         }
 
+    def calibration_args(self, G):
+        if len(G) < 2:
+            return None
+        return tuple(random.sample(list(G.nodes()), 2))
+
+    def calibration_algorithms(self, prepared, args):
+        if self.test_method != "differential":
+            return super().calibration_algorithms(prepared, args)
+        source, _ = args
+        return (
+            self.applicable_algorithms(prepared, self.distance_pool(prepared)),
+            (source, tuple(prepared.nodes())),
+        )
+
     def test(self, G, timestamp, num_pairs=10):
         total_discrepancies = {}
 
         if len(G) < 2:
             return {}
 
-        for _ in range(num_pairs):
+        # Normalize once, all queries run on the same prepared graph
+        prepared, mapping = self.normalize(G)
+        nodes = list(G.nodes())
+
+        if self.test_method == "differential":
+            # One single-source query per sampled source, compared over every target
+            targets = tuple(prepared.nodes())
+            queries = [
+                (source, targets)
+                for source in self.normalize_args(
+                    random.sample(nodes, min(num_pairs, len(nodes))), mapping
+                )
+            ]
+        elif self.test_method == "metamorphic":
+            queries = [
+                self.normalize_args(random.sample(nodes, 2), mapping)
+                for _ in range(num_pairs)
+            ]
+        else:
+            raise ValueError(f"Unknown test_method: {self.test_method}")
+
+        for query in queries:
             # # Get the degrees of all nodes and sort them in descending order
             # sorted_nodes = sorted(G.nodes(), key=lambda x: G.degree(x), reverse=True)
 
             # # Select the top two nodes with the highest degree as source and target
             # source, target = sorted_nodes[:2]
-            source, target = random.sample(list(G.nodes()), 2)
-
-            # Respect test_method parameter
             if self.test_method == "differential":
-                discrepancy_msg, discrepancy_graph = self.test_algorithms(G, source, target)
-            elif self.test_method == "metamorphic":
+                discrepancy_msg, discrepancy_graph = self.test_distances(
+                    prepared, *query
+                )
+                if discrepancy_graph is prepared:
+                    discrepancy_graph = G
+            else:
                 alg = self.algorithms.get(self.algorithm, None)
                 if alg is None:
                     message = f"Incorrect algorithm name provided: {self.algorithm}"
                     return {message: G}
                 discrepancy_msg, discrepancy_graph = self.test_metamorphic(
-                    G, alg, source, target
+                    prepared, alg, *query
                 )
-            else:
-                raise ValueError(f"Unknown test_method: {self.test_method}")
 
             if discrepancy_msg and len(G.nodes()) < 20:
                 save_discrepancy(
@@ -362,24 +475,46 @@ class STPLTester(BaseTester):
         return total_discrepancies
 
     def test_algorithms(self, G, source, target, exception_result=float("inf")):
-        has_negative_weight = any(
-            data.get("weight", 0) < 0 for _, _, data in G.edges(data=True)
-        )
+        facts = GraphFacts.of(G)
         self.algorithms = {
             "bellman_ford_path_length": STPLTesterAlgorithms.bellman_ford_path_length,
             "goldberg_radzik": STPLTesterAlgorithms.goldberg_radzik,
             "igraph": STPLTesterAlgorithms.igraph,
         }
         # Include Dijkstra's algorithm if there are no negative weights
-        if not has_negative_weight:
+        if not facts.has_negative_weight:
             self.algorithms["dijkstra_path_length"] = (
                 STPLTesterAlgorithms.dijkstra_path_length
             )
+        if not facts.has_nan_weight:
+            self.algorithms["numpy"] = STPLTesterAlgorithms.numpy
 
         return super().test_algorithms(
             G, source, target, exception_result=exception_result
         )
 
+    def distance_pool(self, G):
+        """The single-source implementations that are an oracle on G."""
+        facts = GraphFacts.of(G)
+        pool = dict(self.distance_algorithms)
+        # Dijkstra's algorithm is only an oracle without negative weights
+        if facts.has_negative_weight:
+            del pool["dijkstra_path_length"]
+        # NaN has no min-plus semantics that match networkx
+        if facts.has_nan_weight:
+            del pool["numpy"]
+        return pool
+
+    def test_distances(self, G, source, targets):
+        """Compare the distance vectors from source to all targets across implementations."""
+        return super().test_algorithms(
+            G,
+            source,
+            targets,
+            exception_result=(float("inf"),) * len(targets),
+            pool=self.distance_pool(G),
+        )
+
     def run(self):
         """Test shortest path length algorithms on every graph in the corpus."""
         discrepancy_data = []
@@ -60,19 +60,30 @@ def save_discrepancy(discrepancy_data, file_path, max_discrepancies_per_msg=100)
         pickle.dump(existing_discrepancy_data, f)
 
 
-def save_exception_graphs(exception_graphs, prefix):
-    """Saves the exception graphs to a pickle file with a given prefix."""
+def exception_log_path(prefix):
+    """Path of the append-only exception graph log with a given prefix."""
     script_dir = os.path.dirname(os.path.abspath(__file__))
     parent_dir = os.path.dirname(script_dir)
     log_dir = os.path.join(parent_dir, "Log")
 
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
-    filename = f"{prefix}_exceptions.pkl"
-    file_path = os.path.join(log_dir, filename)
-    with open(file_path, "wb") as file:
-        pickle.dump(exception_graphs, file)
-    print(f"Exception graphs saved to {file_path}")
+    return os.path.join(log_dir, f"{prefix}_exceptions.log")
+
+
+def load_exception_log(file_path):
+    """Read back the (signature, message, graph, timestamp) records of an exception graph log.
+
+    A record cut short by a killed run ends the log.
+    """
+    records = []
+    with open(file_path, "rb") as f:
+        while True:
+            try:
+                records.append(pickle.load(f))
+            except (EOFError, pickle.UnpicklingError):
+                break
+    return records
 
 
 # def update_coveragerc(filepaths):
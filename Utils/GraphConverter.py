@@ -1,7 +1,11 @@
 import random
+from itertools import chain
 
 import networkx as nx
 import igraph as ig
+import numpy as np
+
+from Utils.GraphFacts import GraphFacts
 
 
 class GraphConverter:
@@ -25,53 +29,77 @@ class GraphConverter:
             ig.plot(igraph_graph, **visual_style)
 
     def to_igraph(self):
-        # Create a new iGraph graph instance
-        igraph_graph = ig.Graph(directed=self.networkx_graph.is_directed())
-
-        # Add vertices
-        for node in self.networkx_graph.nodes():
-            igraph_graph.add_vertex(name=str(node))
-
-        # Handle MultiGraph: consolidating multiple edges
-        if isinstance(self.networkx_graph, nx.MultiGraph) or isinstance(self.networkx_graph, nx.MultiDiGraph):
-            edge_attrs = {}
-            for u, v, key, data in self.networkx_graph.edges(keys=True, data=True):
-                # Use a tuple of nodes as a key for edge attributes
-                edge_key = (u, v)
-
-                # Initialize the list of attributes for this edge
-                if edge_key not in edge_attrs:
-                    edge_attrs[edge_key] = {'weight': []}
-
-                # Append the weight of the current edge
-                edge_attrs[edge_key]['weight'].append(data.get('weight', 1))
-
-            # Add consolidated edges to iGraph
-            for edge_key, attrs in edge_attrs.items():
-                igraph_graph.add_edge(edge_key[0], edge_key[1])
-                for attr_name, attr_list in attrs.items():
-                    igraph_graph.es[-1][attr_name] = attr_list
+        graph_ig, _ = self.to_igraph_indexed()
+        return graph_ig
+
+    def to_igraph_indexed(self):
+        """Convert to igraph and return (igraph graph, node -> vertex index mapping).
+
+        The conversion is memoized on the networkx graph until it is mutated,
+        every call hands out a fresh copy that callers may modify.
+        """
+        graph_ig, index = GraphFacts.of(self.networkx_graph).cached(
+            "igraph", self._build_igraph
+        )
+        return graph_ig.copy(), index
+
+    @staticmethod
+    def remember(networkx_graph, graph_ig, index):
+        """Memoize a conversion built elsewhere, e.g. straight from shared arrays."""
+        GraphFacts.of(networkx_graph).cached("igraph", lambda _: (graph_ig, index))
+
+    @staticmethod
+    def _edge_array(edges, index, identity):
+        if not edges:
+            return np.empty((0, 2), dtype=np.int64)
+        if identity:
+            return np.array(edges, dtype=np.int64)
+        return np.fromiter(
+            map(index.__getitem__, chain.from_iterable(edges)),
+            dtype=np.int64,
+            count=2 * len(edges),
+        ).reshape(-1, 2)
+
+    @staticmethod
+    def _build_igraph(graph):
+        nodes = list(graph.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        # Nodes already labelled 0..n-1 in order need no lookups
+        identity = all(
+            isinstance(node, int) and node == i for i, node in enumerate(nodes)
+        )
+
+        if graph.is_multigraph():
+            # Consolidate parallel edges into one igraph edge with the list of their weights
+            consolidated = {}
+            for u, v, weight in graph.edges(data="weight", default=1):
+                consolidated.setdefault((u, v), []).append(weight)
+            edges = list(consolidated)
+            weights = list(consolidated.values())
         else:
-            # Prepare a list of edges with vertex indices in iGraph
-            edges_with_indices = [(igraph_graph.vs.find(name=str(u)).index, igraph_graph.vs.find(name=str(v)).index) for
-                                  u, v in self.networkx_graph.edges()]
-
-            # Add edges to iGraph by indices
-            igraph_graph.add_edges(edges_with_indices)
-
-            # Transfer edge attributes
-            if self.networkx_graph.edges(data=True):
-                igraph_graph.es['weight'] = [
-                    self.networkx_graph[u][v]['weight'] if 'weight' in self.networkx_graph[u][v] else 1 for u, v in
-                    self.networkx_graph.edges()]
-
-        # Transfer node attributes
-        for node in self.networkx_graph.nodes():
-            ig_node = igraph_graph.vs.find(name=str(node))
-            for attr_name, attr_value in self.networkx_graph.nodes[node].items():
-                ig_node[attr_name] = attr_value
-
-        return igraph_graph
+            edges = list(graph.edges())
+            weights = [weight for _, _, weight in graph.edges(data="weight", default=1)]
+
+        graph_ig = ig.Graph(
+            n=len(nodes),
+            edges=GraphConverter._edge_array(edges, index, identity),
+            directed=graph.is_directed(),
+        )
+        if nodes:
+            graph_ig.vs["name"] = [str(node) for node in nodes]
+        if edges:
+            graph_ig.es["weight"] = weights
+
+        # Transfer node attributes, vertices without an attribute get None
+        attr_names = set()
+        for _, data in graph.nodes(data=True):
+            attr_names.update(data)
+        for attr_name in attr_names:
+            graph_ig.vs[attr_name] = [
+                data.get(attr_name) for _, data in graph.nodes(data=True)
+            ]
+
+        return graph_ig, index
 
     def to_igraph_default(self):
         return ig.Graph.from_networkx(self.networkx_graph)
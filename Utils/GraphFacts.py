@@ -0,0 +1,132 @@
+import math
+import threading
+import weakref
+
+import networkx as nx
+
+
+class GraphFacts:
+    """Structural properties of one graph, computed lazily and at most once.
+
+    Facts are cached per graph object and stamped with the graph's number of
+    nodes and edges and its mutation version. Any change to the stamp drops
+    the cached facts. Mutations that keep both counts, e.g. weight changes,
+    must bump the version with GraphFacts.touch(graph). Copies of a graph
+    start with an empty cache.
+
+    Fingerprinting the edge data instead would cost a pass over all edges on
+    every lookup, so in-place mutation of a graph whose facts may have been
+    read goes through the mutators, which touch it; metamorphic relations
+    mutate copies or overlays. Without touch() the weight facts
+    (has_*_weight, has_negative_cycle) and the values cached through
+    cached() go stale: the igraph conversion of GraphConverter, the
+    distance matrix and node index of NumpyReference and the residual
+    network of the MAXFV tester. ParallelTestPool reuses a graph shared
+    with its workers while the stamp is unchanged.
+    """
+
+    _cache = weakref.WeakKeyDictionary()
+    _versions = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+
+    def __init__(self, graph, stamp):
+        # A weak reference, so the cache never keeps a graph alive
+        self._graph_ref = weakref.ref(graph)
+        self.stamp = stamp
+        self._values = {}
+
+    @classmethod
+    def _stamp(cls, graph):
+        return (
+            cls._versions.get(graph, 0),
+            graph.number_of_nodes(),
+            graph.number_of_edges(),
+        )
+
+    @classmethod
+    def of(cls, graph):
+        with cls._lock:
+            stamp = cls._stamp(graph)
+            facts = cls._cache.get(graph)
+            if facts is None or facts.stamp != stamp:
+                facts = cls(graph, stamp)
+                cls._cache[graph] = facts
+            return facts
+
+    @classmethod
+    def touch(cls, graph):
+        """Mark the graph as mutated, invalidating its cached facts."""
+        with cls._lock:
+            cls._versions[graph] = cls._versions.get(graph, 0) + 1
+
+    @property
+    def graph(self):
+        return self._graph_ref()
+
+    def cached(self, key, compute):
+        """Return compute(graph), computed on first use; exceptions are raised and not cached."""
+        if key not in self._values:
+            self._values[key] = compute(self.graph)
+        return self._values[key]
+
+    @property
+    def is_connected(self):
+        return self.cached("is_connected", nx.is_connected)
+
+    @property
+    def is_bipartite(self):
+        return self.cached("is_bipartite", nx.is_bipartite)
+
+    @property
+    def bipartite_sets(self):
+        return self.cached("bipartite_sets", nx.bipartite.sets)
+
+    @property
+    def degree_order(self):
+        """Nodes sorted by degree, highest first (ties keep node order)."""
+        return self.cached(
+            "degree_order",
+            lambda graph: sorted(graph.nodes(), key=graph.degree, reverse=True),
+        )
+
+    @staticmethod
+    def _weight_flags(graph):
+        has_missing = has_negative = has_nonpositive = has_nan = False
+        for _, _, weight in graph.edges(data="weight"):
+            if weight is None:
+                has_missing = True
+            elif isinstance(weight, float) and math.isnan(weight):
+                has_nan = True
+            elif weight <= 0:
+                has_nonpositive = True
+                has_negative = has_negative or weight < 0
+        return {
+            "missing": has_missing,
+            "negative": has_negative,
+            "nonpositive": has_nonpositive,
+            "nan": has_nan,
+        }
+
+    @property
+    def has_missing_weight(self):
+        return self.cached("weight_flags", self._weight_flags)["missing"]
+
+    @property
+    def has_negative_weight(self):
+        return self.cached("weight_flags", self._weight_flags)["negative"]
+
+    @property
+    def has_nonpositive_weight(self):
+        return self.cached("weight_flags", self._weight_flags)["nonpositive"]
+
+    @property
+    def has_nan_weight(self):
+        return self.cached("weight_flags", self._weight_flags)["nan"]
+
+    @property
+    def has_negative_cycle(self):
+        # A negative cycle needs at least one negative weight
+        return self.has_negative_weight and self.cached(
+            "has_negative_cycle",
+            lambda graph: nx.negative_edge_cycle(graph, weight="weight"),
+        )
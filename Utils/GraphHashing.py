@@ -0,0 +1,15 @@
+from Feedback.NoveltyStore import stable_hash
+
+
+def graph_fingerprint(graph):
+    """Stable 64-bit hash of the node set, edge set and edge weights, used to skip duplicate executions."""
+    directed = graph.is_directed()
+    edges = []
+    for u, v, weight in graph.edges(data="weight"):
+        endpoints = (repr(u), repr(v))
+        if not directed:
+            endpoints = tuple(sorted(endpoints))
+        edges.append((endpoints, repr(weight)))
+    edges.sort()
+    nodes = sorted(repr(node) for node in graph.nodes())
+    return stable_hash((directed, graph.is_multigraph(), tuple(nodes), tuple(edges)))
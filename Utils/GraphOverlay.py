@@ -0,0 +1,300 @@
+from collections.abc import MutableMapping
+from functools import cached_property
+from typing import Optional
+
+import networkx as nx
+from networkx.classes.coreviews import AdjacencyView, AtlasView
+
+
+class _OverlayMap(MutableMapping):
+    """A dict layered over a base mapping that is never modified.
+
+    Writes and deletions are kept in `added` and `removed`. Values read
+    through [] or get() are copied into `added` first (copy-on-read), so
+    networkx can update them in place, e.g. the edge data dict in
+    add_edge, without touching the base. Iteration hands out base values
+    as they are, and membership tests read no value.
+    """
+
+    __slots__ = ("base", "added", "removed")
+
+    def __init__(self, base, added=None, removed=None):
+        self.base = base
+        self.added = {} if added is None else added
+        self.removed = set() if removed is None else removed
+
+    def _copy_value(self, key, value):
+        return dict(value)
+
+    def __getitem__(self, key):
+        if key in self.added:
+            return self.added[key]
+        if key in self.removed:
+            raise KeyError(key)
+        value = self._copy_value(key, self.base[key])
+        self.added[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self.added[key] = value
+        self.removed.discard(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.added.pop(key, None)
+        if key in self.base:
+            self.removed.add(key)
+
+    def __contains__(self, key):
+        return key in self.added or (key not in self.removed and key in self.base)
+
+    def __iter__(self):
+        for key in self.base:
+            if key not in self.removed:
+                yield key
+        # Reads while iterating copy base values into added
+        for key in list(self.added):
+            if key not in self.base:
+                yield key
+
+    def __len__(self):
+        return (
+            len(self.base)
+            - len(self.removed)
+            + sum(1 for key in self.added if key not in self.base)
+        )
+
+    def items(self):
+        if not self.added and not self.removed:
+            return self.base.items()
+        return [
+            (key, self.added[key] if key in self.added else self.base[key]) for key in self
+        ]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def copy_delta(self, memo):
+        """A new overlay over the same base with its own copy of the delta.
+
+        memo maps the id of every data dict copied so far to its copy, so that
+        dicts shared by both directions of an edge stay shared in the copy.
+        """
+        added = {key: self._copy_delta_value(value, memo) for key, value in self.added.items()}
+        return self.__class__(self.base, added, set(self.removed))
+
+    def _copy_delta_value(self, value, memo):
+        if id(value) not in memo:
+            memo[id(value)] = dict(value)
+        return memo[id(value)]
+
+
+class _OverlayNeighbours(_OverlayMap):
+    """Overlay of the neighbour dict of node, whose values are edge data dicts.
+
+    networkx shares one data dict between G[u][v] and G[v][u] (or succ and
+    pred), so a data dict copied on read is installed in the reverse
+    adjacency as well.
+    """
+
+    __slots__ = ("node", "reverse")
+
+    def __init__(self, base, added=None, removed=None, node=None, reverse=None):
+        super().__init__(base, added, removed)
+        self.node = node
+        self.reverse = reverse
+
+    def _copy_value(self, key, value):
+        value = dict(value)
+        mirror = self.reverse[key] if self.reverse is not None else None
+        if isinstance(mirror, _OverlayMap) and mirror is not self:
+            mirror.added[self.node] = value
+        return value
+
+    def copy_delta(self, memo):
+        added = {key: self._copy_delta_value(value, memo) for key, value in self.added.items()}
+        return _OverlayNeighbours(self.base, added, set(self.removed), self.node)
+
+
+class _OverlayAdjacency(_OverlayMap):
+    """Outer adjacency mapping, whose values are overlays of the base neighbour dicts.
+
+    reverse is the adjacency holding the other direction of every edge: the
+    adjacency itself for undirected graphs, pred for succ and vice versa.
+    """
+
+    __slots__ = ("reverse",)
+
+    def __init__(self, base, added=None, removed=None):
+        super().__init__(base, added, removed)
+        self.reverse = None
+
+    def _copy_value(self, key, value):
+        return _OverlayNeighbours(value, node=key, reverse=self.reverse)
+
+    def _copy_delta_value(self, value, memo):
+        if isinstance(value, _OverlayMap):
+            return value.copy_delta(memo)
+        return {neighbour: super()._copy_delta_value(data, memo) for neighbour, data in value.items()}
+
+    def link(self, reverse):
+        """Set the reverse adjacency, of this map and of the neighbour overlays it holds."""
+        self.reverse = reverse
+        for value in self.added.values():
+            if isinstance(value, _OverlayNeighbours):
+                value.reverse = reverse
+
+
+class _OverlayAtlasView(AtlasView):
+    """AtlasView whose membership test does not read the value.
+
+    Mapping.__contains__ calls __getitem__, which copies the value into
+    the overlay, e.g. on every `w in G[v]` in nx.common_neighbors.
+    """
+
+    __slots__ = ()
+
+    def __contains__(self, key):
+        return key in self._atlas
+
+
+class _OverlayAdjacencyView(AdjacencyView, _OverlayAtlasView):
+    __slots__ = ()
+
+    def __getitem__(self, name):
+        return _OverlayAtlasView(self._atlas[name])
+
+
+class _Overlay:
+    """Graph whose node and adjacency dicts are overlays of a base graph.
+
+    It is a regular networkx graph to every algorithm, and mutations through
+    the graph API (add_edge, remove_node, ...) only change the small delta.
+    A node or edge that is removed and added again keeps its place in the
+    iteration order, where a copy would move it to the end.
+    Node and edge data of the base must not be modified in place through
+    iteration, e.g. `for _, _, d in G.edges(data=True): d["weight"] = 0`.
+    Without a base (e.g. when networkx calls G.__class__()) it is an
+    ordinary empty graph.
+    """
+
+    def __init__(self, incoming_graph_data=None, base=None, **attr):
+        super().__init__(incoming_graph_data, **attr)
+        self.base = base
+        if base is not None:
+            self.graph = dict(base.graph)
+            self._node = _OverlayMap(base._node)
+            self._adj = _OverlayAdjacency(base._adj)
+            if base.is_directed():
+                self._succ = self._adj
+                self._pred = _OverlayAdjacency(base._pred)
+            self._link()
+
+    @cached_property
+    def adj(self):
+        return _OverlayAdjacencyView(self._adj)
+
+    def _link(self):
+        if self.is_directed():
+            self._succ.link(self._pred)
+            self._pred.link(self._succ)
+        else:
+            self._adj.link(self._adj)
+
+    def materialize(self) -> nx.Graph:
+        """A real graph of the base's class with the same content, built in O(n + m)."""
+        graph = (nx.DiGraph if self.is_directed() else nx.Graph)()
+        graph.graph.update(self.graph)
+        graph.add_nodes_from((node, dict(data)) for node, data in self._node.items())
+        graph.add_edges_from((u, v, dict(data)) for u, v, data in self.edges(data=True))
+        return graph
+
+    def delta(self) -> tuple:
+        """The changes against the base as (removed nodes, removed edges, nodes, edges).
+
+        Applying them to the base with apply_delta() reproduces this graph;
+        they are small and cheap to pickle.
+        """
+        removed_nodes = list(self._node.removed)
+        nodes = [(node, dict(data)) for node, data in self._node.added.items()]
+        removed_edges = []
+        edges = []
+        for u, neighbours in self._adj.added.items():
+            if isinstance(neighbours, _OverlayMap):
+                removed_edges.extend((u, v) for v in neighbours.removed)
+                edges.extend((u, v, dict(data)) for v, data in neighbours.added.items())
+            else:
+                # A base node that was removed and added again lost all its edges
+                removed_edges.extend((u, v) for v in self._adj.base.get(u, ()))
+                edges.extend((u, v, dict(data)) for v, data in neighbours.items())
+        if self.is_directed():
+            for v, predecessors in self._pred.added.items():
+                if isinstance(predecessors, _OverlayMap):
+                    removed_edges.extend((u, v) for u in predecessors.removed)
+                else:
+                    removed_edges.extend((u, v) for u in self._pred.base.get(v, ()))
+        return removed_nodes, removed_edges, nodes, edges
+
+
+class GraphOverlay(_Overlay, nx.Graph):
+    pass
+
+
+class DiGraphOverlay(_Overlay, nx.DiGraph):
+    @cached_property
+    def succ(self):
+        return _OverlayAdjacencyView(self._succ)
+
+    @cached_property
+    def pred(self):
+        return _OverlayAdjacencyView(self._pred)
+
+
+def overlay(graph: nx.Graph) -> nx.Graph:
+    """A mutable copy of graph that shares its unchanged part with graph.
+
+    An overlay of an overlay shares the same base with a copy of the delta.
+    Multigraphs get a real copy.
+    """
+    if isinstance(graph, _Overlay) and graph.base is not None:
+        view = graph.__class__(base=graph.base)
+        view.graph = dict(graph.graph)
+        memo = {}
+        view._node = graph._node.copy_delta(memo)
+        view._adj = graph._adj.copy_delta(memo)
+        if graph.is_directed():
+            view._succ = view._adj
+            view._pred = graph._pred.copy_delta(memo)
+        view._link()
+        return view
+    if graph.is_multigraph():
+        return graph.copy()
+    return (DiGraphOverlay if graph.is_directed() else GraphOverlay)(base=graph)
+
+
+def delta_against(base: nx.Graph, graph: nx.Graph) -> Optional[tuple]:
+    """The delta of graph against base, if graph is base itself or an overlay of it, else None."""
+    if graph is base:
+        return [], [], [], []
+    if isinstance(graph, _Overlay) and graph.base is base:
+        return graph.delta()
+    return None
+
+
+def materialize(graph: nx.Graph) -> nx.Graph:
+    """graph itself, or a real graph with its content if it is an overlay, e.g. to pickle it."""
+    if isinstance(graph, _Overlay):
+        return graph.materialize()
+    return graph
+
+
+def apply_delta(graph: nx.Graph, delta: tuple) -> nx.Graph:
+    """Overlay of graph with a delta taken from another overlay of the same graph."""
+    removed_nodes, removed_edges, nodes, edges = delta
+    view = overlay(graph)
+    view.remove_edges_from(edge for edge in removed_edges if view.has_edge(*edge))
+    view.remove_nodes_from(removed_nodes)
+    view.add_nodes_from(nodes)
+    view.add_edges_from(edges)
+    return view
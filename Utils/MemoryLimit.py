@@ -0,0 +1,39 @@
+import os
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def address_space_size():
+    """Current virtual memory size of this process in bytes, None where it cannot be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def can_limit_address_space():
+    return resource is not None and address_space_size() is not None
+
+
+def limit_address_space(extra_bytes):
+    """Cap this process' address space (RLIMIT_AS) at its current size plus extra_bytes.
+
+    Allocations beyond the cap raise MemoryError instead of exhausting the
+    machine. Processes spawned afterwards inherit the cap. Returns whether
+    the limit could be set.
+    """
+    if resource is None:
+        return False
+    size = address_space_size()
+    if size is None:
+        return False
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = size + extra_bytes
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    return True
@@ -0,0 +1,185 @@
+import networkx as nx
+import numpy as np
+
+from Utils.GraphFacts import GraphFacts
+
+# Dense references take O(n^2) memory and up to O(n^3) time, testers leave
+# them out on larger graphs
+MAX_NODES = 200
+
+
+def node_index(graph: nx.Graph) -> dict:
+    """Position of every node in graph.nodes(), the row/column order of all matrices below."""
+    return GraphFacts.of(graph).cached(
+        "node_index", lambda g: {node: i for i, node in enumerate(g)}
+    )
+
+
+def adjacency_matrix(graph: nx.Graph) -> np.ndarray:
+    """Dense 0/1 adjacency matrix of a simple undirected graph; self-loops are on the diagonal."""
+    index = node_index(graph)
+    adjacency = np.zeros((len(index), len(index)))
+    if graph.number_of_edges():
+        edges = np.array(
+            [(index[u], index[v]) for u, v in graph.edges()], dtype=np.int64
+        )
+        adjacency[edges[:, 0], edges[:, 1]] = 1
+        adjacency[edges[:, 1], edges[:, 0]] = 1
+    return adjacency
+
+
+def _common_neighbours(adjacency: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    # Weighted count of common neighbours w of (u, v), excluding w in {u, v} as
+    # networkx does: those terms are A[u,u]*A[u,v] and A[u,v]*A[v,v]
+    loops = np.diag(adjacency) * weights
+    common = (adjacency * weights) @ adjacency
+    common -= adjacency * (loops[:, None] + loops[None, :])
+    np.fill_diagonal(common, 0)
+    return common
+
+
+def adamic_adar_matrix(graph: nx.Graph) -> np.ndarray:
+    """Adamic-Adar index of every node pair as A·D⁻¹·A with D = diag(log(degree))."""
+    adjacency = adjacency_matrix(graph)
+    # Degrees count self-loops twice; a common neighbour always has degree >= 2
+    degree = adjacency.sum(axis=1) + np.diag(adjacency)
+    with np.errstate(divide="ignore"):
+        weights = np.where(degree > 1, 1 / np.log(np.maximum(degree, 2)), 0.0)
+    return _common_neighbours(adjacency, weights)
+
+
+def jaccard_matrix(graph: nx.Graph) -> np.ndarray:
+    """Jaccard coefficient of every node pair, 0 where both neighbourhoods are empty."""
+    adjacency = adjacency_matrix(graph)
+    common = _common_neighbours(adjacency, np.ones(len(adjacency)))
+    neighbours = adjacency.sum(axis=1)
+    union = neighbours[:, None] + neighbours[None, :] - adjacency @ adjacency
+    similarity = np.divide(common, union, out=np.zeros_like(common), where=union > 0)
+    np.fill_diagonal(similarity, 0)
+    return similarity
+
+
+def pair_matrix(graph: nx.Graph, scores) -> np.ndarray:
+    """Symmetric matrix from (u, v, score) triples, e.g. a networkx link prediction result."""
+    index = node_index(graph)
+    matrix = np.zeros((len(index), len(index)))
+    scores = list(scores)
+    if scores:
+        rows = np.fromiter((index[u] for u, _, _ in scores), dtype=np.int64, count=len(scores))
+        cols = np.fromiter((index[v] for _, v, _ in scores), dtype=np.int64, count=len(scores))
+        values = np.fromiter((score for _, _, score in scores), dtype=float, count=len(scores))
+        matrix[rows, cols] = values
+        matrix[cols, rows] = values
+    return matrix
+
+
+def reindexed(matrix, index: dict, graph: nx.Graph) -> np.ndarray:
+    """Reorder a square matrix whose rows follow index (node -> row) to graph.nodes() order."""
+    order = [index[node] for node in graph]
+    matrix = np.asarray(matrix, dtype=float).reshape(len(index), len(index))
+    return matrix[np.ix_(order, order)]
+
+
+def distance_matrix(graph: nx.Graph, weight="weight", default=1) -> np.ndarray:
+    """All-pairs shortest path lengths by Floyd-Warshall on min-plus matrix products.
+
+    Unreachable pairs are inf. With a negative cycle the result is not a
+    distance, but every node on the cycle has a negative diagonal entry.
+    Memoized on the graph like GraphFacts.
+    """
+    return GraphFacts.of(graph).cached(
+        ("distance_matrix", weight, default),
+        lambda g: _floyd_warshall(g, weight, default),
+    )
+
+
+def _floyd_warshall(graph, weight, default):
+    index = node_index(graph)
+    n = len(index)
+    distances = np.full((n, n), np.inf)
+    edges = list(graph.edges(data=weight, default=default))
+    if edges:
+        rows = np.fromiter((index[u] for u, _, _ in edges), dtype=np.int64, count=len(edges))
+        cols = np.fromiter((index[v] for _, v, _ in edges), dtype=np.int64, count=len(edges))
+        weights = np.fromiter((w for _, _, w in edges), dtype=float, count=len(edges))
+        # Parallel edges keep their lightest weight
+        np.minimum.at(distances, (rows, cols), weights)
+        if not graph.is_directed():
+            np.minimum.at(distances, (cols, rows), weights)
+    diagonal = np.arange(n)
+    distances[diagonal, diagonal] = np.minimum(distances[diagonal, diagonal], 0)
+    # fmin ignores the NaN of inf + (-inf) once a negative cycle diverges
+    with np.errstate(invalid="ignore", over="ignore"):
+        for k in range(n):
+            distances = np.fmin(distances, distances[:, k, None] + distances[None, k, :])
+    return distances
+
+
+def source_distances(graph: nx.Graph, source, targets) -> tuple:
+    """Distances from source to targets, all -inf if source reaches a negative cycle."""
+    index = node_index(graph)
+    distances = distance_matrix(graph)
+    row = distances[index[source]]
+    if (np.diag(distances)[row < np.inf] < 0).any():
+        return (float("-inf"),) * len(targets)
+    return tuple(row[[index[target] for target in targets]].tolist())
+
+
+def harmonic_centrality(graph: nx.Graph) -> dict:
+    """Harmonic centrality over weighted distances, summing 1/d(v, u) into u."""
+    distances = distance_matrix(graph)
+    with np.errstate(divide="ignore"):
+        inverse = np.where(distances > 0, 1 / distances, 0.0)
+    return dict(zip(graph, inverse.sum(axis=0).tolist()))
+
+
+def strongly_connected_components(graph: nx.DiGraph) -> set:
+    """Strongly connected components from the transitive closure of the adjacency matrix."""
+    index = node_index(graph)
+    n = len(index)
+    if n == 0:
+        return set()
+    reach = np.eye(n, dtype=bool)
+    edges = [(index[u], index[v]) for u, v in graph.edges()]
+    if edges:
+        edges = np.array(edges, dtype=np.int64)
+        reach[edges[:, 0], edges[:, 1]] = True
+    # Squaring doubles the path length covered, log2(n) rounds reach the closure
+    while True:
+        closure = reach @ reach
+        if (closure == reach).all():
+            break
+        reach = closure
+    nodes = np.array(list(graph), dtype=object)
+    mutual = reach & reach.T
+    return {frozenset(nodes[row].tolist()) for row in np.unique(mutual, axis=0)}
+
+
+def spanning_forest_weight(graph: nx.Graph, weight="weight", default=1):
+    """Weight of a minimum spanning forest by Kruskal over a numpy argsort of the edges."""
+    index = node_index(graph)
+    edges = list(graph.edges(data=weight, default=default))
+    if not edges:
+        return 0
+    order = np.argsort(
+        np.fromiter((w for _, _, w in edges), dtype=float, count=len(edges)),
+        kind="stable",
+    )
+    parent = list(range(len(index)))
+
+    def find(node):
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    total = 0
+    for i in order.tolist():
+        u, v, w = edges[i]
+        root_u, root_v = find(index[u]), find(index[v])
+        if root_u != root_v:
+            parent[root_u] = root_v
+            total += w
+    return total
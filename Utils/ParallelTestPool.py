@@ -0,0 +1,230 @@
+import multiprocessing
+import os
+import pickle
+import time
+import weakref
+
+import networkx as nx
+
+from Utils.GraphFacts import GraphFacts
+from Utils.GraphOverlay import apply_delta, delta_against
+from Utils.MemoryLimit import limit_address_space
+from Utils.SharedGraph import SharedGraph, SharedGraphRing
+
+# The graph last rebuilt by this worker, so that the implementations of one
+# comparison, and further queries on the same graph, share one copy
+_worker_graph = (None, None)
+# Address space in bytes each task may add to this worker, None for no limit
+_memory_limit = None
+
+
+def _run_local(graph, algo_func, args):
+    start = time.perf_counter()
+    try:
+        return "ok", algo_func(graph, *args), time.perf_counter() - start
+    except Exception as e:
+        return "error", f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+
+def _set_memory_limit(memory_limit):
+    global _memory_limit
+    _memory_limit = memory_limit
+
+
+def _limit_memory():
+    # Measured per task, once the graph and the implementation's modules are loaded
+    if _memory_limit is not None:
+        limit_address_space(_memory_limit)
+
+
+def _load(handle):
+    global _worker_graph
+    if _worker_graph[0] != handle:
+        _worker_graph = (handle, SharedGraph.load(handle))
+    return _worker_graph[1]
+
+
+def _run_implementation(handle, algo_func, args):
+    graph = _load(handle)
+    _limit_memory()
+    return _run_local(graph, algo_func, args)
+
+
+def _run_try(handle, algo_func, delta, args):
+    graph = apply_delta(_load(handle), delta)
+    _limit_memory()
+    return _run_local(graph, algo_func, args)
+
+
+class ParallelTestPool:
+    """Persistent worker processes running the implementations of one comparison side by side.
+
+    The graph is written once to a shared memory ring that the workers keep
+    attached, they rebuild it from there given its offset. Only the
+    implementation, its arguments and the result are pickled. Graphs that do
+    not fit the ring get a shared memory block of their own.
+    Implementations that cannot be pickled run in the calling process while
+    the workers are busy.
+    Metamorphic tries on overlays of the graph (see Utils.GraphOverlay) only
+    send their delta, which the workers apply to their copy of the graph.
+    With memory_limit (bytes), a worker caps its address space at its size
+    before each task plus memory_limit; an implementation going beyond fails
+    with a MemoryError.
+    """
+
+    def __init__(self, processes=None, ring_capacity=64 * 2**20, memory_limit=None):
+        self.processes = processes or os.cpu_count()
+        self.ring_capacity = ring_capacity
+        self.memory_limit = memory_limit
+        self._pool = None
+        self._ring = None
+        # The shared copy of the graph tested last, reused while it is unchanged:
+        # its handle, and its own block when it is not in the ring
+        self._shared = None
+        self._shared_block = None
+        self._shared_key = None
+        self._picklable = {}
+        self.num_restarts = 0
+
+    def _get_pool(self):
+        if self._pool is None:
+            # Workers are spawned, forking the multithreaded fuzzer is unsafe
+            context = multiprocessing.get_context("spawn")
+            if self.memory_limit is None:
+                self._pool = context.Pool(self.processes)
+            else:
+                self._pool = context.Pool(
+                    self.processes,
+                    initializer=_set_memory_limit,
+                    initargs=(self.memory_limit,),
+                )
+        return self._pool
+
+    def _share(self, graph):
+        key = (weakref.ref(graph), GraphFacts.of(graph).stamp)
+        if self._shared is None or self._shared_key != key:
+            self._release()
+            if self._ring is None:
+                self._ring = SharedGraphRing(self.ring_capacity)
+            try:
+                self._shared = self._ring.put(graph)
+            except ValueError:
+                # Too large for the ring, or not shareable at all (raises again)
+                self._shared_block = SharedGraph(graph)
+                self._shared = self._shared_block.handle
+            self._shared_key = key
+        return self._shared
+
+    def _release(self):
+        if self._shared_block is not None:
+            self._shared_block.close()
+        elif self._shared is not None:
+            self._ring.release(self._shared)
+        self._shared = None
+        self._shared_block = None
+        self._shared_key = None
+
+    def _is_picklable(self, algo_func):
+        if algo_func not in self._picklable:
+            try:
+                pickle.dumps(algo_func)
+                self._picklable[algo_func] = True
+            except Exception:
+                self._picklable[algo_func] = False
+        return self._picklable[algo_func]
+
+    def run(self, graph: nx.Graph, args: tuple, algorithms: dict, deadline: float):
+        """Run every implementation on graph within deadline seconds.
+
+        Returns a dict mapping each implementation to (status, value, latency),
+        where status is "ok" with the result as value, "error" with the
+        exception as value, or "timeout". Returns None if the graph cannot be
+        shared, the caller then runs the implementations itself.
+        """
+        try:
+            handle = self._share(graph)
+        except ValueError:
+            return None
+
+        pool = self._get_pool()
+        start = time.perf_counter()
+        pending = {}
+        local = {}
+        for algo_name, algo_func in algorithms.items():
+            if self._is_picklable(algo_func):
+                pending[algo_name] = pool.apply_async(
+                    _run_implementation, (handle, algo_func, args)
+                )
+            else:
+                local[algo_name] = algo_func
+
+        outcomes = {}
+        for algo_name, algo_func in local.items():
+            outcomes[algo_name] = _run_local(graph, algo_func, args)
+        outcomes.update(self._collect(pending, start, deadline))
+        return {algo_name: outcomes[algo_name] for algo_name in algorithms}
+
+    def run_tries(self, graph: nx.Graph, algo_func, tries: list, deadline: float):
+        """Run algo_func on every (graph, args) of tries, mutations of graph, within deadline seconds.
+
+        Returns the outcomes in the order of tries, as run() does. Tries whose
+        graph is not an overlay of graph run in the calling process. Returns
+        None if graph cannot be shared or algo_func cannot be pickled.
+        """
+        if not self._is_picklable(algo_func):
+            return None
+        try:
+            handle = self._share(graph)
+        except ValueError:
+            return None
+
+        pool = self._get_pool()
+        start = time.perf_counter()
+        pending = {}
+        local = {}
+        for i, (try_graph, args) in enumerate(tries):
+            delta = delta_against(graph, try_graph)
+            if delta is None:
+                local[i] = (try_graph, args)
+            else:
+                pending[i] = pool.apply_async(_run_try, (handle, algo_func, delta, args))
+
+        outcomes = {}
+        for i, (try_graph, args) in local.items():
+            outcomes[i] = _run_local(try_graph, algo_func, args)
+        outcomes.update(self._collect(pending, start, deadline))
+        return [outcomes[i] for i in range(len(tries))]
+
+    def _collect(self, pending: dict, start: float, deadline: float) -> dict:
+        """Outcomes of the pending async results, restarting the pool if any missed the deadline."""
+        outcomes = {}
+        for key, result in pending.items():
+            try:
+                outcomes[key] = result.get(
+                    timeout=max(0.0, start + deadline - time.perf_counter())
+                )
+            except multiprocessing.TimeoutError:
+                outcomes[key] = ("timeout", None, deadline)
+            except Exception as e:
+                # e.g. a result that cannot be pickled back
+                outcomes[key] = (
+                    "error",
+                    f"{type(e).__name__}: {e}",
+                    time.perf_counter() - start,
+                )
+
+        if any(status == "timeout" for status, _, _ in outcomes.values()):
+            # The stuck workers cannot be interrupted, replace the whole pool
+            self._pool.terminate()
+            self._pool = None
+            self.num_restarts += 1
+        return outcomes
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+        self._release()
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
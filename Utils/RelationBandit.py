@@ -0,0 +1,80 @@
+import random
+
+
+class RelationStats:
+    def __init__(self):
+        self.tries = 0
+        self.noops = 0
+        self.violations = 0
+        # Moving average of the seconds a try with this relation takes
+        self.cost = None
+
+    def record(self, noop, cost, violated):
+        self.tries += 1
+        self.noops += noop
+        self.violations += violated
+        self.cost = cost if self.cost is None else 0.9 * self.cost + 0.1 * cost
+
+
+class RelationBandit:
+    """Chooses metamorphic relations by what a try with them yields per second.
+
+    Every relation keeps its number of tries, of no-ops (the relation left the
+    graph unchanged) and of violations found, and the moving average cost of
+    its tries. A relation's weight is its smoothed rate of tries that changed
+    the graph, plus violation_bonus times its violation rate, divided by its
+    cost relative to the other relations. Relations are drawn in proportion to
+    their weight, mixed with a uniform draw at the exploration rate so that
+    no relation is ever starved.
+    """
+
+    def __init__(self, exploration=0.1, violation_bonus=10.0):
+        self.exploration = exploration
+        self.violation_bonus = violation_bonus
+        self.stats: dict[str, RelationStats] = {}
+        self.num_tries = 0
+
+    def weight(self, name, mean_cost):
+        stats = self.stats.get(name)
+        if stats is None or stats.tries == 0:
+            # Untried relations start as if half their tries were useful, at average cost
+            return 0.5
+        useful = (stats.tries - stats.noops + 1) / (stats.tries + 2)
+        reward = useful + self.violation_bonus * stats.violations / (stats.tries + 1)
+        return reward / max(stats.cost / mean_cost, 1e-3)
+
+    def choose(self, relations: list):
+        """One of the relations (bound methods, told apart by name)."""
+        if len(relations) == 1 or random.random() < self.exploration:
+            return random.choice(relations)
+        costs = [
+            self.stats[relation.__name__].cost
+            for relation in relations
+            if relation.__name__ in self.stats
+        ]
+        mean_cost = max(sum(costs) / len(costs), 1e-9) if costs else 1.0
+        weights = [self.weight(relation.__name__, mean_cost) for relation in relations]
+        return random.choices(relations, weights=weights)[0]
+
+    def record(self, applied: list[tuple[str, bool]], cost: float, violated: bool):
+        """Statistics of one try: its (relation name, no-op) steps, cost and outcome.
+
+        The cost is split evenly between the relations the try composed.
+        """
+        self.num_tries += 1
+        for name, noop in applied:
+            self.stats.setdefault(name, RelationStats()).record(
+                noop, cost / len(applied), violated
+            )
+
+    def report(self):
+        print(f"Metamorphic relations over {self.num_tries} tries:")
+        costs = [stats.cost for stats in self.stats.values()]
+        mean_cost = max(sum(costs) / len(costs), 1e-9) if costs else 1.0
+        total = sum(self.weight(name, mean_cost) for name in self.stats) or 1.0
+        for name, stats in sorted(self.stats.items(), key=lambda item: -item[1].tries):
+            print(
+                f"  {name}: applied {stats.tries} times, {stats.noops / stats.tries:.1%} no-ops, "
+                f"{stats.violations} violations, average cost {stats.cost * 1000:.2f} ms, "
+                f"choice weight {self.weight(name, mean_cost) / total:.2f}."
+            )
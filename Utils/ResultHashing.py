@@ -0,0 +1,140 @@
+import math
+from numbers import Real
+
+import numpy as np
+
+
+def canonical_form(result, tolerance=None):
+    """Hashable, order-independent form of an algorithm result.
+
+    NaN maps to one token so it equals itself, and with a tolerance floats are
+    quantized to multiples of it. Values that cannot be made hashable fall
+    back to their repr.
+    """
+    if isinstance(result, float):
+        if math.isnan(result):
+            return ("nan",)
+        if tolerance and math.isfinite(result):
+            return round(result / tolerance)
+        return result
+    if isinstance(result, np.ndarray) and result.dtype.kind in "biuf":
+        values = result.astype(float)
+        if tolerance:
+            values = np.round(values / tolerance)
+        # Adding 0.0 turns -0.0 into 0.0, and all NaN get the same bit pattern
+        values = np.where(np.isnan(values), np.nan, values + 0.0)
+        return ("ndarray", values.shape, values.tobytes())
+    if isinstance(result, np.ndarray):
+        return ("ndarray", result.shape, canonical_form(result.tolist(), tolerance))
+    if isinstance(result, dict):
+        return frozenset(
+            (canonical_form(key, tolerance), canonical_form(value, tolerance))
+            for key, value in result.items()
+        )
+    if isinstance(result, (set, frozenset)):
+        return frozenset(canonical_form(item, tolerance) for item in result)
+    if isinstance(result, (list, tuple)):
+        return tuple(canonical_form(item, tolerance) for item in result)
+    try:
+        hash(result)
+        return result
+    except TypeError:
+        return repr(result)
+
+
+def results_equal(result1, result2, tolerance=None):
+    """Deep comparison treating NaN as equal to NaN and floats within tolerance as equal.
+
+    numpy arrays are compared element-wise in one vectorized check.
+    """
+    if isinstance(result1, float) and isinstance(result2, float):
+        if math.isnan(result1) or math.isnan(result2):
+            return math.isnan(result1) and math.isnan(result2)
+        return result1 == result2 or (
+            tolerance is not None and abs(result1 - result2) <= tolerance
+        )
+    if isinstance(result1, np.ndarray) or isinstance(result2, np.ndarray):
+        if not (isinstance(result1, np.ndarray) and isinstance(result2, np.ndarray)):
+            return False
+        if result1.shape != result2.shape:
+            return False
+        if result1.dtype.kind not in "biuf" or result2.dtype.kind not in "biuf":
+            return results_equal(result1.tolist(), result2.tolist(), tolerance)
+        with np.errstate(invalid="ignore"):
+            close = (result1 == result2) | (np.isnan(result1) & np.isnan(result2))
+            if tolerance is not None:
+                close |= np.abs(result1 - result2) <= tolerance
+        return bool(close.all())
+    if isinstance(result1, dict) and isinstance(result2, dict):
+        return result1.keys() == result2.keys() and all(
+            results_equal(value, result2[key], tolerance) for key, value in result1.items()
+        )
+    if isinstance(result1, (list, tuple)) and isinstance(result2, (list, tuple)):
+        return len(result1) == len(result2) and all(
+            results_equal(a, b, tolerance) for a, b in zip(result1, result2)
+        )
+    if result1 == result2:
+        return True
+    return canonical_form(result1, tolerance) == canonical_form(result2, tolerance)
+
+
+def result_gap(result1, result2) -> float:
+    """Largest absolute difference between corresponding numbers of two results.
+
+    Equal values, including equal infinities and NaN against NaN, are 0
+    apart. Results that differ in shape, keys or a non-numeric part are
+    infinitely far apart.
+    """
+    if isinstance(result1, float) or isinstance(result2, float):
+        if not (isinstance(result1, Real) and isinstance(result2, Real)):
+            return math.inf
+        if result1 == result2 or (math.isnan(result1) and math.isnan(result2)):
+            return 0.0
+        gap = abs(result1 - result2)
+        # inf against a number, or NaN against a number
+        return gap if math.isfinite(gap) else math.inf
+    if isinstance(result1, np.ndarray) and isinstance(result2, np.ndarray):
+        if result1.shape != result2.shape:
+            return math.inf
+        if result1.dtype.kind not in "biuf" or result2.dtype.kind not in "biuf":
+            return result_gap(result1.tolist(), result2.tolist())
+        if result1.size == 0:
+            return 0.0
+        with np.errstate(invalid="ignore", over="ignore"):
+            gaps = np.abs(result1.astype(float) - result2.astype(float))
+            same = (result1 == result2) | (np.isnan(result1) & np.isnan(result2))
+        gaps = np.where(same, 0.0, np.nan_to_num(gaps, nan=math.inf))
+        return float(gaps.max())
+    if isinstance(result1, dict) and isinstance(result2, dict):
+        if result1.keys() != result2.keys():
+            return math.inf
+        return max(
+            (result_gap(value, result2[key]) for key, value in result1.items()), default=0.0
+        )
+    if isinstance(result1, (list, tuple)) and isinstance(result2, (list, tuple)):
+        if len(result1) != len(result2):
+            return math.inf
+        return max((result_gap(a, b) for a, b in zip(result1, result2)), default=0.0)
+    return 0.0 if results_equal(result1, result2) else math.inf
+
+
+def group_results(results, tolerance=None):
+    """Group implementation names by equal results.
+
+    Results are bucketed by their canonical hash in one pass, then only one
+    representative per bucket is deep-compared, merging buckets that
+    quantization split apart. Returns the groups in first-seen order.
+    """
+    buckets = {}
+    for name, result in results.items():
+        buckets.setdefault(canonical_form(result, tolerance), []).append(name)
+
+    groups = []
+    for names in buckets.values():
+        for group in groups:
+            if results_equal(results[group[0]], results[names[0]], tolerance):
+                group.extend(names)
+                break
+        else:
+            groups.append(list(names))
+    return groups
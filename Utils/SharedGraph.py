@@ -0,0 +1,274 @@
+from multiprocessing import shared_memory
+from typing import NamedTuple, Optional
+
+import igraph as ig
+import networkx as nx
+import numpy as np
+
+from Utils.GraphConverter import GraphConverter
+
+
+class GraphLayout(NamedTuple):
+    """Everything besides the arrays that is needed to rebuild a graph."""
+
+    num_nodes: int
+    num_edges: int
+    directed: bool
+    multigraph: bool
+    # numpy dtype of the weight array, None when no edge has a weight
+    weight_dtype: Optional[str]
+
+    @property
+    def edge_width(self):
+        # Multigraph edges carry their key as a third column
+        return 3 if self.multigraph else 2
+
+    def array_specs(self):
+        """(name, dtype, shape) of every array, in buffer order."""
+        specs = [
+            ("nodes", np.int64, (self.num_nodes,)),
+            ("edges", np.int64, (self.num_edges, self.edge_width)),
+        ]
+        if self.weight_dtype is not None:
+            specs.append(("weights", np.dtype(self.weight_dtype), (self.num_edges,)))
+            specs.append(("weight_kind", np.int8, (self.num_edges,)))
+        return specs
+
+    @property
+    def nbytes(self):
+        return sum(
+            np.dtype(dtype).itemsize * int(np.prod(shape)) for _, dtype, shape in self.array_specs()
+        )
+
+
+class SharedGraphHandle(NamedTuple):
+    """Picklable reference to a graph in shared memory: block name, byte offset and layout."""
+
+    block: str
+    offset: int
+    layout: GraphLayout
+    # Distinguishes graphs written to the same ring offset at different times
+    sequence: int = 0
+    # Whether the block outlives the graph (a ring), so readers keep it attached
+    persistent: bool = False
+
+
+# Per-edge weight kinds, so that int weights stored as float64 come back as int
+NO_WEIGHT, INT_WEIGHT, FLOAT_WEIGHT = 0, 1, 2
+
+
+def _weight_kind(weight):
+    if weight is None:
+        return NO_WEIGHT
+    if type(weight) is int:
+        return INT_WEIGHT
+    if isinstance(weight, float):
+        return FLOAT_WEIGHT
+    raise ValueError(f"Only int and float edge weights can be shared, got {weight!r}.")
+
+
+def _weight_dtype(weights, kinds):
+    if FLOAT_WEIGHT in kinds:
+        # Beyond 2**53 ints would not survive the float64 array
+        if any(kind == INT_WEIGHT and abs(w) > 2**53 for w, kind in zip(weights, kinds)):
+            raise ValueError("Int weights mixed with floats are too large to be shared.")
+        return "float64"
+    if INT_WEIGHT in kinds:
+        return "int64"
+    return None
+
+
+def graph_arrays(graph: nx.Graph) -> tuple[GraphLayout, dict[str, np.ndarray]]:
+    """Compact arrays of a graph with integer nodes: node ids, edges and weights.
+
+    Other node, edge and graph attributes are dropped. Raises ValueError for
+    graphs that cannot be represented, e.g. with non-integer node labels.
+    """
+    if graph.is_multigraph():
+        edges = list(graph.edges(keys=True, data="weight"))
+    else:
+        edges = list(graph.edges(data="weight"))
+    weights = [edge[-1] for edge in edges]
+    kinds = [_weight_kind(weight) for weight in weights]
+    layout = GraphLayout(
+        num_nodes=graph.number_of_nodes(),
+        num_edges=len(edges),
+        directed=graph.is_directed(),
+        multigraph=graph.is_multigraph(),
+        weight_dtype=_weight_dtype(weights, kinds),
+    )
+    try:
+        arrays = {
+            "nodes": np.fromiter(graph, dtype=np.int64, count=layout.num_nodes),
+            "edges": np.array(
+                [edge[:-1] for edge in edges], dtype=np.int64
+            ).reshape(layout.num_edges, layout.edge_width),
+        }
+    except (TypeError, OverflowError) as e:
+        raise ValueError(f"Only graphs with integer node labels can be shared: {e}")
+    if layout.weight_dtype is not None:
+        arrays["weight_kind"] = np.array(kinds, dtype=np.int8)
+        arrays["weights"] = np.array(
+            [0 if w is None else w for w in weights], dtype=layout.weight_dtype
+        )
+    return layout, arrays
+
+
+def arrays_graph(layout: GraphLayout, arrays: dict[str, np.ndarray]) -> nx.Graph:
+    """Rebuild the graph from the output of graph_arrays."""
+    if layout.directed:
+        graph = nx.MultiDiGraph() if layout.multigraph else nx.DiGraph()
+    else:
+        graph = nx.MultiGraph() if layout.multigraph else nx.Graph()
+    graph.add_nodes_from(arrays["nodes"].tolist())
+    edges = arrays["edges"].tolist()
+    if layout.weight_dtype is None:
+        graph.add_edges_from(edges)
+    else:
+        converters = {NO_WEIGHT: None, INT_WEIGHT: int, FLOAT_WEIGHT: float}
+        graph.add_edges_from(
+            (*edge, {"weight": converters[kind](weight)} if kind != NO_WEIGHT else {})
+            for edge, weight, kind in zip(
+                edges, arrays["weights"].tolist(), arrays["weight_kind"].tolist()
+            )
+        )
+    return graph
+
+
+def arrays_igraph(layout: GraphLayout, arrays: dict[str, np.ndarray]):
+    """igraph counterpart of arrays_graph, as GraphConverter.to_igraph_indexed returns it.
+
+    Returns None for multigraphs, whose parallel edges the converter consolidates.
+    """
+    if layout.multigraph:
+        return None
+    nodes = arrays["nodes"]
+    endpoints = arrays["edges"]
+    if not np.array_equal(nodes, np.arange(layout.num_nodes)):
+        order = np.argsort(nodes, kind="stable")
+        endpoints = order[np.searchsorted(nodes, endpoints, sorter=order)]
+    graph_ig = ig.Graph(n=layout.num_nodes, edges=endpoints, directed=layout.directed)
+    node_list = nodes.tolist()
+    if node_list:
+        graph_ig.vs["name"] = [str(node) for node in node_list]
+    if layout.num_edges:
+        if layout.weight_dtype is None:
+            graph_ig.es["weight"] = [1] * layout.num_edges
+        else:
+            converters = {NO_WEIGHT: lambda _: 1, INT_WEIGHT: int, FLOAT_WEIGHT: float}
+            graph_ig.es["weight"] = [
+                converters[kind](weight)
+                for weight, kind in zip(arrays["weights"].tolist(), arrays["weight_kind"].tolist())
+            ]
+    return graph_ig, {node: i for i, node in enumerate(node_list)}
+
+
+def write_arrays(buffer, offset: int, layout: GraphLayout, arrays: dict[str, np.ndarray]):
+    for name, dtype, shape in layout.array_specs():
+        view = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        view[...] = arrays[name]
+        offset += view.nbytes
+
+
+def read_arrays(buffer, offset: int, layout: GraphLayout) -> dict[str, np.ndarray]:
+    """Views of the arrays at offset, valid as long as the buffer is."""
+    arrays = {}
+    for name, dtype, shape in layout.array_specs():
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        offset += arrays[name].nbytes
+    return arrays
+
+
+class SharedGraph:
+    """A graph written to its own shared memory block.
+
+    The owner creates it from a networkx graph and passes `handle` to other
+    processes, which rebuild the graph with SharedGraph.load(handle) without
+    unpickling it. The owner must call close() to free the block.
+    """
+
+    def __init__(self, graph: nx.Graph):
+        layout, arrays = graph_arrays(graph)
+        # Zero-sized blocks are not allowed
+        self._memory = shared_memory.SharedMemory(create=True, size=max(layout.nbytes, 1))
+        write_arrays(self._memory.buf, 0, layout, arrays)
+        self.handle = SharedGraphHandle(self._memory.name, 0, layout)
+
+    @staticmethod
+    def load(handle: SharedGraphHandle) -> nx.Graph:
+        """Rebuild the networkx graph, with its igraph conversion already memoized."""
+        if handle.persistent:
+            return _rebuild(_attached_block(handle.block).buf, handle)
+        memory = shared_memory.SharedMemory(name=handle.block)
+        try:
+            return _rebuild(memory.buf, handle)
+        finally:
+            memory.close()
+
+    def close(self):
+        self._memory.close()
+        self._memory.unlink()
+
+
+def _rebuild(buffer, handle):
+    arrays = read_arrays(buffer, handle.offset, handle.layout)
+    graph = arrays_graph(handle.layout, arrays)
+    converted = arrays_igraph(handle.layout, arrays)
+    if converted is not None:
+        GraphConverter.remember(graph, *converted)
+    return graph
+
+
+# Ring blocks attached by this process, kept open for its lifetime
+_attached_blocks = {}
+
+
+def _attached_block(name):
+    if name not in _attached_blocks:
+        _attached_blocks[name] = shared_memory.SharedMemory(name=name)
+    return _attached_blocks[name]
+
+
+class SharedGraphRing:
+    """One fixed shared memory block that graphs are written to one after another.
+
+    Readers attach to the block once and then only receive handles, i.e.
+    offsets into it. put() wraps around to the start when the end is reached
+    and refuses to overwrite graphs that were not released yet.
+    """
+
+    def __init__(self, capacity=64 * 2**20):
+        self.capacity = capacity
+        self._memory = shared_memory.SharedMemory(create=True, size=capacity)
+        self._head = 0
+        self._sequence = 0
+        # sequence -> (start, end) of every graph not released yet
+        self._live = {}
+
+    def put(self, graph: nx.Graph) -> SharedGraphHandle:
+        """Write graph to the ring; raises ValueError if it cannot be shared or does not fit."""
+        layout, arrays = graph_arrays(graph)
+        # Keep every graph 8-byte aligned
+        size = -(-layout.nbytes // 8) * 8
+        start = self._head if self._head + size <= self.capacity else 0
+        end = start + size
+        if end > self.capacity or any(
+            live_start < end and start < live_end
+            for live_start, live_end in self._live.values()
+        ):
+            raise ValueError("No room for the graph in the shared graph ring.")
+        write_arrays(self._memory.buf, start, layout, arrays)
+        self._head = end
+        self._sequence += 1
+        self._live[self._sequence] = (start, end)
+        return SharedGraphHandle(
+            self._memory.name, start, layout, self._sequence, persistent=True
+        )
+
+    def release(self, handle: SharedGraphHandle):
+        """Allow the graph's space to be reused; readers must be done with it."""
+        self._live.pop(handle.sequence, None)
+
+    def close(self):
+        self._memory.close()
+        self._memory.unlink()
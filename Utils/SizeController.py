@@ -0,0 +1,84 @@
+import math
+from collections import deque
+
+import numpy as np
+
+
+class SizeController:
+    """Adapts the graph-size cap to hold a target execution latency.
+
+    Keeps a sliding window of (number of nodes, latency) samples from recent
+    executions and fits latency ~ a * nodes^b on a log-log scale. The cap is
+    the size at which the chosen latency percentile is predicted to reach the
+    target, so cheap algorithms may grow graphs and expensive ones are held back.
+    """
+
+    def __init__(
+        self,
+        target_latency=0.05,
+        percentile=90,
+        initial_cap=300,
+        min_cap=10,
+        max_cap=5000,
+        window=300,
+        update_interval=50,
+    ):
+        self.target_latency = target_latency
+        self.percentile = percentile
+        self.cap = initial_cap
+        self.min_cap = min_cap
+        self.max_cap = max_cap
+        self.samples = deque(maxlen=window)
+        self.update_interval = update_interval
+        self.num_recorded = 0
+        # Ratio between the observed latency percentile and the target, 1.0 means on target
+        self.pressure = 1.0
+
+    def record(self, num_nodes, latency):
+        """Add one execution sample; returns True when the cap was re-estimated."""
+        self.samples.append((max(num_nodes, 1), max(latency, 1e-6)))
+        self.num_recorded += 1
+        if self.num_recorded % self.update_interval == 0:
+            return self.update()
+        return False
+
+    def update(self):
+        if len(self.samples) < 20:
+            return False
+        sizes = np.array([s for s, _ in self.samples], dtype=float)
+        latencies = np.array([t for _, t in self.samples], dtype=float)
+        observed = float(np.percentile(latencies, self.percentile))
+        self.pressure = observed / self.target_latency
+
+        log_sizes = np.log(sizes)
+        log_latencies = np.log(latencies)
+        if np.ptp(log_sizes) < 0.5:
+            # Not enough spread in sizes to fit a slope, move the cap by the pressure alone
+            new_cap = self.cap / max(self.pressure, 1e-3)
+            exponent = float("nan")
+        else:
+            exponent, intercept = np.polyfit(log_sizes, log_latencies, 1)
+            exponent = float(exponent)
+            if exponent < 0.1:
+                # Latency barely depends on size in the observed range, grow carefully
+                new_cap = self.cap * (1.5 if self.pressure < 1 else 1 / 1.5)
+            else:
+                residuals = log_latencies - (exponent * log_sizes + intercept)
+                offset = float(np.percentile(residuals, self.percentile))
+                new_cap = math.exp(
+                    (math.log(self.target_latency) - intercept - offset) / exponent
+                )
+
+        # Move at most a factor of two per update to damp measurement noise
+        new_cap = min(max(new_cap, self.cap / 2), self.cap * 2)
+        self.cap = int(min(max(new_cap, self.min_cap), self.max_cap))
+        print(
+            f"Size cap: {self.cap} nodes, mean size {sizes.mean():.1f} nodes, "
+            f"p{self.percentile} latency {observed * 1000:.2f} ms "
+            f"(target {self.target_latency * 1000:.2f} ms), size exponent {exponent:.2f}."
+        )
+        return True
+
+    def trim_scale(self):
+        """Factor to scale trimming effort by; above 1 when executions are too slow."""
+        return min(max(self.pressure, 0.5), 4.0)
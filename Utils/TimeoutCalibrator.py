@@ -0,0 +1,85 @@
+from collections import deque
+
+import numpy as np
+
+
+class TimeoutCalibrator:
+    """Derives the per-test timeout from measured test latencies, scaled by graph size.
+
+    Each seed contributes the latencies of every implementation over several
+    runs. A seed's test latency is estimated as the sum of the implementations'
+    median latencies times the number of queries a test makes. Latencies are
+    divided by the size of the graph (nodes plus edges), and the timeout of a
+    graph is a multiple of a high percentile of that cost times its size.
+    After calibration every test adds its latency, over a window of recent
+    tests, so the timeout keeps up as mutants grow and get slower per node.
+    """
+
+    def __init__(
+        self, percentile=99, multiplier=5.0, min_timeout=1.0, max_timeout=None, window=1000
+    ):
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.implementation_latencies = {}
+        self.test_latencies = []
+        # Seconds per node and edge of the seeds and the most recent tests
+        self.costs = deque(maxlen=window)
+        self.calibrated = False
+
+    @staticmethod
+    def graph_size(graph):
+        return max(graph.number_of_nodes() + graph.number_of_edges(), 1)
+
+    def add(self, latencies, queries_per_test=1, size=1):
+        """Record one seed's latencies and return its estimated test latency."""
+        for algo_name, values in latencies.items():
+            self.implementation_latencies.setdefault(algo_name, []).extend(values)
+        test_latency = queries_per_test * sum(
+            float(np.median(values)) for values in latencies.values() if values
+        )
+        self.test_latencies.append(test_latency)
+        if latencies:
+            self.costs.append(test_latency / max(size, 1))
+        return test_latency
+
+    def observe(self, size, latency):
+        """Add the latency of a test on a graph of the given size."""
+        if self.calibrated:
+            self.costs.append(latency / max(size, 1))
+
+    def cost(self):
+        """The percentile of the seconds per node and edge the timeout is based on."""
+        return float(np.percentile(list(self.costs), self.percentile))
+
+    def timeout(self, size):
+        """Timeout in seconds of a test on a graph with size nodes plus edges."""
+        if not self.costs:
+            return self.max_timeout
+        timeout = max(self.multiplier * self.cost() * size, self.min_timeout)
+        if self.max_timeout is not None:
+            timeout = min(timeout, self.max_timeout)
+        return timeout
+
+    def report(self):
+        for algo_name, values in self.implementation_latencies.items():
+            print(
+                f"Calibrated latency of {algo_name}: "
+                f"p50 {np.percentile(values, 50) * 1000:.2f} ms, "
+                f"p{self.percentile} {np.percentile(values, self.percentile) * 1000:.2f} ms "
+                f"over {len(values)} runs."
+            )
+        self.report_timeout()
+
+    def report_timeout(self):
+        if self.costs:
+            bounds = f"at least {self.min_timeout:g}"
+            if self.max_timeout is not None:
+                # max_timeout wins when it is below min_timeout, see timeout()
+                lower = min(self.min_timeout, self.max_timeout)
+                bounds = f"between {lower:g} and {self.max_timeout:g}"
+            print(
+                f"Calibrated timeout: {self.multiplier * self.cost() * 1e6:.2f} us per node "
+                f"and edge over {len(self.costs)} tests, {bounds} seconds."
+            )
@@ -99,7 +99,7 @@ def main():
     parser.add_argument(
         "--feedback_check_type",
         type=str,
-        choices=["regular", "coverage", "combination", "branch", "hop_count", "negative_edges", "component_distribution", "trivial_ratio", "saturated_edges", "max_degree", "none"],
+        choices=["regular", "coverage", "combination", "branch", "hop_count", "negative_edges", "component_distribution", "trivial_ratio", "saturated_edges", "max_degree", "near_miss", "slowness", "memory", "structure", "multi", "none"],
         default="regular",
         help="The type of feedback check to use: "
         "'regular' for standard checks, "
@@ -112,6 +112,11 @@ def main():
         "'trivial_ratio' for singleton component ratio feedback (SCC-specific), "
         "'saturated_edges' for saturated edge count feedback (MAXFV-specific), "
         "'max_degree' for max degree in MST feedback (MST-specific), "
+        "'near_miss' for the gap between agreeing implementations (differential testing), "
+        "'slowness' for running time against graph size (performance findings), "
+        "'memory' for peak traced memory of the test against graph size, "
+        "'structure' for cheap graph invariants without running the algorithm, "
+        "'multi' for every signal of the fuzzer derived from a single execution, "
         "'none' to disable feedback checks.",
     )
     parser.add_argument(
@@ -140,6 +145,175 @@ def main():
         default=20,
         help="Timeout for each operation in seconds (default: 20).",
     )
+    parser.add_argument(
+        "--trim",
+        action="store_true",
+        help="Trim graphs in a background worker before committing them to the corpus, "
+        "keeping their feedback signature.",
+    )
+    parser.add_argument(
+        "--trim_max_execs",
+        type=int,
+        default=200,
+        help="Maximum number of executions spent trimming one corpus entry (default: 200).",
+    )
+    parser.add_argument(
+        "--target_latency",
+        type=float,
+        default=None,
+        help="Adapt the graph-size cap to hold this per-execution latency in seconds. "
+        "Disabled by default (fixed cap of 300 nodes).",
+    )
+    parser.add_argument(
+        "--target_execs",
+        type=float,
+        default=None,
+        help="Adapt the graph-size cap to hold this many executions per second "
+        "(shorthand for --target_latency 1/execs).",
+    )
+    parser.add_argument(
+        "--latency_percentile",
+        type=int,
+        default=90,
+        help="Latency percentile the adaptive size cap holds at the target (default: 90).",
+    )
+    parser.add_argument(
+        "--calibrate_timeout",
+        action="store_true",
+        help="Time every implementation on the seeds and derive the timeout from the "
+        "measured latencies; --timeout becomes the upper bound.",
+    )
+    parser.add_argument(
+        "--calibration_runs",
+        type=int,
+        default=3,
+        help="Number of runs per seed and implementation during calibration (default: 3).",
+    )
+    parser.add_argument(
+        "--quarantine_strikes",
+        type=int,
+        default=2,
+        help="Number of near-timeout tests after which a corpus entry is quarantined (default: 2).",
+    )
+    parser.add_argument(
+        "--deterministic",
+        action="store_true",
+        help="Run every single-edge toggle, boundary weight and node removal of each small "
+        "new corpus entry before random mutation.",
+    )
+    parser.add_argument(
+        "--deterministic_max_nodes",
+        type=int,
+        default=20,
+        help="Largest corpus entry that gets a deterministic stage (default: 20).",
+    )
+    parser.add_argument(
+        "--deterministic_batch_size",
+        type=int,
+        default=32,
+        help="Number of deterministic mutants tested per batch (default: 32).",
+    )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=1,
+        help="Number of mutants tested together through one disjoint union for "
+        "decomposable problems such as SCC and BCC (default: 1, no batching).",
+    )
+    parser.add_argument(
+        "--tiered",
+        action="store_true",
+        help="Run only the two fastest implementations on every mutant and the others "
+        "on a sampled fraction, on feedback-novel mutants, or when the first two disagree.",
+    )
+    parser.add_argument(
+        "--tier_sample_rate",
+        type=float,
+        default=0.1,
+        help="Fraction of mutants the slower implementations run on under --tiered (default: 0.1).",
+    )
+    parser.add_argument(
+        "--tier_sample_rates",
+        type=str,
+        default="",
+        help="Per-implementation sample rates under --tiered, e.g. 'igraph=0.5,dinitz=0.2'.",
+    )
+    parser.add_argument(
+        "--parallel_min_nodes",
+        type=int,
+        default=None,
+        help="Run the implementations in parallel worker processes on graphs with at "
+        "least this many nodes (default: off).",
+    )
+    parser.add_argument(
+        "--parallel_workers",
+        type=int,
+        default=None,
+        help="Number of worker processes for --parallel_min_nodes (default: number of CPUs).",
+    )
+    parser.add_argument(
+        "--parallel_deadline",
+        type=float,
+        default=None,
+        help="Seconds each implementation may take under --parallel_min_nodes "
+        "(default: half the timeout).",
+    )
+    parser.add_argument(
+        "--adaptive_relations",
+        action="store_true",
+        help="In metamorphic testing, favour the relations that change the graph, find "
+        "violations and run fast over uniformly random ones.",
+    )
+    parser.add_argument(
+        "--relation_exploration",
+        type=float,
+        default=0.1,
+        help="Fraction of relations still chosen uniformly under --adaptive_relations.",
+    )
+    parser.add_argument(
+        "--novelty_store",
+        type=str,
+        choices=["exact", "bloom", "countmin"],
+        default="exact",
+        help="How feedback state (observed results, lines, branches, exceptions) is stored: "
+        "'exact' sets, or fixed-size 'bloom' filters or 'countmin' sketches.",
+    )
+    parser.add_argument(
+        "--novelty_memory",
+        type=float,
+        default=None,
+        help="Memory budget in MB of each novelty store (default: unbounded for exact, "
+        "4 MB for bloom and countmin).",
+    )
+    parser.add_argument(
+        "--exceptions_per_signature",
+        type=int,
+        default=5,
+        help="Number of graphs logged for each distinct exception (type and innermost "
+        "networkx frames).",
+    )
+    parser.add_argument(
+        "--memory_limit",
+        type=int,
+        default=None,
+        help="Memory in MB an implementation may add to its parallel worker process (RLIMIT_AS); "
+        "implementations then run in the workers unless --parallel_min_nodes says otherwise. "
+        "Graphs whose test runs out of memory are recorded as findings (default: off).",
+    )
+    parser.add_argument(
+        "--slowdown_ratio",
+        type=float,
+        default=None,
+        help="In differential testing, report an implementation as a performance finding "
+        "when it takes this many times the median latency of the others on a graph (default: off).",
+    )
+    parser.add_argument(
+        "--slowness_ratio",
+        type=float,
+        default=10.0,
+        help="Under slowness feedback, report an implementation as a performance finding "
+        "when its time per node and edge exceeds its usual time for the graph size by this factor.",
+    )
 
     args = parser.parse_args()
 
@@ -152,6 +326,21 @@ def main():
         print(f"Error: metamorphic testing is chosen, but no algorithm specified")
         return
 
+    try:
+        tier_sample_rates = {
+            name.strip(): float(rate)
+            for name, rate in (
+                item.split("=") for item in args.tier_sample_rates.split(",") if item
+            )
+        }
+    except ValueError:
+        print(f"Error: Invalid --tier_sample_rates value {args.tier_sample_rates}")
+        return
+
+    target_latency = args.target_latency
+    if target_latency is None and args.target_execs:
+        target_latency = 1.0 / args.target_execs
+
     if args.scheduler == "mem":
         scheduler = RandomMemScheduler(start_time=time.time())
     elif args.scheduler == "disk":
@@ -169,6 +358,31 @@ def main():
         algorithm=(args.algorithm if args.algorithm != "" else None),
         scheduler=scheduler,
         timeout_duration=args.timeout,
+        trim_corpus=args.trim,
+        trim_max_execs=args.trim_max_execs,
+        target_latency=target_latency,
+        latency_percentile=args.latency_percentile,
+        calibrate_timeout=args.calibrate_timeout,
+        calibration_runs=args.calibration_runs,
+        quarantine_strikes=args.quarantine_strikes,
+        deterministic=args.deterministic,
+        deterministic_max_nodes=args.deterministic_max_nodes,
+        deterministic_batch_size=args.deterministic_batch_size,
+        batch_size=args.batch_size,
+        tiered=args.tiered,
+        tier_sample_rate=args.tier_sample_rate,
+        tier_sample_rates=tier_sample_rates,
+        parallel_min_nodes=args.parallel_min_nodes,
+        parallel_workers=args.parallel_workers,
+        parallel_deadline=args.parallel_deadline,
+        adaptive_relations=args.adaptive_relations,
+        relation_exploration=args.relation_exploration,
+        slowness_ratio=args.slowness_ratio,
+        slowdown_ratio=args.slowdown_ratio,
+        memory_limit=args.memory_limit,
+        novelty_store=args.novelty_store,
+        novelty_memory=args.novelty_memory,
+        exceptions_per_signature=args.exceptions_per_signature,
     )
 
     run_fuzzer(fuzzer, args.output)
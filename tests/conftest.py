@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+# Modules are imported from the repository root, as main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Tester.BaseTester  # noqa: E402
+import Tester.STPLTester  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def saved_discrepancies(monkeypatch):
+    """Discrepancies the testers would save to Log/, collected instead."""
+    saved = []
+    for module in (Tester.BaseTester, Tester.STPLTester):
+        monkeypatch.setattr(module, "save_discrepancy", lambda data, path: saved.append(data))
+    return saved
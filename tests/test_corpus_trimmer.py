@@ -0,0 +1,54 @@
+import time
+
+import networkx as nx
+
+from Mutator.CorpusTrimmer import CorpusTrimmer
+
+
+def test_trim_keeps_signature():
+    graph = nx.gnp_random_graph(30, 0.2, seed=3)
+    graph.add_edges_from([(100, 101), (101, 102), (102, 100)])
+
+    def has_triangle(candidate):
+        return any(nx.triangles(candidate).values())
+
+    trimmer = CorpusTrimmer(max_execs=500)
+    trimmed = trimmer.trim(graph, has_triangle)
+    assert has_triangle(trimmed)
+    assert trimmed.number_of_nodes() == 3 and trimmed.number_of_edges() == 3
+    assert graph.number_of_nodes() == 33  # the input is left alone
+    assert trimmer.trimmed_count == 1
+
+
+def test_trim_respects_max_execs():
+    graph = nx.path_graph(50)
+    calls = []
+
+    def keeps(candidate):
+        calls.append(candidate)
+        return True
+
+    CorpusTrimmer(max_execs=3).trim(graph, keeps)
+    assert len(calls) == 3
+
+
+def test_trim_respects_time_budget_and_should_stop():
+    graph = nx.path_graph(50)
+
+    def slow(candidate):
+        time.sleep(0.05)
+        return False
+
+    start = time.perf_counter()
+    trimmed = CorpusTrimmer(max_execs=1000).trim(graph, slow, time_budget=0.2)
+    assert time.perf_counter() - start < 1.0
+    assert nx.utils.graphs_equal(trimmed, graph)
+
+    calls = []
+
+    def keeps(candidate):
+        calls.append(candidate)
+        return True
+
+    CorpusTrimmer().trim(graph, keeps, should_stop=lambda: len(calls) >= 2)
+    assert len(calls) == 2
@@ -0,0 +1,39 @@
+import pickle
+
+import networkx as nx
+
+from Feedback.ExceptionStore import ExceptionStore
+from Utils.FileUtils import load_exception_log
+
+
+def raise_key_error(graph, node):
+    return graph.nodes[node]
+
+
+def test_exception_store_deduplicates_and_caps_logged_graphs(tmp_path):
+    store = ExceptionStore(graphs_per_signature=2)
+    store.open(tmp_path / "fuzzer_exceptions.log")
+    graph = nx.path_graph(3)
+    for node in range(10, 15):
+        try:
+            raise_key_error(graph, node)
+        except KeyError as e:
+            new = store.record(graph, str(e), e)
+        assert new == (node == 10)
+    store.record(graph, "Timeout Error", signature=("Timeout Error",))
+    store.close()
+
+    assert len(store) == 2
+    records = load_exception_log(store.path)
+    assert [record[1] for record in records] == ["10", "11", "Timeout Error"]
+    signature, _, logged, _ = records[0]
+    assert signature[0] == "KeyError"
+    assert nx.utils.graphs_equal(logged, graph)
+
+
+def test_exception_log_ignores_truncated_tail(tmp_path):
+    path = tmp_path / "fuzzer_exceptions.log"
+    with open(path, "wb") as f:
+        pickle.dump((("E",), "first", nx.path_graph(2), 0.0), f)
+        f.write(pickle.dumps((("E",), "second", nx.path_graph(2), 1.0))[:-5])
+    assert [record[1] for record in load_exception_log(path)] == ["first"]
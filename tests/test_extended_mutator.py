@@ -0,0 +1,21 @@
+import random
+
+import networkx as nx
+import pytest
+
+from Mutator.ExtendedMutator import ExtendedMutator
+
+
+@pytest.mark.parametrize("num_nodes", range(3, 12))
+@pytest.mark.parametrize("trim_fraction", [(0.1, 0.2), (0.2, 0.4), (0.5, 0.8)])
+def test_trim_removes_some_but_not_all_nodes(num_nodes, trim_fraction):
+    mutator = ExtendedMutator(corpus=None)
+    mutator.trim_fraction = trim_fraction
+    rng_state = random.getstate()
+    random.seed(num_nodes)
+    try:
+        for _ in range(20):
+            trimmed = mutator.trim_graph_advanced(nx.path_graph(num_nodes))
+            assert 1 <= num_nodes - len(trimmed) <= max(1, int(num_nodes * trim_fraction[1]))
+    finally:
+        random.setstate(rng_state)
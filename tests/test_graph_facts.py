@@ -0,0 +1,71 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from Mutator.ExtendedMutator import ExtendedMutator
+from Tester.HarmonicCentralityTester import HarmonicCentralityMetamorphism
+from Tester.STPLTester import STPLTestMetamorphism
+from Utils.GraphConverter import GraphConverter
+from Utils.GraphFacts import GraphFacts
+from Utils.NumpyReference import _floyd_warshall, distance_matrix
+
+
+def weighted_graph(seed):
+    graph = nx.gnp_random_graph(10, 0.4, seed=seed, directed=True)
+    rng = random.Random(seed)
+    for u, v in graph.edges():
+        graph[u][v]["weight"] = rng.randint(1, 9)
+    return graph
+
+
+def read_facts(graph):
+    facts = GraphFacts.of(graph)
+    GraphConverter(graph).to_igraph_indexed()
+    distance_matrix(graph)
+    return facts.has_negative_weight, facts.has_negative_cycle
+
+
+def assert_facts_fresh(graph):
+    facts = GraphFacts.of(graph)
+    assert facts.has_negative_weight == GraphFacts._weight_flags(graph)["negative"]
+    graph_ig, index = GraphConverter(graph).to_igraph_indexed()
+    weights = {(index[u], index[v]): w for u, v, w in graph.edges(data="weight")}
+    if graph.number_of_edges():
+        assert {edge.tuple: edge["weight"] for edge in graph_ig.es} == weights
+    np.testing.assert_array_equal(distance_matrix(graph), _floyd_warshall(graph, "weight", 1))
+
+
+def test_touch_invalidates_cached_values():
+    graph = weighted_graph(0)
+    read_facts(graph)
+    u, v = next(iter(graph.edges()))
+    graph[u][v]["weight"] = -100
+    GraphFacts.touch(graph)
+    assert_facts_fresh(graph)
+    assert GraphFacts.of(graph).has_negative_weight
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_mutators_touch_the_graphs_they_mutate(seed):
+    # combine_graphs draws its second graph from the corpus
+    mutator = ExtendedMutator(corpus=[weighted_graph(100 + seed)])
+    graph = weighted_graph(seed)
+    random.seed(seed)
+    for mutate in (mutator.mutate, mutator.stacked_mutate):
+        read_facts(graph)
+        graph = mutate(graph)
+        assert_facts_fresh(graph)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_weight_relations_leave_their_input_alone(seed):
+    graph = weighted_graph(seed)
+    expected = graph.copy()
+    random.seed(seed)
+    read_facts(graph)
+    HarmonicCentralityMetamorphism().mutate(graph, (), {})
+    STPLTestMetamorphism()._scale_weights(graph, 0, 1, None, 1.0)
+    assert nx.utils.graphs_equal(graph, expected)
+    assert_facts_fresh(graph)
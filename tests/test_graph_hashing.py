@@ -0,0 +1,22 @@
+import networkx as nx
+
+from Utils.GraphHashing import graph_fingerprint
+
+
+def test_fingerprint_ignores_insertion_order():
+    graph = nx.Graph()
+    graph.add_edge(1, 2, weight=-1)
+    graph.add_edge(0, 1, weight=3)
+    other = nx.Graph()
+    other.add_edge(1, 0, weight=3)
+    other.add_edge(2, 1, weight=-1)
+    assert graph_fingerprint(graph) == graph_fingerprint(other)
+
+
+def test_fingerprint_tells_graphs_apart():
+    graph = nx.Graph([(0, 1, {"weight": -1})])
+    other = nx.Graph([(0, 1, {"weight": -2})])
+    assert graph_fingerprint(graph) != graph_fingerprint(other)
+    assert graph_fingerprint(nx.DiGraph([(0, 1)])) != graph_fingerprint(nx.DiGraph([(1, 0)]))
+    assert graph_fingerprint(nx.Graph([(0, 1)])) != graph_fingerprint(nx.DiGraph([(0, 1)]))
+    assert graph_fingerprint(nx.Graph([(0, 1)])) != graph_fingerprint(nx.Graph([("0", "1")]))
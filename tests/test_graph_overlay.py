@@ -0,0 +1,126 @@
+import pickle
+import random
+
+import networkx as nx
+import pytest
+
+from Utils.GraphOverlay import apply_delta, delta_against, materialize, overlay
+
+
+def random_graph(directed, seed):
+    graph = nx.gnp_random_graph(12, 0.3, seed=seed, directed=directed)
+    rng = random.Random(seed)
+    for u, v in graph.edges():
+        graph[u][v]["weight"] = rng.randint(-5, 5)
+    graph.nodes[0]["label"] = "root"
+    return graph
+
+
+def mutate(graph, rng, steps=15):
+    """Apply the same random mutations through the graph API, e.g. to an overlay and a copy."""
+    for _ in range(steps):
+        nodes = list(graph.nodes())
+        operation = rng.choice(["add_edge", "remove_edge", "add_node", "remove_node", "weight"])
+        if operation == "add_edge" and nodes:
+            graph.add_edge(rng.choice(nodes), rng.choice(nodes + [100]), weight=rng.randint(-5, 5))
+        elif operation == "remove_edge" and graph.number_of_edges():
+            graph.remove_edge(*rng.choice(sorted(graph.edges())))
+        elif operation == "add_node":
+            graph.add_node(rng.choice(nodes + [200]) if nodes else 200, label="new")
+        elif operation == "remove_node" and nodes:
+            graph.remove_node(rng.choice(nodes))
+        elif operation == "weight" and graph.number_of_edges():
+            u, v = rng.choice(sorted(graph.edges()))
+            graph[u][v]["weight"] = rng.randint(-5, 5)
+
+
+def assert_same_graph(graph, expected):
+    assert graph.is_directed() == expected.is_directed()
+    assert list(graph.nodes(data=True)) == list(expected.nodes(data=True))
+    assert sorted(graph.edges(data="weight")) == sorted(expected.edges(data="weight"))
+    assert len(graph) == len(expected)
+    assert graph.number_of_edges() == expected.number_of_edges()
+    for node in expected:
+        assert dict(graph.adj[node]) == dict(expected.adj[node])
+    if expected.is_directed():
+        for node in expected:
+            assert dict(graph.pred[node]) == dict(expected.pred[node])
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("seed", range(20))
+def test_overlay_matches_copy(directed, seed):
+    base = random_graph(directed, seed)
+    snapshot = base.copy()
+    view, copy = overlay(base), base.copy()
+    mutate(view, random.Random(seed))
+    mutate(copy, random.Random(seed))
+    assert_same_graph(view, copy)
+    # The base is never modified
+    assert_same_graph(base, snapshot)
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("seed", range(20))
+def test_delta_reproduces_overlay(directed, seed):
+    base = random_graph(directed, seed)
+    view = overlay(base)
+    mutate(view, random.Random(seed))
+    delta = pickle.loads(pickle.dumps(delta_against(base, view)))
+    assert_same_graph(apply_delta(base, delta), view)
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_overlay_of_overlay_keeps_parent(directed):
+    base = random_graph(directed, 1)
+    parent = overlay(base)
+    mutate(parent, random.Random(1))
+    snapshot = materialize(parent)
+    child = overlay(parent)
+    assert child.base is base
+    mutate(child, random.Random(2))
+    expected = snapshot.copy()
+    mutate(expected, random.Random(2))
+    assert_same_graph(child, expected)
+    assert_same_graph(parent, snapshot)
+
+
+def test_materialize_is_a_real_graph():
+    base = random_graph(True, 3)
+    view = overlay(base)
+    view.add_edge(0, 1, weight=7)
+    graph = materialize(view)
+    assert type(graph) is nx.DiGraph
+    assert_same_graph(graph, view)
+    assert materialize(base) is base
+
+
+def test_delta_against_other_graph():
+    base = random_graph(False, 4)
+    assert delta_against(base, base) == ([], [], [], [])
+    assert delta_against(base, base.copy()) is None
+
+
+def test_multigraph_overlay_is_a_copy():
+    graph = nx.MultiGraph([(0, 1), (0, 1)])
+    view = overlay(graph)
+    view.add_edge(1, 2)
+    assert graph.number_of_edges() == 2
+    assert view.number_of_edges() == 3
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_self_loop_membership_while_iterating(directed):
+    # `w in G[v]` used to copy the edge data into the dict being iterated
+    base = nx.DiGraph([(0, 1), (1, 2), (2, 0)]) if directed else nx.Graph([(0, 1), (1, 2)])
+    view = overlay(base)
+    view.add_edge(0, 0)
+    expected = base.copy()
+    expected.add_edge(0, 0)
+    if not directed:
+        assert list(nx.common_neighbors(view, 0, 1)) == list(nx.common_neighbors(expected, 0, 1))
+    assert [w for w in view[0] if w in view[0]] == list(expected[0])
+    if directed:
+        assert [w for w in view.pred[0] if w in view.pred[0]] == list(expected.pred[0])
+    assert not view._adj[1].added
+    assert_same_graph(view, expected)
@@ -0,0 +1,40 @@
+import pytest
+
+from Feedback.NoveltyStore import make_novelty_store, stable_hash
+
+
+@pytest.mark.parametrize("kind", ["exact", "bloom", "countmin"])
+def test_novelty_store_never_forgets_within_budget(kind):
+    store = make_novelty_store(kind)
+    items = [("line", i) for i in range(1000)]
+    assert store.new_items(items) == set(items)
+    store.update(items)
+    assert store.new_items(items) == set()
+    assert store.add(("line", 1000))
+    assert not store.add(("line", 1000))
+
+
+def test_stable_hash_tells_apart_values_hash_confuses():
+    # hash(-1) == hash(-2) and hash(2**61) == hash(1) in CPython
+    assert stable_hash(-1) != stable_hash(-2)
+    assert stable_hash(2**61) != stable_hash(1)
+    assert stable_hash(1) != stable_hash(1.0) != stable_hash("1")
+    assert stable_hash(frozenset({1, 2, 3})) == stable_hash(frozenset({3, 2, 1}))
+    for kind in ("bloom", "countmin"):
+        store = make_novelty_store(kind, memory_budget=2**16)
+        store.update([-1, 2**61])
+        assert store.new_items([-2, 1]) == {-2, 1}
+
+
+def test_exact_store_forgets_oldest_items():
+    store = make_novelty_store("exact", max_items=3)
+    store.update(range(5))
+    assert list(store) == [2, 3, 4]
+    assert store.metrics()["forgotten"] == 2
+
+
+def test_countmin_counts_never_fall_below_true_count():
+    store = make_novelty_store("countmin", memory_budget=2**10)
+    store.update(["a"] * 3 + list(range(500)))
+    assert store.count("a") >= 3
+
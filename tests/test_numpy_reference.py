@@ -0,0 +1,60 @@
+import math
+from itertools import combinations
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from Utils import NumpyReference
+from Utils.NumpyReference import pair_matrix
+
+
+def weighted_digraph(seed, negative=False):
+    graph = nx.gnp_random_graph(12, 0.25, seed=seed, directed=True)
+    for u, v in graph.edges():
+        graph[u][v]["weight"] = (u + 2 * v) % 4 + (0 if negative else 1)
+    return graph
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_similarities_match_networkx(seed):
+    graph = nx.gnp_random_graph(15, 0.3, seed=seed)
+    graph.add_edge(0, 0)
+    pairs = list(combinations(graph, 2))
+    np.testing.assert_allclose(
+        NumpyReference.adamic_adar_matrix(graph),
+        pair_matrix(graph, nx.adamic_adar_index(graph, pairs)),
+    )
+    np.testing.assert_allclose(
+        NumpyReference.jaccard_matrix(graph),
+        pair_matrix(graph, nx.jaccard_coefficient(graph, pairs)),
+    )
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_distances_match_networkx(seed):
+    graph = weighted_digraph(seed)
+    expected = nx.single_source_dijkstra_path_length(graph, 0)
+    distances = NumpyReference.source_distances(graph, 0, tuple(graph))
+    assert distances == tuple(expected.get(node, math.inf) for node in graph)
+    assert NumpyReference.harmonic_centrality(graph) == pytest.approx(
+        nx.harmonic_centrality(graph, distance="weight")
+    )
+
+
+def test_negative_cycle_distances():
+    graph = nx.DiGraph()
+    graph.add_weighted_edges_from([(0, 1, 1), (1, 2, -2), (2, 1, 1), (3, 0, 1)])
+    assert NumpyReference.source_distances(graph, 0, (0, 3)) == (-math.inf, -math.inf)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_components_and_spanning_forest_match_networkx(seed):
+    graph = weighted_digraph(seed)
+    assert NumpyReference.strongly_connected_components(graph) == {
+        frozenset(component) for component in nx.strongly_connected_components(graph)
+    }
+    undirected = graph.to_undirected()
+    assert NumpyReference.spanning_forest_weight(undirected) == nx.minimum_spanning_tree(undirected).size(
+        weight="weight"
+    )
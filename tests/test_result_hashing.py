@@ -0,0 +1,59 @@
+import math
+
+import numpy as np
+
+from Utils.ResultHashing import canonical_form, group_results, result_gap, results_equal
+
+
+def test_nan_equals_nan():
+    assert results_equal(math.nan, math.nan)
+    assert canonical_form(math.nan) == canonical_form(float("nan"))
+    assert group_results({"a": math.nan, "b": float("nan")}) == [["a", "b"]]
+
+
+def test_negative_zero_hashes_like_zero():
+    a, b = np.array([0.0, 1.0]), np.array([-0.0, 1.0])
+    assert canonical_form(a) == canonical_form(b)
+    assert group_results({"a": a, "b": b}) == [["a", "b"]]
+
+
+def test_tolerance_merges_values_quantization_splits():
+    # 0.0004 and 0.0006 round to different multiples of 1e-3 but are within it
+    results = {"a": 0.0004, "b": 0.0006, "c": 0.5}
+    assert group_results(results, tolerance=1e-3) == [["a", "b"], ["c"]]
+    assert group_results(results) == [["a"], ["b"], ["c"]]
+
+
+def test_arrays_compare_elementwise_with_tolerance():
+    a = np.array([[0.0, 1.0], [1.0, np.nan]])
+    assert results_equal(a, a + 1e-4, tolerance=1e-3)
+    assert not results_equal(a, a + 1e-2, tolerance=1e-3)
+    assert not results_equal(a, a[:1])
+
+
+def test_dicts_and_sets_ignore_order():
+    results = {
+        "a": {1: 0.5, 2: 0.25},
+        "b": {2: 0.25, 1: 0.5},
+        "c": {1: 0.5},
+        "d": {frozenset({1, 2}), frozenset({3})},
+        "e": {frozenset({3}), frozenset({2, 1})},
+    }
+    assert group_results(results) == [["a", "b"], ["c"], ["d", "e"]]
+
+
+def test_groups_keep_first_seen_order():
+    assert group_results({"x": 2, "y": 1, "z": 2}) == [["x", "z"], ["y"]]
+
+
+def test_result_gap():
+    assert result_gap(1.0, 1.5) == 0.5
+    assert result_gap(math.inf, math.inf) == 0.0
+    assert result_gap(math.nan, math.nan) == 0.0
+    assert result_gap(math.inf, 1.0) == math.inf
+    assert result_gap(math.nan, 1.0) == math.inf
+    assert result_gap({1: 1.0, 2: 2.0}, {1: 1.25, 2: 2.0}) == 0.25
+    assert result_gap({1: 1.0}, {2: 1.0}) == math.inf
+    assert result_gap(np.array([1.0, np.inf]), np.array([1.5, np.inf])) == 0.5
+    assert result_gap(np.array([1.0]), np.array([1.0, 2.0])) == math.inf
+    assert result_gap("a", "b") == math.inf
@@ -0,0 +1,66 @@
+import math
+
+import networkx as nx
+import pytest
+
+from Utils.SharedGraph import SharedGraph, SharedGraphRing
+
+
+def assert_same_weighted_graph(graph, expected):
+    assert type(graph) is type(expected)
+    assert list(graph.nodes()) == list(expected.nodes())
+    edges, expected_edges = list(graph.edges(data="weight")), list(expected.edges(data="weight"))
+    assert len(edges) == len(expected_edges)
+    for (u, v, w), (x, y, z) in zip(edges, expected_edges):
+        assert (u, v) == (x, y)
+        assert type(w) is type(z)
+        assert w == z or (math.isnan(w) and math.isnan(z))
+
+
+def sample_graphs():
+    mixed = nx.DiGraph()
+    mixed.add_nodes_from([5, -3, 7])
+    mixed.add_edge(5, -3, weight=2)
+    mixed.add_edge(-3, 7, weight=0.5)
+    mixed.add_edge(7, 5, weight=math.nan)
+    mixed.add_edge(7, 7)
+    multi = nx.MultiGraph([(0, 1), (0, 1), (1, 2)])
+    multi[0][1][1]["weight"] = -4
+    return [nx.path_graph(4), mixed, multi, nx.Graph()]
+
+
+@pytest.mark.parametrize("graph", sample_graphs())
+def test_shared_graph_round_trip(graph):
+    shared = SharedGraph(graph)
+    try:
+        assert_same_weighted_graph(SharedGraph.load(shared.handle), graph)
+    finally:
+        shared.close()
+
+
+def test_only_integer_nodes_and_numeric_weights_are_shared():
+    with pytest.raises(ValueError):
+        SharedGraph(nx.Graph([("a", "b")]))
+    with pytest.raises(ValueError):
+        SharedGraph(nx.Graph([(0, 1, {"weight": "heavy"})]))
+
+
+def test_ring_wraps_around_and_keeps_live_graphs():
+    ring = SharedGraphRing(capacity=4096)
+    try:
+        graph = nx.path_graph(20)
+        handles = []
+        with pytest.raises(ValueError):
+            while True:
+                handles.append(ring.put(graph))
+        assert len(handles) > 1
+        for handle in handles:
+            assert_same_weighted_graph(SharedGraph.load(handle), graph)
+        # The first graph's space is reused once it is released
+        ring.release(handles[0])
+        handle = ring.put(graph)
+        assert handle.offset == 0
+        assert_same_weighted_graph(SharedGraph.load(handle), graph)
+        assert_same_weighted_graph(SharedGraph.load(handles[1]), graph)
+    finally:
+        ring.close()
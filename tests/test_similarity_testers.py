@@ -0,0 +1,25 @@
+import networkx as nx
+import pytest
+
+from Tester.AdamicAdarTester import AdamicAdarTester
+from Tester.JaccardSimilarityTester import JaccardSimilarityTester
+
+
+@pytest.mark.parametrize("tester_class", [AdamicAdarTester, JaccardSimilarityTester])
+def test_similarity_skips_directed_and_multigraphs(tester_class, saved_discrepancies):
+    tester = tester_class("", id="test")
+    edges = [(0, 1), (1, 2), (2, 0), (2, 3)]
+    for graph_class in (nx.DiGraph, nx.MultiGraph, nx.MultiDiGraph):
+        graph = graph_class(edges)
+        assert not tester.accepts(graph)
+        assert tester.test(graph, 0) == {}
+    assert saved_discrepancies == []
+
+
+@pytest.mark.parametrize("tester_class", [AdamicAdarTester, JaccardSimilarityTester])
+def test_similarity_implementations_agree(tester_class):
+    tester = tester_class("", id="test")
+    graph = nx.gnp_random_graph(20, 0.25, seed=2)
+    graph = nx.relabel_nodes(graph, {node: f"n{node}" for node in graph})
+    assert tester.accepts(graph)
+    assert tester.test(graph, 0) == {}
@@ -0,0 +1,40 @@
+import math
+
+import networkx as nx
+
+from Tester.STPLTester import STPLTester, STPLTesterAlgorithms
+
+
+def negative_cycle_graph():
+    # Every node reaches the cycle 0 -> 1 -> 2 -> 0 of weight -3
+    graph = nx.DiGraph()
+    graph.add_weighted_edges_from([(0, 1, -1), (1, 2, -1), (2, 0, -1), (0, 3, 2), (3, 0, 2)])
+    return graph
+
+
+def test_goldberg_radzik_distances_on_negative_cycle():
+    distances = STPLTesterAlgorithms.goldberg_radzik_distances(negative_cycle_graph(), 0, (0, 1, 3))
+    assert distances == (-math.inf,) * 3
+
+
+def test_negative_cycle_is_no_discrepancy(saved_discrepancies):
+    tester = STPLTester("", id="test")
+    assert tester.test(negative_cycle_graph(), 0) == {}
+    assert saved_discrepancies == []
+
+
+def test_distance_vectors_agree():
+    graph = nx.gnp_random_graph(15, 0.3, seed=1, directed=True)
+    for u, v in graph.edges():
+        graph[u][v]["weight"] = (u * 7 + v) % 5 + 1
+    assert STPLTester("", id="test").test(graph, 0) == {}
+
+
+def test_differential_calibration_times_distance_vectors():
+    tester = STPLTester("", id="test")
+    graph = negative_cycle_graph()
+    algorithms, args = tester.calibration_algorithms(graph, (3, 1))
+    assert args == (3, tuple(graph.nodes()))
+    # Dijkstra is no oracle with negative weights
+    assert set(algorithms) == set(tester.distance_pool(graph)) - {"dijkstra_path_length"}
+    assert algorithms["goldberg_radzik"] is STPLTesterAlgorithms.goldberg_radzik_distances
@@ -0,0 +1,61 @@
+import networkx as nx
+
+from Tester.BaseTester import BaseTester
+
+
+class CountingTester(BaseTester):
+    """Three implementations that note their calls; c can be made to disagree."""
+
+    def __init__(self, c_result=0):
+        super().__init__("", "counting_discrepancy", id="test")
+        self.calls = []
+        self.algorithms = {name: self.implementation(name) for name in "abc"}
+        self.c_result = c_result
+        self.tiered = True
+        self.tier_one_size = 1
+        self.default_sample_rate = 0.0
+        self.implementation_latency = {"a": 0.001, "b": 0.01, "c": 0.1}
+
+    def implementation(self, name):
+        def run(graph, *args):
+            self.calls.append((name, args))
+            return self.c_result if name == "c" else 0
+
+        run.__name__ = name
+        return run
+
+    @staticmethod
+    def get_test_metamorphism():
+        return None
+
+
+def test_completion_runs_only_skipped_implementations_on_the_same_query():
+    tester = CountingTester()
+    graph = nx.path_graph(3)
+    assert tester.test(graph, 0, 1) == {}
+    assert tester.calls == [("a", (1,))]
+    assert len(tester.partial_comparisons) == 1
+
+    tester.calls = []
+    assert tester.test_all_tiers(graph, 0, tester.partial_comparisons) == {}
+    assert tester.calls == [("b", (1,)), ("c", (1,))]
+
+
+def test_completion_reports_discrepancies_on_the_original_graph(saved_discrepancies):
+    tester = CountingTester(c_result=1)
+    graph = nx.path_graph(3)
+    assert tester.test(graph, 0, 1) == {}
+    comparisons = [(None, *comparison[1:]) for comparison in tester.partial_comparisons]
+    discrepancies = tester.test_all_tiers(graph, 5, comparisons)
+    message = "Results of a+b and c are different for a graph!"
+    assert discrepancies == {message: graph}
+    assert saved_discrepancies == [(message, graph, 5)]
+
+
+def test_disagreeing_first_tier_completes_at_once():
+    tester = CountingTester(c_result=1)
+    tester.tier_one_size = 2
+    tester.implementation_latency["c"] = 0.005
+    assert tester.test(nx.path_graph(3), 0, 1)
+    assert tester.calls == [("a", (1,)), ("c", (1,)), ("b", (1,))]
+    assert tester.partial_comparisons == []
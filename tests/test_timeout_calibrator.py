@@ -0,0 +1,31 @@
+import networkx as nx
+
+from Utils.TimeoutCalibrator import TimeoutCalibrator
+
+
+def test_timeout_scales_with_graph_size():
+    calibrator = TimeoutCalibrator(percentile=50, multiplier=2.0, min_timeout=0.0)
+    calibrator.add({"a": [0.01, 0.01], "b": [0.03]}, queries_per_test=1, size=10)
+    assert abs(calibrator.timeout(10) - 0.08) < 1e-12
+    assert abs(calibrator.timeout(100) - 0.8) < 1e-12
+    assert TimeoutCalibrator.graph_size(nx.path_graph(3)) == 5
+    assert TimeoutCalibrator.graph_size(nx.Graph()) == 1
+
+
+def test_timeout_bounds():
+    calibrator = TimeoutCalibrator(percentile=50, min_timeout=1.0, max_timeout=5.0)
+    assert calibrator.timeout(10) == 5.0  # nothing measured yet
+    calibrator.add({"a": [0.001]}, size=1)
+    assert calibrator.timeout(1) == 1.0
+    assert calibrator.timeout(10**6) == 5.0
+
+
+def test_observations_follow_the_mutants_once_calibrated():
+    calibrator = TimeoutCalibrator(percentile=50, multiplier=1.0, min_timeout=0.0, window=3)
+    calibrator.add({"a": [0.001]}, size=1)
+    calibrator.observe(1, 1.0)  # before calibration ends, tests are not observed
+    assert calibrator.cost() == 0.001
+    calibrator.calibrated = True
+    for _ in range(3):
+        calibrator.observe(10, 1.0)
+    assert calibrator.cost() == 0.1